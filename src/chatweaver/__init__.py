@@ -1,4 +1,6 @@
 from .schema import Schema
+from .retry_policy import RetryPolicy
+from .completion_cache import CompletionCache, MemoryCompletionCache, FileCompletionCache
 from .text_node import TextNode
 from .model import Model
 from .bot import Bot
@@ -7,4 +9,4 @@ from .archive import Archive, load, async_load
 
 from .data import ChatWeaverModelNames, ChatWeaverSystemRules, Formatting, Language
 
-__all__ = ["Schema", "TextNode", "Model", "Bot", "Chat", "Archive", "load", "async_load", "ChatWeaverModelNames", "ChatWeaverSystemRules", "Formatting", "Language"]
\ No newline at end of file
+__all__ = ["Schema", "RetryPolicy", "CompletionCache", "MemoryCompletionCache", "FileCompletionCache", "TextNode", "Model", "Bot", "Chat", "Archive", "load", "async_load", "ChatWeaverModelNames", "ChatWeaverSystemRules", "Formatting", "Language"]
\ No newline at end of file
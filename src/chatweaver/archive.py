@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import os
+import io
 import json
+import mmap
+import time
 import asyncio
-from typing import Any, Callable, Optional, Dict, Sequence, Awaitable
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Iterator, Optional, Dict, Sequence, Awaitable
 
 from .model import Model
 from .bot import Bot
@@ -11,6 +15,41 @@ from .chat import Chat
 from .text_node import TextNode
 
 
+# RecordHeader: type_code(u8), object_id(u32), rec_flags(u16), payload_len(u64), checksum(u32)
+_RECORD_HEADER_LEN = 1 + 4 + 2 + 8 + 4
+
+# Fixed header: magic(2) version(2) flags(2) header_len(2) index_offset(8) object_count(4) metadata_len(4)
+_HEADER_LEN = 24
+
+# IndexEntry: object_id(u32), type_code(u8), rec_flags(u16), offset(u64), payload_len(u64), checksum(u32), reserved(u8)
+_INDEX_ENTRY_LEN = 4 + 1 + 2 + 8 + 8 + 4 + 1
+
+# Header position of index_offset(u64) immediately followed by object_count(u32),
+# patched together in a single write by append saves
+_INDEX_OFFSET_POS = 2 + 2 + 2 + 2
+
+# Format versions: 2 marks files holding segmented chats (see below), which
+# readers of version 1 cannot interpret. Both are read.
+_VERSION_POS = 2
+_VERSION = 1
+_VERSION_SEGMENTS = 2
+_SUPPORTED_VERSIONS = (_VERSION, _VERSION_SEGMENTS)
+
+# Journal file: magic, then records framed like archive records. A record with
+# the removed flag is a tombstone; any other record stores the object snapshot.
+_JOURNAL_MAGIC = b"CWJ1"
+_REC_REMOVED = 0x0001
+
+# Chat history segments: a chat record flagged as segmented keeps its history
+# out of its payload, in TextNode records (type_code 3, same object_id) flagged
+# as segments. Each segment holds a JSON list of node snapshots; a chat's
+# segments are ordered by file offset, and the chat payload lists their node
+# counts and how many leading nodes were dropped from the history since.
+_REC_SEGMENTED = 0x0002
+_REC_SEGMENT = 0x0004
+_SEGMENT_NODES = 64
+_JOURNAL_FSYNC_POLICIES = ("always", "interval", "never")
+_JOURNAL_FSYNC_INTERVAL = 1.0
 
 
 class Archive(object):
@@ -18,33 +57,97 @@ class Archive(object):
     Manages an archive of Chat, Bot, or Model objects stored at a file path.
     """
 
-    def __init__(self, path: str, api_key: str | None = None, asynchronous: bool = True, delay: float = 0.07) -> None:
+    def __init__(
+        self,
+        path: str,
+        api_key: str | None = None,
+        asynchronous: bool = True,
+        delay: float = 0.07,
+        lazy: bool = False,
+        cache_size: int = 128,
+        journal: bool = False,
+        journal_fsync: str = "always",
+        journal_fold_bytes: int = 4 * 1024 * 1024,
+    ) -> None:
         """
         Initializes an archive with a file path and loading options.
+
+        With lazy=True the file is memory-mapped and only its index is parsed;
+        each object is thawed on first access by id and kept in an LRU cache of
+        `cache_size` objects. Unmodified objects are dropped from the cache when
+        evicted; modified ones are kept until the next save().
+
+        With journal=True every add(), update() and remove() is also appended to
+        `<path>.journal` and flushed according to `journal_fsync` ("always",
+        "interval" or "never"). Chat updates are journaled as the new history
+        nodes plus the chat header. A journal left by a crash is replayed on
+        open; it is folded into the archive by save(), which add(), update()
+        and remove() also call once the journal grows past `journal_fold_bytes`.
         """
-        self.path = path
-        self.api_key = api_key
-        self.asynchronous = asynchronous
-        self.delay = delay
+        if not isinstance(lazy, bool):
+            raise TypeError(f"<Unexpected type for 'lazy'. Expected bool, got {type(lazy)}>")
+        self.__lazy = lazy
 
         # Internal cache
         self.__data: dict[int, Chat | Bot | Model] = {}
         self.__data_is_modified: bool = True  # force first load
 
-        # Warm load
-        _ = self.data
+        # Lazy state: on-disk index, mapping, clean LRU cache, pending changes
+        self.__index: dict[int, dict[str, Any]] = {}
+        self.__map: Optional[mmap.mmap] = None
+        self.__map_file: Any = None
+        self.__cache: OrderedDict[int, Chat | Bot | Model] = OrderedDict()
+        self.__removed: set[int] = set()
+
+        # Ids added, updated or removed since the last save
+        self.__dirty: set[int] = set()
+
+        # History segments on disk, and per chat the segment layout plus the
+        # nodes they hold, to append only new turns on save
+        self.__segments: dict[int, list[dict[str, Any]]] = {}
+        self.__chat_states: dict[int, dict[str, Any]] = {}
+
+        # Chat histories as of their last journal record, the base of the next delta
+        self.__journal_states: dict[int, list[TextNode]] = {}
+
+        # Journal state
+        if not isinstance(journal, bool):
+            raise TypeError(f"<Unexpected type for 'journal'. Expected bool, got {type(journal)}>")
+        self.__journal = journal
+        self.__journal_file: Any = None
+        self.__journal_synced_at: float = 0.0
+        self.__replaying: bool = False
+
+        self.journal_fsync = journal_fsync
+        self.journal_fold_bytes = journal_fold_bytes
+        self.cache_size = cache_size
+        self.path = path
+        self.api_key = api_key
+        self.asynchronous = asynchronous
+        self.delay = delay
+
+        # Warm load (index only in lazy mode)
+        if self.__lazy:
+            self.__refresh()
+        else:
+            _ = self.data
 
     # -------- MAGIC METHODS --------
     def __str__(self) -> str:
         _ = 6
-        return f"<Archive | path: {self.__path!r}, length: {len(self.data)}, api_key: {(self.api_key[:_]+'...'+self.api_key[-_:] if self.api_key and len(self.api_key) > 2*_+3 else self.api_key)!r}>"
+        return f"<Archive | path: {self.__path!r}, length: {len(self)}, api_key: {(self.api_key[:_]+'...'+self.api_key[-_:] if self.api_key and len(self.api_key) > 2*_+3 else self.api_key)!r}>"
 
     def __repr__(self) -> str:
         return f"Archive(path={self.__path!r})"
 
     def __len__(self) -> int:
+        if self.__lazy:
+            return len(self.ids())
         return len(self.data)
 
+    def __getitem__(self, identifier: int) -> Chat | Bot | Model:
+        return self.get(identifier)
+
     def __add__(self, other: Chat | Bot | Model):
         if not isinstance(other, (Chat, Bot, Model)):
             raise TypeError(f"<Unexpected type. Expected Chat or Bot or Model, got {type(other)}>")
@@ -65,6 +168,7 @@ class Archive(object):
 
     def __exit__(self, *args, **kwargs) -> None:
         self.save()
+        self.close()
 
     # -------- PROPERTIES --------
     @property
@@ -91,6 +195,8 @@ class Archive(object):
 
         self.__path = new_path
         self.__data_is_modified = True
+        self.__close_map()
+        self.__close_journal()
 
     @property
     def api_key(self) -> str | None:
@@ -124,12 +230,82 @@ class Archive(object):
         except Exception:
             raise TypeError("<'delay' type is not correct>")
 
+    @property
+    def lazy(self) -> bool:
+        """Returns whether objects are thawed on demand."""
+        return self.__lazy
+
+    @property
+    def journal(self) -> bool:
+        """Returns whether changes are journaled."""
+        return self.__journal
+
+    @property
+    def journal_path(self) -> str:
+        """Returns the path of the journal file."""
+        return self.path + ".journal"
+
+    @property
+    def journal_fsync(self) -> str:
+        """Returns the journal fsync policy."""
+        return self.__journal_fsync
+
+    @journal_fsync.setter
+    def journal_fsync(self, new_policy: str) -> None:
+        """
+        Sets the journal fsync policy: "always" (every record), "interval"
+        (at most once per second, and on close) or "never" (left to the OS).
+        """
+        if new_policy not in _JOURNAL_FSYNC_POLICIES:
+            raise ValueError(f"<Invalid 'journal_fsync': expected one of {_JOURNAL_FSYNC_POLICIES}, got {new_policy!r}>")
+        self.__journal_fsync = new_policy
+
+    @property
+    def journal_fold_bytes(self) -> int:
+        """Returns the journal size that triggers folding it into the archive."""
+        return self.__journal_fold_bytes
+
+    @journal_fold_bytes.setter
+    def journal_fold_bytes(self, new_size: int) -> None:
+        """Sets the journal size that triggers folding it into the archive."""
+        if isinstance(new_size, bool) or not isinstance(new_size, int):
+            raise TypeError(f"<Unexpected type for 'journal_fold_bytes'. Expected int, got {type(new_size)}>")
+        if new_size <= 0:
+            raise ValueError("<Invalid 'journal_fold_bytes': expected positive int>")
+        self.__journal_fold_bytes = new_size
+
+    @property
+    def cache_size(self) -> int:
+        """Returns how many thawed objects lazy mode keeps in memory."""
+        return self.__cache_size
+
+    @cache_size.setter
+    def cache_size(self, new_cache_size: int) -> None:
+        """Sets the lazy LRU cache bound."""
+        if isinstance(new_cache_size, bool) or not isinstance(new_cache_size, int):
+            raise TypeError(f"<Unexpected type for 'cache_size'. Expected int, got {type(new_cache_size)}>")
+        if new_cache_size < 0:
+            raise ValueError("<Invalid 'cache_size': expected int >= 0>")
+        self.__cache_size = new_cache_size
+        if self.__cache:
+            self.__evict()
+
     @property
     def data(self) -> dict[int, Chat | Bot | Model]:
-        """Returns the archive data, reloading it if needed."""
+        """
+        Returns the archive data, reloading it if needed.
+        In lazy mode this thaws every object and returns a new dict: use get(),
+        add() and remove() instead.
+        """
+        if self.__lazy:
+            return {identifier: self.get(identifier) for identifier in self.ids()}
         if self.__data_is_modified:
+            self.__open_index()
+            self.__chat_states = {}
             self.__data = self.retrieve()
+            self.__dirty = set()
             self.__data_is_modified = False
+            self.__replay_journal()
         return self.__data
 
     @data.setter
@@ -137,12 +313,18 @@ class Archive(object):
         """Replaces the internal archive data."""
         if not isinstance(new_data, dict):
             raise TypeError("<'data' must be a dict>")
+        if self.__lazy:
+            self.__refresh()
+            self.__cache.clear()
+            self.__removed = set(self.__index)
+            self.__data = dict(new_data)
+            return
         self.__data = new_data
 
     @property
     def next_id(self) -> int:
         """Returns the next available integer id."""
-        keys = self.data.keys()
+        keys = self.ids() if self.__lazy else self.data.keys()
         if not keys:
             return 0
 
@@ -154,27 +336,158 @@ class Archive(object):
         return max(actual_ids) + 1
 
     # -------- ACTIONS --------
+    def ids(self) -> list[int]:
+        """
+        Returns the ids in the archive, in ascending order, without thawing anything.
+        """
+        if not self.__lazy:
+            return sorted(int(k) for k in self.data.keys())
+        self.__refresh()
+        return sorted((set(self.__index) - self.__removed) | set(self.__data))
+
+    def get(self, identifier: int) -> Chat | Bot | Model:
+        """
+        Returns the object stored under `identifier`.
+        In lazy mode it is thawed from the mapped file on first access.
+        """
+        identifier = int(identifier)
+        if not self.__lazy:
+            if identifier not in self.data:
+                raise KeyError(f"<Identifier not found. {identifier}>")
+            return self.data[identifier]
+
+        self.__refresh()
+        if identifier in self.__data:
+            return self.__data[identifier]
+        if identifier in self.__cache:
+            self.__cache.move_to_end(identifier)
+            return self.__cache[identifier]
+        if identifier not in self.__index or identifier in self.__removed:
+            raise KeyError(f"<Identifier not found. {identifier}>")
+
+        entry = self.__index[identifier]
+        mapping = self.__mapping()
+        payload = self.__read_payload(mapping, entry)
+        segments = None
+        if entry["rec_flags"] & _REC_SEGMENTED:
+            segments = [self.__read_payload(mapping, e) for e in self.__segments.get(identifier, [])]
+        obj = self.__decode_and_thaw(identifier, entry["type_code"], payload, self.api_key, None, segments)
+        if segments is not None:
+            self.__track_chat(identifier, obj, payload)
+        self.__cache[identifier] = obj
+        self.__evict()
+        return obj
+
+    def get_history(self, identifier: int, last: Optional[int] = None) -> list[TextNode]:
+        """
+        Returns the history of the chat stored under `identifier`, oldest first,
+        or only its `last` nodes. A chat that is not in memory is not thawed:
+        only the history segments holding the requested nodes are read.
+        """
+        identifier = int(identifier)
+        if last is not None and (isinstance(last, bool) or not isinstance(last, int) or last < 0):
+            raise ValueError("<Invalid 'last': expected int >= 0 or None>")
+
+        if self.__lazy:
+            self.__refresh()
+            obj = self.__data.get(identifier, self.__cache.get(identifier))
+            if obj is None and (identifier not in self.__index or identifier in self.__removed):
+                raise KeyError(f"<Identifier not found. {identifier}>")
+        else:
+            obj = self.get(identifier)
+
+        if obj is not None:
+            if not isinstance(obj, Chat):
+                raise TypeError(f"<Object {identifier} is not a Chat>")
+            nodes = list(obj.history)
+            return nodes[len(nodes) - min(len(nodes), last):] if last is not None else nodes
+
+        entry = self.__index[identifier]
+        if entry["type_code"] != 2:
+            raise TypeError(f"<Object {identifier} is not a Chat>")
+
+        mapping = self.__mapping()
+        snapshot = json.loads(self.__read_payload(mapping, entry).decode("utf-8"))
+        if not entry["rec_flags"] & _REC_SEGMENTED:
+            items = snapshot.get("properties", {}).get("history", [])
+        else:
+            counts = snapshot["segments"]["counts"]
+            total = sum(counts) - snapshot["segments"]["skip"]
+            remaining = total if last is None else min(last, total)
+            chunks: list[list[dict[str, Any]]] = []
+            for e, count in zip(reversed(self.__segments.get(identifier, [])), reversed(counts)):
+                if remaining <= 0:
+                    break
+                chunks.append(json.loads(self.__read_payload(mapping, e).decode("utf-8")))
+                remaining -= count
+            items = [node for chunk in reversed(chunks) for node in chunk]
+            # Only nodes that are still part of the history
+            items = items[max(0, len(items) - total):]
+
+        if last is not None:
+            items = items[len(items) - min(len(items), last):]
+        return [TextNode.thaw(item) for item in items]
+
     def get_ids(self, element: Chat | Bot | Model) -> list[int]:
         """
         Returns a list of ids that match the given element.
+        In lazy mode every object is thawed to be compared.
         """
         if not isinstance(element, (Chat, Bot, Model)):
             raise TypeError(f"<Invalid element type. Expected Chat | Bot | Model, got {type(element)}>")
+        if self.__lazy:
+            return [identifier for identifier in self.ids() if self.get(identifier) == element]
         return [int(k) for k, v in self.data.items() if v == element]
 
     def has_id(self, identifier: int) -> bool:
         """
         Returns True if the id exists in the archive.
         """
+        if self.__lazy:
+            identifier = int(identifier)
+            self.__refresh()
+            return identifier in self.__data or (identifier in self.__index and identifier not in self.__removed)
         return int(identifier) in self.data
 
     def add(self, element: Chat | Bot | Model) -> None:
         """
         Adds an element under the next available id.
+        In journal mode this saves the archive once the journal is past
+        `journal_fold_bytes`.
         """
         if not isinstance(element, (Chat, Bot, Model)):
             raise TypeError(f"<Invalid 'element' type. Expected Chat | Bot | Model, got {type(element)}>")
-        self.data[self.next_id] = element
+        identifier = self.next_id
+        self.__put(identifier, element)
+        self.__log_put(identifier, element, delta=False)
+        self.__fold_journal_if_full()
+
+    def update(self, identifier: int, element: Chat | Bot | Model | None = None) -> None:
+        """
+        Replaces the object stored under `identifier`, or marks the current one
+        as modified when `element` is None, so the next save() writes it without
+        comparing it against the file first.
+        In journal mode this saves the archive once the journal is past
+        `journal_fold_bytes`.
+        """
+        identifier = int(identifier)
+        if element is not None and not isinstance(element, (Chat, Bot, Model)):
+            raise TypeError(f"<Invalid 'element' type. Expected Chat | Bot | Model, got {type(element)}>")
+        if not self.has_id(identifier):
+            raise Exception(f"<Identifier not found. {identifier}>")
+
+        obj = self.get(identifier) if element is None else element
+        self.__put(identifier, obj)
+        self.__log_put(identifier, obj)
+        self.__fold_journal_if_full()
+
+    def close(self) -> None:
+        """
+        Releases the memory map and the journal handle (synced first).
+        Both are reopened on the next access.
+        """
+        self.__close_map()
+        self.__close_journal()
 
     def remove(self, element: list | tuple | int | Chat | Bot | Model, remove_type: str = "all") -> None:
         """
@@ -182,16 +495,15 @@ class Archive(object):
         a domain object (Chat, Bot, Model), or an iterable of these; when an object maps to multiple ids,
         the remove_type parameter ("all", "first", "last") controls whether all matches, only the first,
         or only the last matching entry is deleted.
+        In journal mode this saves the archive once the journal is past
+        `journal_fold_bytes`.
         """
-        data = self.data
-
         # Iterable removal: reuse the same logic for each item
         if isinstance(element, (list, tuple)):
             if not all(isinstance(x, (int, Chat, Bot, Model)) for x in element):
                 raise TypeError("<Unexpected object type inside iterable>")
             for item in element:
                 self.remove(item, remove_type=remove_type)
-            self.data = data
             return
 
         # Object removal by equality
@@ -202,14 +514,14 @@ class Archive(object):
             match remove_type.lower().strip():
                 case "all":
                     for _id in selected_ids:
-                        del data[_id]
+                        self.__discard(_id)
                 case "first":
-                    del data[selected_ids[0]]
+                    self.__discard(selected_ids[0])
                 case "last":
-                    del data[selected_ids[-1]]
+                    self.__discard(selected_ids[-1])
                 case _:
                     raise ValueError(f"<The entered 'remove_type' is not allowed: '{remove_type}'>")
-            self.data = data
+            self.__fold_journal_if_full()
             return
 
         # Id removal
@@ -221,8 +533,413 @@ class Archive(object):
         if not self.has_id(identifier):
             raise Exception(f"<Identifier not found. {identifier}>")
 
-        del data[identifier]
-        self.data = data
+        self.__discard(identifier)
+        self.__fold_journal_if_full()
+
+    def __discard(self, identifier: int) -> None:
+        """
+        Drops one id from the in-memory archive (on disk at the next save()).
+        """
+        self.__forget(identifier)
+        self.__log_remove(identifier)
+
+    def __put(self, identifier: int, obj: Any) -> None:
+        """
+        Stores `obj` under `identifier` as a pending change.
+        """
+        self.__dirty.add(identifier)
+        if self.__lazy:
+            self.__cache.pop(identifier, None)
+            self.__data[identifier] = obj
+            return
+        self.data[identifier] = obj
+
+    def __forget(self, identifier: int) -> None:
+        """
+        Removes `identifier` from memory, if present.
+        """
+        self.__dirty.add(identifier)
+        self.__journal_states.pop(identifier, None)
+        self.__chat_states.pop(identifier, None)
+        if not self.__lazy:
+            self.data.pop(identifier, None)
+            return
+        self.__data.pop(identifier, None)
+        self.__cache.pop(identifier, None)
+        if identifier in self.__index:
+            self.__removed.add(identifier)
+
+    # -------- JOURNAL --------
+    def __log_put(self, identifier: int, obj: Any, delta: bool = True) -> None:
+        """
+        Journals the new state of `identifier`. With delta=True, a chat whose
+        previous history is known (journaled, or as stored in the archive) is
+        journaled as segment records with the new nodes, then its header.
+        """
+        if not self.__journal or self.__replaying:
+            return
+        if not isinstance(obj, Chat):
+            self.__journal_append([self.__encode_record(identifier, obj, include_secrets=False)])
+            return
+
+        base = self.__journal_states.get(identifier) if delta else None
+        if base is None and delta and identifier in self.__chat_states:
+            base = self.__chat_states[identifier]["nodes"]
+        if base is None:
+            self.__journal_append([self.__encode_record(identifier, obj, include_secrets=False)])
+        else:
+            self.__journal_append(self.__chat_delta(identifier, obj, base))
+        self.__journal_states[identifier] = list(obj.history)
+
+    def __chat_delta(
+        self,
+        identifier: int,
+        chat: Chat,
+        base: list[TextNode],
+    ) -> list[tuple[int, int, int, bytes, int]]:
+        """
+        Encodes the change of a chat since `base` as segment records holding the
+        new nodes, followed by a segmented header. The header's `skip` counts
+        the base nodes dropped: the history is (base + segments)[skip:].
+        """
+        nodes = list(chat.history)
+        dropped = self.__history_overlap(base, nodes)
+        records, counts = self.__segment_records(identifier, nodes[len(base) - dropped:])
+
+        snapshot = chat.freeze(include_secrets=False, include_history=False)
+        snapshot["segments"] = {"counts": counts, "skip": dropped}
+        payload = self.__encode_payload(snapshot)
+        records.append((identifier, 2, _REC_SEGMENTED, payload, self.__checksum32(payload)))
+        return records
+
+    def __log_remove(self, identifier: int) -> None:
+        """
+        Journals a tombstone for `identifier`.
+        """
+        if self.__journal and not self.__replaying:
+            self.__journal_append([(identifier, 0, _REC_REMOVED, b"", self.__checksum32(b""))])
+
+    def __journal_append(self, records: list[tuple[int, int, int, bytes, int]]) -> None:
+        """
+        Appends framed records to the journal in a single write and syncs them
+        according to the fsync policy.
+        """
+        if self.__journal_file is None:
+            self.__journal_file = open(self.journal_path, "ab")
+            if self.__journal_file.tell() == 0:
+                self.__journal_file.write(_JOURNAL_MAGIC)
+
+        buffer = io.BytesIO()
+        for object_id, type_code, rec_flags, payload, checksum in records:
+            self.__write_record(
+                f=buffer,
+                type_code=type_code,
+                object_id=object_id,
+                rec_flags=rec_flags,
+                payload=payload,
+                checksum=checksum,
+            )
+        f = self.__journal_file
+        f.write(buffer.getvalue())
+        f.flush()
+
+        now = time.monotonic()
+        if self.__journal_fsync == "always" or (
+            self.__journal_fsync == "interval" and now - self.__journal_synced_at >= _JOURNAL_FSYNC_INTERVAL
+        ):
+            os.fsync(f.fileno())
+            self.__journal_synced_at = now
+
+    def __fold_journal_if_full(self) -> None:
+        """
+        Saves the archive, folding the journal into it, once the journal has
+        grown past `journal_fold_bytes`.
+        """
+        f = self.__journal_file
+        if f is not None and f.tell() >= self.__journal_fold_bytes:
+            self.save()
+
+    def __replay_journal(self) -> None:
+        """
+        Applies the journal left by a previous session, oldest record first.
+        A torn or corrupted tail (crash mid-write) ends the replay and is cut off.
+        Segment records are applied with the chat header that follows them.
+        Without journal mode the replayed changes are folded right away.
+        """
+        self.__journal_states = {}
+        if not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) == 0:
+            return
+
+        applied = 0
+        with open(self.journal_path, "r+b") as f:
+            if f.read(len(_JOURNAL_MAGIC)) != _JOURNAL_MAGIC:
+                raise ValueError("<Invalid cwarchive journal: bad magic>")
+
+            good_end = f.tell()
+            pending: list[bytes] = []
+            self.__replaying = True
+            try:
+                while True:
+                    try:
+                        type_code = self.__read_u8(f)
+                        object_id = self.__read_u32(f)
+                        rec_flags = self.__read_u16(f)
+                        payload_len = self.__read_u64(f)
+                        checksum = self.__read_u32(f)
+                        payload = self.__read_exact(f, payload_len)
+                    except EOFError:
+                        break
+                    if self.__checksum32(payload) != checksum:
+                        break
+
+                    if rec_flags & _REC_SEGMENT:
+                        pending.append(payload)
+                        continue
+
+                    if rec_flags & _REC_REMOVED:
+                        self.__forget(object_id)
+                    else:
+                        segments = None
+                        if rec_flags & _REC_SEGMENTED:
+                            # A chat delta: the current history is the leading segment
+                            base = [node.freeze() for node in self.get(object_id).history]  # type: ignore[union-attr]
+                            segments = [self.__encode_payload(base)] + pending  # type: ignore[arg-type]
+                        obj = self.__decode_and_thaw(object_id, type_code, payload, self.api_key, None, segments)
+                        self.__put(object_id, obj)
+                        if isinstance(obj, Chat):
+                            self.__journal_states[object_id] = list(obj.history)
+                    pending = []
+                    applied += 1
+                    good_end = f.tell()
+            finally:
+                self.__replaying = False
+
+            if good_end < os.path.getsize(self.journal_path):
+                f.truncate(good_end)
+
+        if applied and (not self.__journal or os.path.getsize(self.journal_path) >= self.__journal_fold_bytes):
+            self.save()
+
+    def __reset_journal(self) -> None:
+        """
+        Empties the journal once its changes are in the archive file.
+        """
+        self.__close_journal()
+        self.__journal_states = {}
+        if not os.path.exists(self.journal_path):
+            return
+        if not self.__journal:
+            os.remove(self.journal_path)
+            return
+        with open(self.journal_path, "r+b") as f:
+            f.truncate(0)
+            f.write(_JOURNAL_MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __close_journal(self) -> None:
+        """
+        Syncs and closes the journal handle.
+        """
+        f = getattr(self, "_Archive__journal_file", None)
+        if f is None:
+            return
+        f.flush()
+        if self.__journal_fsync != "never":
+            os.fsync(f.fileno())
+        f.close()
+        self.__journal_file = None
+
+    # -------- LAZY HELPERS --------
+    def __refresh(self) -> None:
+        """
+        Re-parses the index of a lazy archive after the path changed,
+        discarding unsaved changes like an eager reload does.
+        """
+        if not self.__data_is_modified:
+            return
+        self.__open_index()
+        self.__data = {}
+        self.__cache.clear()
+        self.__removed = set()
+        self.__dirty = set()
+        self.__chat_states = {}
+        self.__data_is_modified = False
+        self.__replay_journal()
+
+    def __open_index(self) -> None:
+        """
+        Maps the archive file and parses its header and IDX1 index only.
+        """
+        self.__close_map()
+        self.__index = {}
+        self.__segments = {}
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"<File not found: {self.path}>")
+        if os.path.getsize(self.path) == 0:
+            return
+        for entry in self.__read_index(self.__mapping()):
+            if entry["rec_flags"] & _REC_SEGMENT:
+                self.__segments.setdefault(entry["object_id"], []).append(entry)
+            else:
+                self.__index[entry["object_id"]] = entry
+        for entries in self.__segments.values():
+            entries.sort(key=lambda e: e["offset"])
+
+    def __mapping(self) -> mmap.mmap:
+        """
+        Returns the read-only memory map of the archive file, opening it if needed.
+        """
+        if self.__map is None:
+            self.__map_file = open(self.path, "rb")
+            try:
+                self.__map = mmap.mmap(self.__map_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except Exception:
+                self.__map_file.close()
+                self.__map_file = None
+                raise
+        return self.__map
+
+    def __close_map(self) -> None:
+        """
+        Closes the memory map; required before the file is replaced or extended.
+        """
+        if getattr(self, "_Archive__map", None) is not None:
+            self.__map.close()
+            self.__map = None
+        if getattr(self, "_Archive__map_file", None) is not None:
+            self.__map_file.close()
+            self.__map_file = None
+
+    def __is_clean(self, identifier: int, obj: Any) -> bool:
+        """
+        Returns True if `obj` still freezes to the payload stored on disk.
+        """
+        if identifier in self.__dirty:
+            return False
+        if isinstance(obj, Chat):
+            records, kept, _ = self.__chat_records(identifier, obj, include_secrets=False, append=True)
+            return (
+                len(records) == 1
+                and kept == self.__segments.get(identifier, [])
+                and self.__matches_disk(identifier, records[0][3])
+            )
+        return self.__matches_disk(identifier, self.__encode_payload(self.__safe_freeze(obj)))
+
+    # -------- CHAT SEGMENTS --------
+    def __track_chat(self, identifier: int, chat: Chat, payload: bytes) -> None:
+        """
+        Remembers the on-disk segment layout of a segmented chat just thawed.
+        """
+        layout = json.loads(payload.decode("utf-8"))["segments"]
+        self.__chat_states[identifier] = {
+            "counts": list(layout["counts"]),
+            "skip": int(layout["skip"]),
+            "nodes": list(chat.history),
+        }
+
+    @staticmethod
+    def __history_overlap(stored: list[TextNode], nodes: list[TextNode]) -> int:
+        """
+        Returns how many leading stored nodes were dropped from the history,
+        when `nodes` continues the stored ones (possibly after dropping some
+        from the front). Returns len(stored) when nothing is shared.
+        """
+        if not stored or not nodes:
+            return len(stored)
+        first = nodes[0]
+        for j, node in enumerate(stored):
+            if node is first or node == first:
+                shared = len(stored) - j
+                if len(nodes) >= shared and stored[j:] == nodes[:shared]:
+                    return j
+        return len(stored)
+
+    def __chat_records(
+        self,
+        identifier: int,
+        chat: Chat,
+        include_secrets: bool,
+        append: bool,
+    ) -> tuple[list[tuple[int, int, int, bytes, int]], list[dict[str, Any]], dict[str, Any]]:
+        """
+        Encodes a chat as a header record followed by history segment records.
+        With append=True only the nodes added since the chat was stored get new
+        segments; segments whose nodes all left the history are dropped.
+
+        Returns:
+            (records to write, existing segment entries that stay live,
+            the segment layout to remember once the records are written).
+        """
+        nodes = list(chat.history)
+        counts: list[int] = []
+        skip = 0
+        kept: list[dict[str, Any]] = []
+        new_nodes = nodes
+
+        state = self.__chat_states.get(identifier) if append else None
+        if state is not None:
+            dropped = self.__history_overlap(state["nodes"], nodes)
+            counts = list(state["counts"])
+            skip = state["skip"] + dropped
+            kept = list(self.__segments.get(identifier, []))
+            while counts and counts[0] <= skip:
+                skip -= counts.pop(0)
+                kept.pop(0)
+            new_nodes = nodes[len(state["nodes"]) - dropped:]
+
+        records, new_counts = self.__segment_records(identifier, new_nodes)
+        counts.extend(new_counts)
+
+        snapshot = chat.freeze(include_secrets=include_secrets, include_history=False)
+        snapshot["segments"] = {"counts": counts, "skip": skip}
+        payload = self.__encode_payload(snapshot)
+        records.insert(0, (identifier, 2, _REC_SEGMENTED, payload, self.__checksum32(payload)))
+
+        return records, kept, {"counts": counts, "skip": skip, "nodes": nodes}
+
+    def __segment_records(
+        self,
+        identifier: int,
+        nodes: list[TextNode],
+    ) -> tuple[list[tuple[int, int, int, bytes, int]], list[int]]:
+        """
+        Encodes `nodes` as history segment records of up to _SEGMENT_NODES
+        nodes each. Returns the records and their node counts.
+        """
+        records: list[tuple[int, int, int, bytes, int]] = []
+        counts: list[int] = []
+        for start in range(0, len(nodes), _SEGMENT_NODES):
+            chunk = nodes[start:start + _SEGMENT_NODES]
+            payload = self.__encode_payload([node.freeze() for node in chunk])  # type: ignore[arg-type]
+            records.append((identifier, 3, _REC_SEGMENT, payload, self.__checksum32(payload)))
+            counts.append(len(chunk))
+        return records, counts
+
+    def __matches_disk(self, identifier: int, payload: bytes) -> bool:
+        """
+        Returns True if `payload` equals the record stored for `identifier`.
+        Length and checksum are compared first, then the mapped bytes.
+        """
+        entry = self.__index.get(identifier)
+        if entry is None:
+            return False
+        if len(payload) != entry["payload_len"] or self.__checksum32(payload) != entry["checksum"]:
+            return False
+        start = entry["offset"] + _RECORD_HEADER_LEN
+        return self.__mapping()[start:start + entry["payload_len"]] == payload
+
+    def __evict(self) -> None:
+        """
+        Shrinks the LRU cache to cache_size. Evicted objects that were modified
+        since they were thawed move to the pending changes instead of being lost.
+        """
+        while len(self.__cache) > self.__cache_size:
+            identifier, obj = self.__cache.popitem(last=False)
+            if not self.__is_clean(identifier, obj):
+                self.__data[identifier] = obj
+            else:
+                self.__chat_states.pop(identifier, None)
 
 
 
@@ -230,19 +947,279 @@ class Archive(object):
     # |=================================|
     # | -------- SAVING SYSTEM -------- |
     # |=================================|
-    def save(self, path: str | None = None, include_secrets: bool = False) -> None:
+    def save(self, path: str | None = None, include_secrets: bool = False, append: bool = True) -> None:
         """
         Saves the current archive data into a .cwarchive binary file.
+
+        When saving to the archive's own, non-empty file with append=True, only
+        the records that changed since the last save are written: they are
+        appended after the existing data, followed by a new index, and the header
+        is patched to point at it. Otherwise (or with append=False) the whole
+        file is rewritten atomically, which also drops superseded records.
         """
         target_path = self.path if path is None else str(path)
+        same_file = os.path.abspath(target_path) == os.path.abspath(self.path)
 
-        # Write atomically using a temporary file
-        tmp_path = target_path + ".tmp"
+        self.__ensure_loaded()
+
+        if append and same_file and os.path.getsize(self.path) > 0:
+            self.__append_changes(include_secrets=include_secrets)
+        else:
+            states: dict[int, dict[str, Any]] = {}
+            self.__write_archive(target_path, self.__records(include_secrets=include_secrets, states=states))
+            if same_file:
+                self.__after_save(states)
+
+        if same_file:
+            # Every journaled change is in the archive file now
+            self.__reset_journal()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Reports how the archive file is used, as saved on disk.
+
+        Returns:
+            A dict with "file_bytes", "live_bytes" (records reachable from the
+            index), "index_bytes", "header_bytes", "dead_bytes" (superseded
+            records, old indexes and torn tails), "dead_ratio" (dead / file)
+            and "records" (live record count).
+        """
+        self.__ensure_loaded()
+        file_bytes = os.path.getsize(self.path)
+        if file_bytes == 0:
+            return {"file_bytes": 0, "live_bytes": 0, "index_bytes": 0, "header_bytes": 0,
+                    "dead_bytes": 0, "dead_ratio": 0.0, "records": 0}
+
+        entries = self.__all_entries()
+        live_bytes = sum(_RECORD_HEADER_LEN + e["payload_len"] for e in entries)
+        index_bytes = 4 + 4 + _INDEX_ENTRY_LEN * len(entries)
+        dead_bytes = max(0, file_bytes - _HEADER_LEN - live_bytes - index_bytes)
+
+        return {
+            "file_bytes": file_bytes,
+            "live_bytes": live_bytes,
+            "index_bytes": index_bytes,
+            "header_bytes": _HEADER_LEN,
+            "dead_bytes": dead_bytes,
+            "dead_ratio": dead_bytes / file_bytes,
+            "records": len(entries),
+        }
+
+    def compact(self, min_dead_ratio: float = 0.0) -> int:
+        """
+        Rewrites the archive file with only the live records, reclaiming the
+        space of superseded ones. Records are copied as raw payload bytes with
+        their checksums, without being thawed, and the new file replaces the
+        old one atomically. Unsaved changes are kept in memory.
+
+        Args:
+            min_dead_ratio: Skip the rewrite unless stats()["dead_ratio"] is at
+                least this value.
+
+        Returns:
+            The number of bytes reclaimed (0 when skipped).
+        """
+        stats = self.stats()
+        if stats["dead_bytes"] == 0 or stats["dead_ratio"] < float(min_dead_ratio):
+            return 0
+
+        self.__write_archive(self.path, self.__raw_records())
+        self.__open_index()
+        return stats["file_bytes"] - os.path.getsize(self.path)
+
+    def __raw_records(self) -> Iterator[tuple[int, int, int, bytes, int]]:
+        """
+        Yields the live records exactly as stored, in file order.
+        """
+        mapping = self.__mapping()
+        for e in sorted(self.__all_entries(), key=lambda e: e["offset"]):
+            start = e["offset"] + _RECORD_HEADER_LEN
+            yield e["object_id"], e["type_code"], e["rec_flags"], mapping[start:start + e["payload_len"]], e["checksum"]
+
+    def __all_entries(self) -> list[dict[str, Any]]:
+        """
+        Returns every live index entry: object records, then history segments.
+        """
+        return list(self.__index.values()) + [e for entries in self.__segments.values() for e in entries]
 
-        objects = self.data  # {id: obj}
+    def __ensure_loaded(self) -> None:
+        """
+        Makes sure the index (and, in eager mode, the data) reflect the current path.
+        """
+        if self.__lazy:
+            self.__refresh()
+        else:
+            _ = self.data
+
+    def __after_save(self, states: dict[int, dict[str, Any]]) -> None:
+        """
+        Re-reads the index of the saved file and records the segment layout of
+        the chats just written. In lazy mode everything pending is on disk now,
+        so it becomes clean cache entries.
+        """
+        self.__open_index()
+        self.__dirty = set()
+        self.__chat_states.update(states)
+        self.__chat_states = {
+            identifier: state for identifier, state in self.__chat_states.items()
+            if identifier in self.__index and self.__index[identifier]["rec_flags"] & _REC_SEGMENTED
+        }
+        if not self.__lazy:
+            return
 
-        # Prepare records in a stable order (by id)
-        items = sorted(objects.items(), key=lambda kv: int(kv[0]))
+        pending = self.__data
+        self.__data = {}
+        self.__removed = set()
+        for identifier, obj in pending.items():
+            self.__cache[identifier] = obj
+            self.__cache.move_to_end(identifier)
+        while len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+
+    def __materialized(self) -> Iterator[tuple[int, Any]]:
+        """
+        Yields (id, object) for every thawed object that is still in the archive.
+        """
+        if not self.__lazy:
+            yield from ((int(k), v) for k, v in self.data.items())
+            return
+        yield from self.__data.items()
+        yield from self.__cache.items()
+
+    def __append_changes(self, include_secrets: bool) -> None:
+        """
+        Appends the changed records and a new index to the archive file, then
+        patches the header. A crash before the header patch leaves the previous
+        index in charge, so the file stays readable.
+        """
+        changed: list[tuple[int, int, int, bytes, int]] = []
+        segments: dict[int, list[dict[str, Any]]] = {}
+        states: dict[int, dict[str, Any]] = {}
+        for identifier, obj in self.__materialized():
+            if isinstance(obj, Chat):
+                # Only the header and the segments of new turns are written
+                records, kept, state = self.__chat_records(identifier, obj, include_secrets, append=True)
+                if (
+                    identifier in self.__dirty
+                    or len(records) > 1
+                    or kept != self.__segments.get(identifier, [])
+                    or not self.__matches_disk(identifier, records[0][3])
+                ):
+                    changed.extend(records)
+                    segments[identifier] = kept
+                    states[identifier] = state
+                continue
+            record = self.__encode_record(identifier, obj, include_secrets)
+            if identifier in self.__dirty or not self.__matches_disk(identifier, record[3]):
+                changed.append(record)
+                segments[identifier] = []
+
+        live = set(self.ids())
+        removed = set(self.__index) - live
+        if not changed and not removed:
+            self.__dirty = set()
+            return
+
+        entries = {identifier: e for identifier, e in self.__index.items() if identifier in live}
+        for identifier in live:
+            segments.setdefault(identifier, list(self.__segments.get(identifier, [])))
+
+        # A mapped file cannot be extended on every platform
+        self.__close_map()
+        with open(self.path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            for object_id, type_code, rec_flags, payload, checksum in changed:
+                offset = f.tell()
+                self.__write_record(
+                    f=f,
+                    type_code=type_code,
+                    object_id=object_id,
+                    rec_flags=rec_flags,
+                    payload=payload,
+                    checksum=checksum,
+                )
+                entry = {
+                    "object_id": object_id,
+                    "type_code": type_code,
+                    "rec_flags": rec_flags,
+                    "offset": offset,
+                    "payload_len": len(payload),
+                    "checksum": checksum,
+                }
+                if rec_flags & _REC_SEGMENT:
+                    segments[object_id].append(entry)
+                else:
+                    entries[object_id] = entry
+
+            index_entries = [e for k in sorted(entries) for e in [entries[k]] + segments.get(k, [])]
+            index_offset = f.tell()
+            self.__write_index(f, index_entries)
+            f.flush()
+            os.fsync(f.fileno())
+
+            # Mark the file as segmented before the new index becomes visible,
+            # so a version 1 reader never sees segment records
+            version = self.__version_for(index_entries)
+            f.seek(_VERSION_POS)
+            if version != self.__read_u16(f):
+                f.seek(_VERSION_POS)
+                self.__write_u16(f, version)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # index_offset and object_count are adjacent: patch them in one write
+            f.seek(_INDEX_OFFSET_POS)
+            f.write(int(index_offset).to_bytes(8, "little", signed=False)
+                    + len(index_entries).to_bytes(4, "little", signed=False))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.__after_save(states)
+
+    def __encode_record(self, object_id: int, obj: Any, include_secrets: bool) -> tuple[int, int, int, bytes, int]:
+        """
+        Freezes and encodes one object as (object_id, type_code, rec_flags, payload, checksum).
+        """
+        type_code = self.__type_code(obj)
+        payload = self.__encode_payload(self.__safe_freeze(obj, include_secrets=include_secrets))
+        return object_id, type_code, 0, payload, self.__checksum32(payload)
+
+    def __records(
+        self,
+        include_secrets: bool,
+        states: dict[int, dict[str, Any]],
+    ) -> Iterator[tuple[int, int, int, bytes, int]]:
+        """
+        Yields the records of the archive by id; chats are written as a header
+        and history segments, and their layout is collected in `states`.
+        Objects never thawed (lazy mode) are copied from the mapped file as raw
+        payload bytes, without a thaw/freeze round trip.
+        """
+        for identifier in self.ids():
+            if self.__lazy:
+                obj = self.__data.get(identifier, self.__cache.get(identifier))
+            else:
+                obj = self.data[identifier]
+
+            if isinstance(obj, Chat):
+                records, _, states[identifier] = self.__chat_records(identifier, obj, include_secrets, append=False)
+                yield from records
+                continue
+            if obj is not None:
+                yield self.__encode_record(identifier, obj, include_secrets)
+                continue
+
+            mapping = self.__mapping()
+            for entry in [self.__index[identifier]] + self.__segments.get(identifier, []):
+                payload = self.__read_payload(mapping, entry)
+                yield identifier, entry["type_code"], entry["rec_flags"], payload, entry["checksum"]
+
+    def __write_archive(self, target_path: str, records: Iterable[tuple[int, int, int, bytes, int]]) -> None:
+        """
+        Writes a complete archive atomically through a temporary file.
+        """
+        # Write atomically using a temporary file
+        tmp_path = target_path + ".tmp"
 
         with open(tmp_path, "wb") as f:
             # 1) Write header with placeholders
@@ -250,29 +1227,21 @@ class Archive(object):
 
             # 2) Write records and collect index entries
             index_entries: list[dict[str, Any]] = []
-            for object_id, obj in items:
-                object_id_int = int(object_id)
-
-                type_code = self.__type_code(obj)
-                snapshot = self.__safe_freeze(obj, include_secrets=include_secrets)
-
-                payload = self.__encode_payload(snapshot)
-                checksum = self.__checksum32(payload)
-
+            for object_id, type_code, rec_flags, payload, checksum in records:
                 offset = f.tell()
                 self.__write_record(
                     f=f,
                     type_code=type_code,
-                    object_id=object_id_int,
-                    rec_flags=0,
+                    object_id=object_id,
+                    rec_flags=rec_flags,
                     payload=payload,
                     checksum=checksum,
                 )
 
                 index_entries.append({
-                    "object_id": object_id_int,
+                    "object_id": object_id,
                     "type_code": type_code,
-                    "rec_flags": 0,
+                    "rec_flags": rec_flags,
                     "offset": offset,
                     "payload_len": len(payload),
                     "checksum": checksum,
@@ -288,23 +1257,38 @@ class Archive(object):
                 header_info=header_info,
                 index_offset=index_offset,
                 object_count=object_count,
+                version=self.__version_for(index_entries),
             )
+            f.flush()
+            os.fsync(f.fileno())
 
+        # A mapped file cannot be replaced on every platform
+        if os.path.abspath(target_path) == os.path.abspath(self.path):
+            self.__close_map()
         os.replace(tmp_path, target_path)
 
 
+    @staticmethod
+    def __version_for(entries: list[dict[str, Any]]) -> int:
+        """
+        Returns the format version a file with these index entries needs.
+        """
+        if any(e["rec_flags"] & (_REC_SEGMENT | _REC_SEGMENTED) for e in entries):
+            return _VERSION_SEGMENTS
+        return _VERSION
+
     # -------- HEADER HELPERS --------
     def __write_header_placeholder(self, f) -> dict[str, int]:
         """
         Writes a header with placeholder fields and returns patch offsets.
         """
         magic = b"cw"
-        version = 1
+        version = _VERSION
         flags = 0
 
         # The header is 24 bytes:
         # 2 + 2 + 2 + 2 + 8 + 4 + 4 = 24
-        header_len = 24
+        header_len = _HEADER_LEN
         metadata_len = 0
 
         f.write(magic)
@@ -321,16 +1305,28 @@ class Archive(object):
         self.__write_u32(f, metadata_len)
 
         return {
+            "version_pos": _VERSION_POS,
             "index_offset_pos": index_offset_pos,
             "object_count_pos": object_count_pos,
         }
 
-    def __patch_header(self, f, header_info: dict[str, int], index_offset: int, object_count: int) -> None:
+    def __patch_header(
+        self,
+        f,
+        header_info: dict[str, int],
+        index_offset: int,
+        object_count: int,
+        version: int = _VERSION,
+    ) -> None:
         """
         Patches header placeholders after writing the file.
         """
         current = f.tell()
 
+        # Patch version
+        f.seek(header_info["version_pos"])
+        self.__write_u16(f, version)
+
         # Patch index_offset
         f.seek(header_info["index_offset_pos"])
         self.__write_u64(f, index_offset)
@@ -478,6 +1474,7 @@ class Archive(object):
             return {}
 
         payload_items = self.__read_cwarchive_payloads(file_path)
+        own_file = os.path.abspath(file_path) == os.path.abspath(self.path)
 
         if self.asynchronous:
             rebuilt = asyncio.run(
@@ -494,6 +1491,11 @@ class Archive(object):
                 api_key_provider=api_key_provider,
             )
 
+        if own_file:
+            for item in payload_items:
+                if item.get("segments") is not None:
+                    self.__track_chat(item["object_id"], rebuilt[item["object_id"]], item["payload"])
+
         return rebuilt
 
     # -------- FILE PARSING (SEQUENTIAL) File parsing (sequential) --------
@@ -507,89 +1509,117 @@ class Archive(object):
         items: list[dict[str, Any]] = []
 
         with open(file_path, "rb") as f:
-            magic = self.__read_exact(f, 2)
-            if magic != b"cw":
-                raise ValueError("<Invalid cwarchive: bad magic>")
-
-            version = self.__read_u16(f)
-            if version != 1:
-                raise ValueError(f"<Unsupported cwarchive version: {version}>")
-
-            _flags = self.__read_u16(f)
-            header_len = self.__read_u16(f)
-
-            index_offset = self.__read_u64(f)
-            _object_count = self.__read_u32(f)
-            metadata_len = self.__read_u32(f)
+            index_entries = self.__read_index(f)
 
-            # Skip metadata if present
-            if metadata_len > 0:
-                _ = self.__read_exact(f, metadata_len)
-
-            # If header_len is larger than what we read, skip remaining header bytes
-            already_read = 2 + 2 + 2 + 2 + 8 + 4 + 4 + metadata_len
-            if header_len > already_read:
-                _ = self.__read_exact(f, header_len - already_read)
-
-            if index_offset <= 0:
-                raise ValueError("<Invalid cwarchive: missing index offset>")
-
-            # ----- index -----
-            f.seek(index_offset)
-            idx_magic = self.__read_exact(f, 4)
-            if idx_magic != b"IDX1":
-                raise ValueError("<Invalid cwarchive: bad index magic>")
-
-            count = self.__read_u32(f)
-
-            index_entries: list[dict[str, Any]] = []
-            for _ in range(count):
-                object_id = self.__read_u32(f)
-                type_code = self.__read_u8(f)
-                rec_flags = self.__read_u16(f)
-                offset = self.__read_u64(f)
-                payload_len = self.__read_u64(f)
-                checksum = self.__read_u32(f)
-                _reserved = self.__read_u8(f)
-
-                index_entries.append({
-                    "object_id": int(object_id),
-                    "type_code": int(type_code),
-                    "rec_flags": int(rec_flags),
-                    "offset": int(offset),
-                    "payload_len": int(payload_len),
-                    "checksum": int(checksum),
-                })
+            # History segments travel with their chat record
+            segments: dict[int, list[bytes]] = {}
+            for e in sorted(index_entries, key=lambda e: e["offset"]):
+                if e["rec_flags"] & _REC_SEGMENT:
+                    segments.setdefault(e["object_id"], []).append(self.__read_payload(f, e))
 
             # ----- records -----
             for e in index_entries:
-                f.seek(e["offset"])
+                if e["rec_flags"] & _REC_SEGMENT:
+                    continue
+                items.append({
+                    "object_id": e["object_id"],
+                    "type_code": e["type_code"],
+                    "rec_flags": e["rec_flags"],
+                    "payload": self.__read_payload(f, e),
+                    "segments": segments.get(e["object_id"], []) if e["rec_flags"] & _REC_SEGMENTED else None,
+                })
 
-                type_code_r = self.__read_u8(f)
-                object_id_r = self.__read_u32(f)
-                rec_flags_r = self.__read_u16(f)
-                payload_len_r = self.__read_u64(f)
-                checksum_r = self.__read_u32(f)
+        return items
+
+    def __read_index(self, f) -> list[dict[str, Any]]:
+        """
+        Reads the header and the IDX1 index from a file object or memory map.
+        """
+        f.seek(0)
+        magic = self.__read_exact(f, 2)
+        if magic != b"cw":
+            raise ValueError("<Invalid cwarchive: bad magic>")
+
+        version = self.__read_u16(f)
+        if version not in _SUPPORTED_VERSIONS:
+            raise ValueError(f"<Unsupported cwarchive version: {version}>")
+
+        _flags = self.__read_u16(f)
+        header_len = self.__read_u16(f)
+
+        index_offset = self.__read_u64(f)
+        _object_count = self.__read_u32(f)
+        metadata_len = self.__read_u32(f)
+
+        # Skip metadata if present
+        if metadata_len > 0:
+            _ = self.__read_exact(f, metadata_len)
+
+        # If header_len is larger than what we read, skip remaining header bytes
+        already_read = 2 + 2 + 2 + 2 + 8 + 4 + 4 + metadata_len
+        if header_len > already_read:
+            _ = self.__read_exact(f, header_len - already_read)
+
+        if index_offset <= 0:
+            raise ValueError("<Invalid cwarchive: missing index offset>")
+
+        # ----- index -----
+        f.seek(index_offset)
+        idx_magic = self.__read_exact(f, 4)
+        if idx_magic != b"IDX1":
+            raise ValueError("<Invalid cwarchive: bad index magic>")
+
+        count = self.__read_u32(f)
+
+        index_entries: list[dict[str, Any]] = []
+        for _ in range(count):
+            object_id = self.__read_u32(f)
+            type_code = self.__read_u8(f)
+            rec_flags = self.__read_u16(f)
+            offset = self.__read_u64(f)
+            payload_len = self.__read_u64(f)
+            checksum = self.__read_u32(f)
+            _reserved = self.__read_u8(f)
+
+            index_entries.append({
+                "object_id": int(object_id),
+                "type_code": int(type_code),
+                "rec_flags": int(rec_flags),
+                "offset": int(offset),
+                "payload_len": int(payload_len),
+                "checksum": int(checksum),
+            })
+
+        return index_entries
+
+    def __read_payload(self, f, e: dict[str, Any]) -> bytes:
+        """
+        Reads and verifies the payload of the record located by index entry `e`.
+        """
+        f.seek(e["offset"])
 
-                payload = self.__read_exact(f, payload_len_r)
+        type_code_r = self.__read_u8(f)
+        object_id_r = self.__read_u32(f)
+        rec_flags_r = self.__read_u16(f)
+        payload_len_r = self.__read_u64(f)
+        checksum_r = self.__read_u32(f)
 
-                # Basic integrity checks (simple checksum)
-                chk = self.__checksum32(payload)
-                if chk != checksum_r:
-                    raise ValueError(f"<Corrupted payload (id={object_id_r}): checksum mismatch>")
+        payload = self.__read_exact(f, payload_len_r)
 
-                # Optional: cross-check index vs record
-                if int(object_id_r) != e["object_id"] or int(type_code_r) != e["type_code"]:
-                    raise ValueError(f"<Index mismatch for record id={e['object_id']}>")
+        # Basic integrity checks (simple checksum)
+        chk = self.__checksum32(payload)
+        if chk != checksum_r:
+            raise ValueError(f"<Corrupted payload (id={object_id_r}): checksum mismatch>")
 
-                items.append({
-                    "object_id": int(object_id_r),
-                    "type_code": int(type_code_r),
-                    "rec_flags": int(rec_flags_r),
-                    "payload": payload,
-                })
+        # Cross-check index vs record (the flags mark chat history segments)
+        if (
+            int(object_id_r) != e["object_id"]
+            or int(type_code_r) != e["type_code"]
+            or int(rec_flags_r) != e["rec_flags"]
+        ):
+            raise ValueError(f"<Index mismatch for record id={e['object_id']}>")
 
-        return items
+        return payload
 
 
     # -------- REBUILD OBJECTS (PARALLEL) --------
@@ -649,6 +1679,7 @@ class Archive(object):
                 payload,
                 api_key,
                 api_key_provider,
+                item.get("segments"),
             )
             out[object_id] = obj
 
@@ -674,6 +1705,7 @@ class Archive(object):
                 payload,
                 api_key,
                 api_key_provider,
+                item.get("segments"),
             )
         return out
 
@@ -684,13 +1716,19 @@ class Archive(object):
             payload: bytes,
             api_key: str | None,
             api_key_provider: Optional[Callable[[int, int, dict[str, Any]], Optional[str]]],
+            segments: Optional[list[bytes]] = None,
     ) -> Any:
         """
         Decodes JSON payload and rebuilds the object using thaw().
+        The history of a segmented chat is reassembled from `segments` first.
         """
         text = payload.decode("utf-8")
         snapshot = json.loads(text)
 
+        if segments is not None:
+            nodes = [node for segment in segments for node in json.loads(segment.decode("utf-8"))]
+            snapshot["properties"]["history"] = nodes[int(snapshot["segments"]["skip"]):]
+
         # Optional per-object api key injection (not stored in archive)
         chosen_key: str | None = api_key
         if api_key_provider is not None:
@@ -1,18 +1,37 @@
 from __future__ import annotations
 
-import base64
+import asyncio
+import hashlib
 import pathlib
 import time
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterator, Optional
 
+import openai
 from openai.types import FileObject
 
-from .model import Model
+from .model import Model, KeyStatus
 from .data import ChatWeaverSystemRules
 from .schema import Schema
-from .helpers import is_valid_url, is_valid_path, is_file_id
+from .retry_policy import RetryPolicy
+from .helpers import is_valid_url, is_valid_path, is_file_id, is_file_id_string
 from .bot_completion_result import BotCompletionResult
+from .bot_batch_result import BotBatchResult
+from .bot_completion_stream import BotCompletionStream, AsyncBotCompletionStream
 from .metadata_container import MetadataContainer
+from .rate_limiter import estimate_request_tokens
+from .tokenizer import count_message_tokens, estimate_cost
+from .completion_cache import CompletionCache, request_cache_key
+from .single_flight import get_single_flight
+from .chat_history import ChatHistory, to_message
+from .image_cache import get_image_cache
+from .upload_cache import get_upload_cache
+
+
+# Purpose used for chat attachments, and the worker bound for preparing the
+# attachments (image encoding, file uploads) of one request concurrently
+_UPLOAD_PURPOSE = "user_data"
+_ATTACHMENT_WORKERS = 4
 
 
 class Bot(object):
@@ -31,6 +50,10 @@ class Bot(object):
         max_completion_tokens: Optional[int] = None,
         auto_continue: bool = False,
         max_continuations: int = 0,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[CompletionCache] = None,
+        coalesce: bool = False,
+        stable_prefix: bool = False,
         **kwargs,
     ) -> None:
         """
@@ -45,8 +68,14 @@ class Bot(object):
             "max_completion_tokens": None,
             "auto_continue": False,
             "max_continuations": 0,
+            "retry_policy": None,
+            "stable_prefix": False,
         }
 
+        # Runtime-only collaborators (never frozen)
+        self.cache = cache
+        self.coalesce = coalesce
+
         # Restore from snapshot
         if "define" in kwargs:
             attributes: dict[str, dict[str, Any]] = kwargs["define"]
@@ -71,6 +100,8 @@ class Bot(object):
         self.max_completion_tokens = max_completion_tokens
         self.auto_continue = auto_continue
         self.max_continuations = max_continuations
+        self.retry_policy = retry_policy
+        self.stable_prefix = stable_prefix
         self.model = model if model is not None else Model(api_key=None)
 
 
@@ -84,6 +115,10 @@ class Bot(object):
         if self.schema is not None:
             schema_snapshot = self.schema.freeze()
 
+        retry_policy_snapshot: Optional[dict[str, Any]] = None
+        if self.retry_policy is not None:
+            retry_policy_snapshot = self.retry_policy.freeze()
+
         return {
             "version": 1,
             "properties": {
@@ -95,6 +130,8 @@ class Bot(object):
                 "max_completion_tokens": self.max_completion_tokens,
                 "auto_continue": self.auto_continue,
                 "max_continuations": self.max_continuations,
+                "retry_policy": retry_policy_snapshot,  # snapshot or None
+                "stable_prefix": self.stable_prefix,
             },
             "extra": {}
         }
@@ -139,6 +176,16 @@ class Bot(object):
                 raise ValueError("<Invalid snapshot: schema must be a dict snapshot or None>")
             schema_obj = Schema.thaw(schema_snapshot)
 
+        # Restore retry policy (if present)
+        retry_policy_snapshot = props.get("retry_policy")
+        retry_policy_obj: Optional[RetryPolicy]
+        if retry_policy_snapshot is None:
+            retry_policy_obj = None
+        else:
+            if not isinstance(retry_policy_snapshot, dict):
+                raise ValueError("<Invalid snapshot: retry_policy must be a dict snapshot or None>")
+            retry_policy_obj = RetryPolicy.thaw(retry_policy_snapshot)
+
         define = {
             "properties": {
                 "name": props.get("name", "AI Bot"),
@@ -149,6 +196,8 @@ class Bot(object):
                 "max_completion_tokens": props.get("max_completion_tokens", None),
                 "auto_continue": props.get("auto_continue", False),
                 "max_continuations": props.get("max_continuations", 0),
+                "retry_policy": retry_policy_obj,
+                "stable_prefix": props.get("stable_prefix", False),
             },
             "extra": snapshot.get("extra", {}),
         }
@@ -166,6 +215,7 @@ class Bot(object):
         is_max_completion_tokens: bool = self.max_completion_tokens == self.__default_attributes["max_completion_tokens"]
         is_auto_continue: bool = self.auto_continue == self.__default_attributes["auto_continue"]
         is_max_continuations: bool = self.max_continuations == self.__default_attributes["max_continuations"]
+        is_stable_prefix: bool = self.stable_prefix == self.__default_attributes["stable_prefix"]
 
         parts: list[str] = []
         if not is_name:
@@ -180,11 +230,15 @@ class Bot(object):
             parts.append(f"auto_continue={self.auto_continue!r}")
         if not is_max_continuations:
             parts.append(f"max_continuations={self.max_continuations!r}")
+        if not is_stable_prefix:
+            parts.append(f"stable_prefix={self.stable_prefix!r}")
 
         parts.append(f"model={self.model!r}")
 
         if self.schema is not None:
             parts.append(f"schema={self.schema!r}")
+        if self.retry_policy is not None:
+            parts.append(f"retry_policy={self.retry_policy!r}")
 
         return f"Bot({', '.join(parts)})"
 
@@ -200,6 +254,8 @@ class Bot(object):
         same_max_completion_tokens = self.max_completion_tokens == other.max_completion_tokens
         same_auto_continue = self.auto_continue == other.auto_continue
         same_max_continuations = self.max_continuations == other.max_continuations
+        same_retry_policy = self.retry_policy == other.retry_policy
+        same_stable_prefix = self.stable_prefix == other.stable_prefix
 
         return (
             same_name
@@ -210,6 +266,8 @@ class Bot(object):
             and same_max_completion_tokens
             and same_auto_continue
             and same_max_continuations
+            and same_retry_policy
+            and same_stable_prefix
         )
 
     # -------- PROPERTIES --------
@@ -228,12 +286,13 @@ class Bot(object):
     @property
     def rules(self) -> str:
         """Return the active rules string including the bot name."""
-        return f"[Your name as AI is: '{self.name}']\n" + self.__rules
+        return self.__system_prefix
     @rules.setter
     def rules(self, new_rules: Optional[str]) -> None:
         """Set the base rules string for the bot."""
         self.__input_rules = str(new_rules) if new_rules is not None else ChatWeaverSystemRules.default()
         self.__rules = self.__input_rules
+        self.__refresh_system_prefix()
 
     @property
     def name(self) -> str:
@@ -246,6 +305,19 @@ class Bot(object):
         if len(new_name) == 0:
             raise ValueError("<Invalid 'name': cannot be empty>")
         self.__name = new_name
+        self.__refresh_system_prefix()
+
+    def __refresh_system_prefix(self) -> None:
+        """
+        Precompute the system prompt prefix (name header + rules) and its
+        prompt_cache_key. Called by the name and rules setters.
+        """
+        name = getattr(self, "_Bot__name", None)
+        rules = getattr(self, "_Bot__rules", None)
+        if name is None or rules is None:
+            return
+        self.__system_prefix = f"[Your name as AI is: '{name}']\n" + rules
+        self.__prompt_cache_key = hashlib.sha256(self.__system_prefix.encode("utf-8")).hexdigest()[:32]
 
     @property
     def time_format(self) -> str:
@@ -309,6 +381,23 @@ class Bot(object):
             raise TypeError("<Invalid 'auto_continue': expected bool>")
         self.__auto_continue = new
 
+    @property
+    def stable_prefix(self) -> bool:
+        """
+        Return whether requests use the prompt-cache-friendly message layout.
+        """
+        return self.__stable_prefix
+    @stable_prefix.setter
+    def stable_prefix(self, new: bool) -> None:
+        """
+        Enable or disable the prompt-cache-friendly layout: rules first, then
+        history, then the user identity and prompt, so consecutive turns and
+        different users share the longest possible request prefix.
+        """
+        if not isinstance(new, bool):
+            raise TypeError("<Invalid 'stable_prefix': expected bool>")
+        self.__stable_prefix = new
+
     @property
     def max_continuations(self) -> int:
         """Return how many follow-up continuation calls are allowed."""
@@ -326,32 +415,60 @@ class Bot(object):
 
         self.__max_continuations = value
 
-    def _normalize_history(self, history: list) -> list[dict[str, Any]]:
-        """
-        Convert ChatWeaver TextNode/dict history into OpenAI-compatible messages.
-        Extra ChatWeaver metadata such as owner, tokens, date, image_data, and
-        file_data is intentionally not forwarded to the API.
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
         """
-        normalized: list[dict[str, Any]] = []
-        allowed_roles = {"system", "developer", "user", "assistant", "tool"}
+        Return the retry policy for transient API errors.
 
-        for item in history:
-            message = dict(item)
-            role = message.get("role")
-            content = message.get("content")
+        None keeps the OpenAI client's own default retries. With a policy, ChatWeaver
+        retries each request itself (jittered backoff, Retry-After honored), so a
+        failure during auto_continue never discards the continuations already received.
+        """
+        return self.__retry_policy
+    @retry_policy.setter
+    def retry_policy(self, new: Optional[RetryPolicy]) -> None:
+        """Set the retry policy for transient API errors."""
+        if not isinstance(new, (RetryPolicy, type(None))):
+            raise TypeError("<Invalid 'retry_policy' type: expected RetryPolicy or None>")
+        self.__retry_policy = new
 
-            if role not in allowed_roles:
-                raise ValueError(f"<Invalid history role: {role!r}>")
+    @property
+    def cache(self) -> Optional[CompletionCache]:
+        """
+        Return the opt-in exact-match completion cache.
+        It is runtime-only: it is not part of freeze() snapshots nor of equality.
+        """
+        return self.__cache
+    @cache.setter
+    def cache(self, new: Optional[CompletionCache]) -> None:
+        """Set (or disable with None) the completion cache."""
+        if not isinstance(new, (CompletionCache, type(None))):
+            raise TypeError("<Invalid 'cache' type: expected CompletionCache or None>")
+        self.__cache = new
 
-            if content is None:
-                content = ""
+    @property
+    def coalesce(self) -> bool:
+        """
+        Return whether concurrent identical completions share one upstream request.
+        Runtime-only, like `cache`.
+        """
+        return self.__coalesce
+    @coalesce.setter
+    def coalesce(self, new: bool) -> None:
+        """Enable or disable single-flight request coalescing."""
+        if not isinstance(new, bool):
+            raise TypeError("<Invalid 'coalesce': expected bool>")
+        self.__coalesce = new
 
-            normalized.append({
-                "role": role,
-                "content": content,
-            })
+    def _normalize_history(self, history: list | ChatHistory) -> list[dict[str, Any]]:
+        """
+        Convert ChatWeaver TextNode/dict history into OpenAI-compatible messages.
+        A ChatHistory already holds normalized messages and is used as is.
+        """
+        if isinstance(history, ChatHistory):
+            return history.messages()
 
-        return normalized
+        return [to_message(item) for item in history]
 
     # -------- HELPERS --------
     def _ensure_remote_ready(self) -> None:
@@ -362,13 +479,25 @@ class Bot(object):
         # Accessing client triggers lazy validation inside Model
         _ = self.model.client
 
-    def get_metadata_messages(
-        self,
-        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
-        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
-    ) -> dict[str, list[dict[str, Any]]]:
+    async def _aensure_remote_ready(self) -> None:
         """
-        Build metadata message blocks for images and files.
+        Async counterpart of _ensure_remote_ready().
+        Validation is awaited so the event loop is never blocked by models.list().
+        """
+        if self.model.key_status is KeyStatus.VALID:
+            _ = self.model.async_client
+            return
+
+        if not await self.model.avalidate_api_key():
+            raise RuntimeError(
+                f"Client not available: key_status={self.model.key_status}. "
+                f"Reason: {self.model.last_auth_error or 'missing/invalid api_key'}"
+            )
+
+    @staticmethod
+    def _check_metadata_types(img_data: Any, file_data: Any) -> None:
+        """
+        Validate the accepted shapes of img_data and file_data.
         """
         if not (
             (
@@ -392,123 +521,289 @@ class Bot(object):
         ):
             raise TypeError("<file_data must be a string, pathlib.Path, FileObject, or list of them>")
 
-        image_messages: list[dict[str, Any]] = []
-        file_messages: list[dict[str, Any]] = []
-        images_content: list[Any] = []
-        files_content: list[Any] = []
-
-        # ---- images ----
-        if img_data is not None:
-            img_list = [img_data] if isinstance(img_data, (str, pathlib.Path)) else img_data
-
-            for i, image in enumerate(img_list):
-                if is_valid_url(image): # type: ignore
-                    img_list[i] = str(image)
-                elif is_valid_path(image):
-                    img_list[i] = (
-                        "data:image/png;base64,"
-                        + base64.b64encode(open(image, "rb").read()).decode("utf-8")
-                    )
-                else:
-                    raise ValueError(f"<Invalid image path or url: {image}>")
+    @staticmethod
+    def _encode_image(image: str | pathlib.Path) -> str:
+        """
+        Return a local image as a base64 data URL with its sniffed MIME type.
+        Served from the process-wide image cache when the file is unchanged.
+        """
+        return get_image_cache().get(image)
+
+    @staticmethod
+    def _classify_files(file_list: list[Any]) -> tuple[list[Optional[str]], list[tuple[int, Any]]]:
+        """
+        Split attachments into known file_ids and local paths to upload.
+        Accepts OpenAI FileObjects (their `id` is used), local paths, and
+        "file-..." id strings; a string naming an existing local file is always
+        uploaded as a path, even if it looks like a file id.
+        Returns the file_id list (None where an upload is pending) and the
+        (index, path) pairs of the local files.
+        """
+        file_ids: list[Optional[str]] = []
+        local_files: list[tuple[int, Any]] = []
 
-            for image in img_list:
-                image_messages.append({"type": "image_url", "image_url": {"url": image}})
-                images_content.append(image)
+        for i, f in enumerate(file_list):
+            # 1) already a file object
+            if is_file_id(f):
+                file_ids.append(str(f.id))
 
-        # ---- files ----
-        if file_data is not None:
-            file_list = [file_data] if isinstance(file_data, (str, pathlib.Path, FileObject)) else file_data
+            # 2) local path -> upload (requires remote services)
+            elif is_valid_path(f):
+                file_ids.append(None)
+                local_files.append((i, f))
+
+            # 3) URL not supported
+            elif isinstance(f, str) and is_valid_url(f):
+                raise ValueError(f"<Invalid file source (URL not supported): {f}>")
+
+            # 4) file_id string (never an existing local path, see 2)
+            elif is_file_id_string(f):
+                file_ids.append(f)
+
+            else:
+                raise ValueError(f"<Invalid file path or file_id: {f}>")
+
+        return file_ids, local_files
+
+    def _upload_key(self, path: Any) -> str:
+        """
+        Return the upload cache key of a local file: content hash, purpose
+        and API key fingerprint.
+        """
+        digest = get_upload_cache().file_digest(path)
+        return get_upload_cache().key(digest, _UPLOAD_PURPOSE, self.model._api_key_fingerprint(self.model.api_key or ""))
+
+    def _upload_file(self, path: Any) -> str:
+        """
+        Return the file_id of a local file, uploading it only when the upload
+        cache has no reusable entry. Concurrent uploads of the same content
+        share one request.
+        """
+        key = self._upload_key(path)
+        cached = get_upload_cache().get(key)
+        if cached is not None:
+            return cached
+
+        def upload() -> str:
+            with open(path, "rb") as fh:
+                uploaded = self.model.client.files.create(file=fh, purpose=_UPLOAD_PURPOSE)
+            get_upload_cache().add(key, uploaded.id)
+            return uploaded.id
+
+        file_id, _ = get_single_flight().do(f"upload:{key}", upload)
+        return file_id
+
+    async def _aupload_file(self, path: Any) -> str:
+        """
+        Async counterpart of _upload_file(). Hashing runs in a worker thread.
+        """
+        key = await asyncio.to_thread(self._upload_key, path)
+        cached = get_upload_cache().get(key)
+        if cached is not None:
+            return cached
 
-            for f in file_list:
-                # 1) already a file_id
-                if is_file_id(f):
-                    uploaded_id = str(f)
+        async def upload() -> str:
+            with open(path, "rb") as fh:
+                uploaded = await self.model.async_client.files.create(file=fh, purpose=_UPLOAD_PURPOSE)
+            get_upload_cache().add(key, uploaded.id)
+            return uploaded.id
 
-                # 2) local path -> upload (requires remote services)
-                elif is_valid_path(f):
-                    self._ensure_remote_ready()
-                    with open(f, "rb") as fh: # type: ignore
-                        uploaded = self.model.client.files.create(
-                            file=fh,
-                            purpose="user_data",
-                        )
-                    files_content.append(f)
-                    uploaded_id = uploaded.id
+        file_id, _ = await get_single_flight().ado(f"upload:{key}", upload)
+        return file_id
+
+    def cleanup_uploads(self, older_than: Optional[float] = None) -> list[str]:
+        """
+        Delete the files this bot's API key uploaded through the upload cache
+        more than `older_than` seconds ago (default: the cache TTL), and forget
+        them. Files already deleted remotely are forgotten as well.
 
-                # 3) URL not supported
-                elif isinstance(f, str) and is_valid_url(f):
-                    raise ValueError(f"<Invalid file source (URL not supported): {f}>")
+        Returns:
+            The file_ids removed from the cache.
+        """
+        self._ensure_remote_ready()
+        cache = get_upload_cache()
+        removed: list[str] = []
 
-                else:
-                    raise ValueError(f"<Invalid file path or file_id: {f}>")
+        for file_id in cache.stale(self.model._api_key_fingerprint(self.model.api_key or ""), older_than):
+            try:
+                self.model.client.files.delete(file_id)
+            except openai.NotFoundError:
+                pass
+            cache.discard_file_id(file_id)
+            removed.append(file_id)
 
-                file_messages.append({"type": "file", "file": {"file_id": uploaded_id}})
+        return removed
 
+    @staticmethod
+    def _classify_images(img_data: Any) -> tuple[list[Optional[str]], list[tuple[int, Any]]]:
+        """
+        Split image attachments into URLs and local paths to encode.
+        Returns the URL list (None where encoding is pending) and the
+        (index, path) pairs of the local images.
+        """
+        img_list = [img_data] if isinstance(img_data, (str, pathlib.Path)) else list(img_data)
+        urls: list[Optional[str]] = []
+        local_images: list[tuple[int, Any]] = []
+
+        for i, image in enumerate(img_list):
+            if is_valid_url(image): # type: ignore
+                urls.append(str(image))
+            elif is_valid_path(image):
+                urls.append(None)
+                local_images.append((i, image))
+            else:
+                raise ValueError(f"<Invalid image path or url: {image}>")
+
+        return urls, local_images
+
+    @staticmethod
+    def _timed(kind: str, source: Any, fn: Any) -> tuple[Any, dict[str, Any]]:
+        """
+        Run one attachment job and return its value with a timing record.
+        """
+        start = time.perf_counter()
+        value = fn(source)
+        return value, {"kind": kind, "source": str(source), "seconds": time.perf_counter() - start}
+
+    @staticmethod
+    def _metadata_result(
+        urls: list[Optional[str]],
+        file_ids: list[Optional[str]],
+        files_content: list[Any],
+        timings: list[dict[str, Any]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Assemble the metadata message blocks once every attachment is ready.
+        """
         return {
-            "image_messages": image_messages,
-            "file_messages": file_messages,
-            "images_content": images_content,
+            "image_messages": [{"type": "image_url", "image_url": {"url": url}} for url in urls],
+            "file_messages": [{"type": "file", "file": {"file_id": file_id}} for file_id in file_ids],
+            "images_content": list(urls),
             "files_content": files_content,
+            "timings": timings,
         }
 
-    # -------- ACTIONS --------
-    def completion(
+    def get_metadata_messages(
         self,
-        prompt: str,
-        user: str = "User",
-        history: list | None = None,
         img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
         file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
-        response_schema: Schema | None = None,
-        max_completion_tokens: Optional[int] = None,
-        auto_continue: Optional[bool] = None,
-        max_continuations: Optional[int] = None,
-    ) -> BotCompletionResult:
+    ) -> dict[str, list[dict[str, Any]]]:
         """
-        Generate a chat completion using the current bot configuration.
+        Build metadata message blocks for images and files.
+        Local images are encoded and local files uploaded concurrently on a
+        bounded thread pool; each job is timed in the "timings" entry.
+        """
+        self._check_metadata_types(img_data, file_data)
 
-        The method builds the system/user messages, optionally includes previous
-        history, images, files, and a response schema, then sends the request to
-        the configured model.
+        urls, local_images = self._classify_images(img_data) if img_data is not None else ([], [])
+        if file_data is not None:
+            file_list = [file_data] if isinstance(file_data, (str, pathlib.Path, FileObject)) else file_data
+            file_ids, local_files = self._classify_files(file_list)
+        else:
+            file_ids, local_files = [], []
 
-        By default, `max_completion_tokens` is None, so ChatWeaver does not impose
-        an output-token limit and lets the model use its available capacity.
-        If `auto_continue` is enabled, the bot can request follow-up completions
-        when the response is cut off because of token limits.
+        # (kind, index, path, worker) for every attachment that needs work
+        jobs: list[tuple[str, int, Any, Any]] = [("image", i, path, self._encode_image) for i, path in local_images]
+        if local_files:
+            self._ensure_remote_ready()
+            jobs += [("file", i, path, self._upload_file) for i, path in local_files]
 
-        Args:
-            prompt: User prompt to send to the model.
-            user: Name of the user shown in the system context.
-            history: Optional previous messages to include in the request.
-            img_data: Optional image path, URL, or list of images.
-            file_data: Optional file path, file id/object, or list of files.
-            response_schema: Optional schema for structured output.
-            max_completion_tokens: Optional maximum number of output tokens.
-            auto_continue: Whether to continue automatically if output is truncated.
-            max_continuations: Maximum number of automatic continuations.
+        if len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(jobs), _ATTACHMENT_WORKERS)) as executor:
+                outcomes = list(executor.map(lambda job: self._timed(job[0], job[2], job[3]), jobs))
+        else:
+            outcomes = [self._timed(kind, path, fn) for kind, _, path, fn in jobs]
 
-        Returns:
-            A BotCompletionResult containing the response text, token usage,
-            timing information, metadata, and completion status.
+        timings: list[dict[str, Any]] = []
+        for (kind, i, _, _), (value, timing) in zip(jobs, outcomes):
+            (urls if kind == "image" else file_ids)[i] = value
+            timings.append(timing)
+
+        return self._metadata_result(urls, file_ids, [path for _, path in local_files], timings)
+
+    async def aget_metadata_messages(
+        self,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
         """
-        start_date = time.strftime(self.time_format, time.localtime(time.time()))
-        prompt = str(prompt)
+        Async counterpart of get_metadata_messages().
+        Local images are encoded in worker threads and files are uploaded
+        through the AsyncOpenAI client, as concurrent tasks bounded by a semaphore.
+        """
+        self._check_metadata_types(img_data, file_data)
+
+        urls, local_images = self._classify_images(img_data) if img_data is not None else ([], [])
+        if file_data is not None:
+            file_list = [file_data] if isinstance(file_data, (str, pathlib.Path, FileObject)) else file_data
+            file_ids, local_files = self._classify_files(file_list)
+        else:
+            file_ids, local_files = [], []
+
+        if local_files:
+            await self._aensure_remote_ready()
+
+        semaphore = asyncio.Semaphore(_ATTACHMENT_WORKERS)
+
+        async def encode(path: Any) -> tuple[str, dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self._timed, "image", path, self._encode_image)
+
+        async def upload(path: Any) -> tuple[str, dict[str, Any]]:
+            async with semaphore:
+                start = time.perf_counter()
+                file_id = await self._aupload_file(path)
+                return file_id, {"kind": "file", "source": str(path), "seconds": time.perf_counter() - start}
+
+        outcomes = await asyncio.gather(
+            *(encode(path) for _, path in local_images),
+            *(upload(path) for _, path in local_files),
+        )
+
+        timings: list[dict[str, Any]] = []
+        targets = [(urls, i) for i, _ in local_images] + [(file_ids, i) for i, _ in local_files]
+        for (target, i), (value, timing) in zip(targets, outcomes):
+            target[i] = value
+            timings.append(timing)
 
+        return self._metadata_result(urls, file_ids, [path for _, path in local_files], timings)
+
+    def _prepare_request(
+        self,
+        prompt: str,
+        user: str,
+        history: list | ChatHistory | None,
+        metadata_messages: dict[str, list[dict[str, Any]]],
+        response_schema: Schema | None,
+        max_completion_tokens: Optional[int],
+        auto_continue: Optional[bool],
+        max_continuations: Optional[int],
+    ) -> dict[str, Any]:
+        """
+        Build the OpenAI request and resolve the effective per-call settings.
+        Shared by completion() and acompletion().
+        """
         user_message: dict[str, Any | list] = {
             "role": "user",
             "content": [{"type": "text", "text": prompt}],
         }
 
-        messages: list[dict[str, Any | list]] = [
-            {"role": "system", "content": self.rules + f"\n[The name of the user is: '{user}']"},
-            user_message,
-        ]
-
-        if history is not None:
-            messages = self._normalize_history(history) + messages
+        if self.stable_prefix:
+            # Shared prefix first (rules, then history in order); the per-user
+            # part goes last so it never invalidates the provider's prompt cache.
+            messages: list[dict[str, Any | list]] = [{"role": "system", "content": self.__system_prefix}]
+            if history is not None:
+                messages.extend(self._normalize_history(history))
+            messages.append({"role": "system", "content": f"[The name of the user is: '{user}']"})
+            messages.append(user_message)
+        else:
+            messages = [
+                {"role": "system", "content": self.__system_prefix + f"\n[The name of the user is: '{user}']"},
+                user_message,
+            ]
 
-        metadata_messages = self.get_metadata_messages(img_data=img_data, file_data=file_data)
+            if history is not None:
+                messages = self._normalize_history(history) + messages
 
         for image_message in metadata_messages["image_messages"]:
             user_message["content"].append(image_message)  # type: ignore[union-attr]
@@ -548,8 +843,6 @@ class Bot(object):
         if response_schema is not None and effective_auto_continue and effective_max_continuations > 0:
             raise ValueError("<'auto_continue' is not compatible with structured response_schema>")
 
-        self._ensure_remote_ready()
-
         request_kwargs: dict[str, Any] = {
             "model": self.model.model,
             "messages": messages,
@@ -561,80 +854,1578 @@ class Bot(object):
         if effective_max_completion_tokens is not None:
             request_kwargs["max_completion_tokens"] = effective_max_completion_tokens
 
-        start = time.perf_counter()
+        if self.stable_prefix:
+            # Route requests sharing these rules to the same prompt cache
+            request_kwargs["prompt_cache_key"] = self.__prompt_cache_key
+
+        return {
+            "request_kwargs": request_kwargs,
+            "response_schema": response_schema,
+            "auto_continue": effective_auto_continue,
+            "max_continuations": effective_max_continuations,
+        }
 
-        response = self.model.client.chat.completions.create(**request_kwargs)  # type: ignore[arg-type]
+    @staticmethod
+    def _read_response(response: Any) -> dict[str, Any]:
+        """
+        Extract content, finish_reason and token usage from a chat completion.
+        """
         choice = response.choices[0]
         msg = choice.message
         content = msg.content if msg.content is not None else (msg.refusal or "")
 
-        all_content: list[str] = [str(content)]
-        finish_reason = choice.finish_reason
-        continuations_used = 0
+        details = getattr(response.usage, "prompt_tokens_details", None) if response.usage else None
 
-        prompt_tokens = int(response.usage.prompt_tokens if response.usage else 0)
-        completion_tokens = int(response.usage.completion_tokens if response.usage else 0)
-        total_tokens = int(response.usage.total_tokens if response.usage else 0)
+        return {
+            "content": str(content),
+            "finish_reason": choice.finish_reason,
+            "prompt_tokens": int(response.usage.prompt_tokens if response.usage else 0),
+            "completion_tokens": int(response.usage.completion_tokens if response.usage else 0),
+            "total_tokens": int(response.usage.total_tokens if response.usage else 0),
+            "cached_tokens": int(getattr(details, "cached_tokens", 0) or 0),
+        }
 
-        while (
-            effective_auto_continue
+    @staticmethod
+    def _read_stream_chunk(chunk: Any, usage: dict[str, int]) -> tuple[str, str | None]:
+        """
+        Extract the content delta and finish_reason from a streamed chunk.
+        Usage (sent in the last chunk when include_usage is set) is accumulated in place.
+        """
+        chunk_usage = getattr(chunk, "usage", None)
+        if chunk_usage:
+            usage["prompt_tokens"] += int(chunk_usage.prompt_tokens or 0)
+            usage["completion_tokens"] += int(chunk_usage.completion_tokens or 0)
+            usage["total_tokens"] += int(chunk_usage.total_tokens or 0)
+            details = getattr(chunk_usage, "prompt_tokens_details", None)
+            usage["cached_tokens"] += int(getattr(details, "cached_tokens", 0) or 0)
+
+        if not chunk.choices:
+            return "", None
+
+        choice = chunk.choices[0]
+        delta = choice.delta
+        text = ""
+        if delta is not None:
+            text = delta.content or getattr(delta, "refusal", None) or ""
+
+        return str(text), choice.finish_reason
+
+    @staticmethod
+    def _mark_delta(timing: dict[str, Any]) -> None:
+        """
+        Record the arrival time of a content delta.
+        """
+        now = time.perf_counter()
+        if timing["first"] is None:
+            timing["first"] = now
+        timing["last"] = now
+        timing["deltas"] += 1
+
+    @staticmethod
+    def _should_continue(prepared: dict[str, Any], finish_reason: str | None, continuations_used: int) -> bool:
+        """
+        Return True if another auto_continue call is allowed.
+        """
+        return (
+            prepared["auto_continue"]
             and finish_reason == "length"
-            and continuations_used < effective_max_continuations
-        ):
-            continuations_used += 1
+            and continuations_used < prepared["max_continuations"]
+        )
+
+    @staticmethod
+    def _append_continuation(request_kwargs: dict[str, Any], last_content: str) -> None:
+        """
+        Append the partial answer and the continuation instruction to the request.
+        """
+        messages = request_kwargs["messages"]
+        messages.append({"role": "assistant", "content": last_content})
+        messages.append({
+            "role": "user",
+            "content": "Continue exactly where you stopped. Do not repeat previous text.",
+        })
+        request_kwargs["messages"] = messages
+
+    # -------- RESPONSE CACHE --------
+    def _request_key(self, prepared: dict[str, Any]) -> str:
+        """
+        Return the canonical hash of a prepared request.
+        The key covers the final request_kwargs plus the continuation settings;
+        the schema is represented by its memoized fingerprint instead of being
+        serialized again.
+        """
+        request = prepared["request_kwargs"]
+        schema = prepared.get("response_schema")
+        if schema is not None:
+            request = dict(request)
+            request["response_format"] = schema.fingerprint
+
+        return request_cache_key({
+            "request": request,
+            "auto_continue": prepared["auto_continue"],
+            "max_continuations": prepared["max_continuations"] if prepared["auto_continue"] else 0,
+        })
+
+    def _cache_key(self, prepared: dict[str, Any]) -> Optional[str]:
+        """
+        Return the cache key of a prepared request, or None when caching is off.
+        """
+        if self.cache is None:
+            return None
+        return self._request_key(prepared)
 
-            messages.append({"role": "assistant", "content": all_content[-1]})
-            messages.append({
-                "role": "user",
-                "content": "Continue exactly where you stopped. Do not repeat previous text.",
-            })
-            request_kwargs["messages"] = messages
+    def _flight_key(self, prepared: dict[str, Any], cache_key: Optional[str]) -> str:
+        """
+        Return the coalescing key: the request hash scoped to the API key,
+        so identical requests billed to different accounts are never merged.
+        """
+        request_key = cache_key if cache_key is not None else self._request_key(prepared)
+        api_key = self.model.api_key or ""
+        return f"{request_key}:{self.model._api_key_fingerprint(api_key)}"
 
-            response = self.model.client.chat.completions.create(**request_kwargs)  # type: ignore[arg-type]
-            choice = response.choices[0]
-            msg = choice.message
-            next_content = msg.content if msg.content is not None else (msg.refusal or "")
+    def _cache_lookup(
+        self,
+        cache_key: Optional[str],
+        start_date: str,
+        metadata_messages: dict[str, list[dict[str, Any]]],
+    ) -> Optional[BotCompletionResult]:
+        """
+        Return a result flagged as cache hit, or None on a miss.
+        """
+        if cache_key is None or self.cache is None:
+            return None
 
-            all_content.append(str(next_content))
-            finish_reason = choice.finish_reason
+        start = time.perf_counter()
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return None
 
-            prompt_tokens += int(response.usage.prompt_tokens if response.usage else 0)
-            completion_tokens += int(response.usage.completion_tokens if response.usage else 0)
-            total_tokens += int(response.usage.total_tokens if response.usage else 0)
+        return self._build_result(
+            start_date=start_date,
+            delta_time=time.perf_counter() - start,
+            all_content=[str(entry.get("content", ""))],
+            usage={
+                "prompt_tokens": int(entry.get("prompt_tokens", 0)),
+                "completion_tokens": int(entry.get("completion_tokens", 0)),
+                "total_tokens": int(entry.get("total_tokens", 0)),
+            },
+            metadata_messages=metadata_messages,
+            finish_reason=entry.get("finish_reason"),
+            continuations_used=int(entry.get("continuations", 0)),
+            cache_hit=True,
+        )
 
-        end = time.perf_counter()
+    def _cache_store(self, cache_key: Optional[str], result: BotCompletionResult) -> None:
+        """
+        Store a fresh result under its cache key.
+        """
+        if cache_key is None or self.cache is None:
+            return
+        self.cache.set(cache_key, {
+            "content": result.content,
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "total_tokens": result.total_tokens,
+            "finish_reason": result.finish_reason,
+            "continuations": result.continuations,
+        })
+
+    # -------- REQUEST EXECUTION --------
+    @staticmethod
+    def _new_call_stats(deadline: Optional[float] = None) -> dict[str, Any]:
+        """
+        Return the per-call accumulator for scheduling statistics.
+        `deadline` (seconds from now) bounds the whole call, continuations included.
+        """
+        deadline_at: Optional[float] = None
+        if deadline is not None:
+            try:
+                deadline = float(deadline)
+            except Exception:
+                raise TypeError("<'deadline' must be a number of seconds or None>")
+            if deadline <= 0:
+                raise ValueError("<'deadline' must be > 0 or None>")
+            deadline_at = time.monotonic() + deadline
+
+        return {"queue_time": 0.0, "retries": 0, "deadline_at": deadline_at}
+
+    @staticmethod
+    def _remaining_time(call_stats: dict[str, Any]) -> Optional[float]:
+        """
+        Return the seconds left before the call deadline, or None without a deadline.
+        Raises TimeoutError once the deadline has passed.
+        """
+        deadline_at = call_stats["deadline_at"]
+        if deadline_at is None:
+            return None
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("<Deadline exceeded before the completion finished>")
+        return remaining
+
+    def _request_options(self, call_stats: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return per-request client options: the remaining deadline as timeout, and
+        no client-side retries when this bot's retry policy handles them or a
+        deadline is set (each SDK retry would get the full timeout again).
+        """
+        options: dict[str, Any] = {}
+        if self.retry_policy is not None:
+            options["max_retries"] = 0
+        remaining = self._remaining_time(call_stats)
+        if remaining is not None:
+            options["timeout"] = remaining
+            options["max_retries"] = 0
+        return options
+
+    def _retry_delay(self, error: BaseException, attempt: int, call_stats: dict[str, Any]) -> Optional[float]:
+        """
+        Return how long to wait before retrying after `error`, or None to give up.
+        """
+        policy = self.retry_policy
+        if policy is None or attempt >= policy.max_retries or not policy.is_retryable(error):
+            return None
+
+        delay = policy.delay(attempt + 1, error)
+        deadline_at = call_stats["deadline_at"]
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            return None
+
+        call_stats["retries"] += 1
+        return delay
+
+    def _admit(self, request_kwargs: dict[str, Any], call_stats: dict[str, Any]) -> int:
+        """
+        Queue the request through the shared rate limiter, if one is registered,
+        never past the call deadline. Returns the token estimate to reconcile
+        once usage is known.
+        """
+        limiter = self.model.rate_limiter
+        if limiter is None:
+            return 0
+        estimated = estimate_request_tokens(request_kwargs)
+        call_stats["queue_time"] += limiter.acquire(estimated, timeout=self._remaining_time(call_stats))
+        return estimated
+
+    async def _aadmit(self, request_kwargs: dict[str, Any], call_stats: dict[str, Any]) -> int:
+        """
+        Async counterpart of _admit().
+        """
+        limiter = self.model.rate_limiter
+        if limiter is None:
+            return 0
+        estimated = estimate_request_tokens(request_kwargs)
+        call_stats["queue_time"] += await limiter.aacquire(estimated, timeout=self._remaining_time(call_stats))
+        return estimated
+
+    def _settle(self, estimated: int, actual: int) -> None:
+        """
+        Reconcile the pre-flight estimate against the real usage.
+        """
+        limiter = self.model.rate_limiter
+        if limiter is not None and estimated:
+            limiter.reconcile(estimated, actual)
+
+    def _note_request_outcome(self, error: Optional[BaseException] = None) -> None:
+        """
+        Feed a request outcome back to the Model's key validation state:
+        a success confirms the key, a 401 marks it invalid.
+        """
+        if error is None:
+            self.model.confirm_api_key()
+        elif isinstance(error, openai.AuthenticationError):
+            self.model.reject_api_key(str(error))
+
+    def _create(self, request_kwargs: dict[str, Any], call_stats: dict[str, Any]) -> Any:
+        """
+        Send one chat completion request through the sync client, retrying
+        transient failures according to the retry policy.
+        """
+        attempt = 0
+        while True:
+            estimated = self._admit(request_kwargs, call_stats)
+            try:
+                options = self._request_options(call_stats)
+                client = self.model.client.with_options(**options) if options else self.model.client
+                response = client.chat.completions.create(**request_kwargs)  # type: ignore[arg-type]
+            except Exception as e:
+                self._settle(estimated, 0)
+                self._note_request_outcome(e)
+                delay = self._retry_delay(e, attempt, call_stats)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            self._settle(estimated, int(response.usage.total_tokens if response.usage else estimated))
+            self._note_request_outcome()
+            return response
+
+    async def _acreate(self, request_kwargs: dict[str, Any], call_stats: dict[str, Any]) -> Any:
+        """
+        Send one chat completion request through the async client, retrying
+        transient failures according to the retry policy.
+        """
+        attempt = 0
+        while True:
+            estimated = await self._aadmit(request_kwargs, call_stats)
+            try:
+                options = self._request_options(call_stats)
+                client = self.model.async_client.with_options(**options) if options else self.model.async_client
+                response = await client.chat.completions.create(**request_kwargs)  # type: ignore[arg-type]
+            except Exception as e:
+                self._settle(estimated, 0)
+                self._note_request_outcome(e)
+                delay = self._retry_delay(e, attempt, call_stats)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            self._settle(estimated, int(response.usage.total_tokens if response.usage else estimated))
+            self._note_request_outcome()
+            return response
+
+    def _build_result(
+        self,
+        start_date: str,
+        delta_time: float,
+        all_content: list[str],
+        usage: dict[str, int],
+        metadata_messages: dict[str, list[dict[str, Any]]],
+        finish_reason: str | None,
+        continuations_used: int,
+        timing: dict[str, Any] | None = None,
+        call_stats: dict[str, Any] | None = None,
+        cache_hit: bool = False,
+        response_id: Optional[str] = None,
+    ) -> BotCompletionResult:
+        """
+        Assemble the final BotCompletionResult.
+        Streaming calls pass `timing` to report time-to-first-token and inter-token latency;
+        `call_stats` carries scheduling statistics such as the rate-limit queue time.
+        """
         final_date = time.strftime(self.time_format, time.localtime(time.time()))
 
+        time_to_first_token: float | None = None
+        inter_token_latency: float | None = None
+        if timing is not None and timing["first"] is not None:
+            time_to_first_token = timing["first"] - timing["start"]
+            if timing["deltas"] > 1:
+                inter_token_latency = (timing["last"] - timing["first"]) / (timing["deltas"] - 1)
+
         return BotCompletionResult(
             content="".join(all_content),
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            total_tokens=total_tokens,
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            total_tokens=usage["total_tokens"],
             start_date=start_date,
-            delta_time=end - start,
+            delta_time=delta_time,
             final_date=final_date,
             input_metadata=MetadataContainer(
                 images=metadata_messages["images_content"],
                 files=metadata_messages["files_content"],
+                timings=metadata_messages.get("timings", []),
             ),
             output_metadata=MetadataContainer(images=[], files=[]),
             finish_reason=finish_reason,
             continuations=continuations_used,
+            time_to_first_token=time_to_first_token,
+            inter_token_latency=inter_token_latency,
+            queue_time=float(call_stats["queue_time"]) if call_stats is not None else 0.0,
+            retries=int(call_stats["retries"]) if call_stats is not None else 0,
+            cache_hit=cache_hit,
+            cached_tokens=int(usage.get("cached_tokens", 0)),
+            response_id=response_id,
+        )
+
+    # -------- ACTIONS --------
+    def estimate_request(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Count the input tokens of a request offline, before sending it.
+
+        Rules, history and the prompt are tokenized locally (exactly when
+        tiktoken is installed). Attachments are not counted. The cost is None
+        unless pricing was registered with tokenizer.set_model_pricing().
+
+        Returns:
+            A dict with "prompt_tokens", "max_completion_tokens" (the effective
+            output cap or None) and "cost" (upper bound in USD, or None).
+        """
+        prepared = self._prepare_request(
+            prompt=str(prompt),
+            user=user,
+            history=history,
+            metadata_messages={"image_messages": [], "file_messages": []},
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=False,
+            max_continuations=0,
         )
+        request_kwargs = prepared["request_kwargs"]
+
+        prompt_tokens = count_message_tokens(request_kwargs["messages"], self.model.model)
+        cap = request_kwargs.get("max_completion_tokens")
 
-    def __generation(
+        return {
+            "prompt_tokens": prompt_tokens,
+            "max_completion_tokens": cap,
+            "cost": estimate_cost(self.model.model, prompt_tokens, cap or 0),
+        }
+
+    def completion(
         self,
         prompt: str,
         user: str = "User",
-        history: list | None = None,
+        history: list | ChatHistory | None = None,
         img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
         file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
         response_schema: Schema | None = None,
         max_completion_tokens: Optional[int] = None,
         auto_continue: Optional[bool] = None,
         max_continuations: Optional[int] = None,
+        deadline: Optional[float] = None,
     ) -> BotCompletionResult:
         """
-        Placeholder for a generation-style API.
-        """
-        raise NotImplementedError
+        Generate a chat completion using the current bot configuration.
+
+        The method builds the system/user messages, optionally includes previous
+        history, images, files, and a response schema, then sends the request to
+        the configured model.
+
+        By default, `max_completion_tokens` is None, so ChatWeaver does not impose
+        an output-token limit and lets the model use its available capacity.
+        If `auto_continue` is enabled, the bot can request follow-up completions
+        when the response is cut off because of token limits.
+
+        Args:
+            prompt: User prompt to send to the model.
+            user: Name of the user shown in the system context.
+            history: Optional previous messages to include in the request.
+            img_data: Optional image path, URL, or list of images.
+            file_data: Optional file path, file id/object, or list of files.
+            response_schema: Optional schema for structured output.
+            max_completion_tokens: Optional maximum number of output tokens.
+            auto_continue: Whether to continue automatically if output is truncated.
+            max_continuations: Maximum number of automatic continuations.
+            deadline: Optional overall time budget in seconds for the whole call,
+                retries and continuations included. TimeoutError is raised when exceeded.
+
+        Returns:
+            A BotCompletionResult containing the response text, token usage,
+            timing information, metadata, and completion status.
+        """
+        start_date = time.strftime(self.time_format, time.localtime(time.time()))
+        prompt = str(prompt)
+        call_stats = self._new_call_stats(deadline)
+
+        metadata_messages = self.get_metadata_messages(img_data=img_data, file_data=file_data)
+        prepared = self._prepare_request(
+            prompt=prompt,
+            user=user,
+            history=history,
+            metadata_messages=metadata_messages,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+        )
+
+        cache_key = self._cache_key(prepared)
+        cached = self._cache_lookup(cache_key, start_date, metadata_messages)
+        if cached is not None:
+            return cached
+
+        if self.coalesce:
+            result, _ = get_single_flight().do(
+                self._flight_key(prepared, cache_key),
+                lambda: self._complete(prepared, start_date, metadata_messages, call_stats, cache_key),
+            )
+            return result
+
+        return self._complete(prepared, start_date, metadata_messages, call_stats, cache_key)
+
+    def _complete(
+        self,
+        prepared: dict[str, Any],
+        start_date: str,
+        metadata_messages: dict[str, list[dict[str, Any]]],
+        call_stats: dict[str, Any],
+        cache_key: Optional[str],
+    ) -> BotCompletionResult:
+        """
+        Send a prepared request (with its auto_continue loop) and build the result.
+        """
+        request_kwargs = prepared["request_kwargs"]
+
+        self._ensure_remote_ready()
+
+        start = time.perf_counter()
+
+        response = self._create(request_kwargs, call_stats)
+        parsed = self._read_response(response)
+
+        all_content: list[str] = [parsed["content"]]
+        finish_reason = parsed["finish_reason"]
+        continuations_used = 0
+        usage = {k: parsed[k] for k in ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens")}
+
+        while self._should_continue(prepared, finish_reason, continuations_used):
+            continuations_used += 1
+            self._append_continuation(request_kwargs, all_content[-1])
+
+            response = self._create(request_kwargs, call_stats)
+            parsed = self._read_response(response)
+
+            all_content.append(parsed["content"])
+            finish_reason = parsed["finish_reason"]
+            for k in usage:
+                usage[k] += parsed[k]
+
+        end = time.perf_counter()
+
+        result = self._build_result(
+            start_date=start_date,
+            delta_time=end - start,
+            all_content=all_content,
+            usage=usage,
+            metadata_messages=metadata_messages,
+            finish_reason=finish_reason,
+            continuations_used=continuations_used,
+            call_stats=call_stats,
+        )
+        self._cache_store(cache_key, result)
+        return result
+
+    async def acompletion(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> BotCompletionResult:
+        """
+        Awaitable counterpart of completion().
+
+        Requests go through the Model's AsyncOpenAI client, so a single event
+        loop can keep many completions in flight without a thread pool.
+        History, images, files, schema and auto_continue behave exactly as in
+        completion(), and the same BotCompletionResult is returned.
+        """
+        start_date = time.strftime(self.time_format, time.localtime(time.time()))
+        prompt = str(prompt)
+        call_stats = self._new_call_stats(deadline)
+
+        metadata_messages = await self.aget_metadata_messages(img_data=img_data, file_data=file_data)
+        prepared = self._prepare_request(
+            prompt=prompt,
+            user=user,
+            history=history,
+            metadata_messages=metadata_messages,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+        )
+
+        cache_key = self._cache_key(prepared)
+        cached = self._cache_lookup(cache_key, start_date, metadata_messages)
+        if cached is not None:
+            return cached
+
+        if self.coalesce:
+            result, _ = await get_single_flight().ado(
+                self._flight_key(prepared, cache_key),
+                lambda: self._acomplete(prepared, start_date, metadata_messages, call_stats, cache_key),
+            )
+            return result
+
+        return await self._acomplete(prepared, start_date, metadata_messages, call_stats, cache_key)
+
+    async def _acomplete(
+        self,
+        prepared: dict[str, Any],
+        start_date: str,
+        metadata_messages: dict[str, list[dict[str, Any]]],
+        call_stats: dict[str, Any],
+        cache_key: Optional[str],
+    ) -> BotCompletionResult:
+        """
+        Async counterpart of _complete().
+        """
+        request_kwargs = prepared["request_kwargs"]
+
+        await self._aensure_remote_ready()
+
+        start = time.perf_counter()
+
+        response = await self._acreate(request_kwargs, call_stats)
+        parsed = self._read_response(response)
+
+        all_content: list[str] = [parsed["content"]]
+        finish_reason = parsed["finish_reason"]
+        continuations_used = 0
+        usage = {k: parsed[k] for k in ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens")}
+
+        while self._should_continue(prepared, finish_reason, continuations_used):
+            continuations_used += 1
+            self._append_continuation(request_kwargs, all_content[-1])
+
+            response = await self._acreate(request_kwargs, call_stats)
+            parsed = self._read_response(response)
+
+            all_content.append(parsed["content"])
+            finish_reason = parsed["finish_reason"]
+            for k in usage:
+                usage[k] += parsed[k]
+
+        end = time.perf_counter()
+
+        result = self._build_result(
+            start_date=start_date,
+            delta_time=end - start,
+            all_content=all_content,
+            usage=usage,
+            metadata_messages=metadata_messages,
+            finish_reason=finish_reason,
+            continuations_used=continuations_used,
+            call_stats=call_stats,
+        )
+        self._cache_store(cache_key, result)
+        return result
+
+    def completion_many(
+        self,
+        prompts: list[str | dict[str, Any]],
+        concurrency: int = 8,
+        **kwargs,
+    ) -> BotBatchResult:
+        """
+        Run many independent completions in parallel with this bot configuration.
+
+        Each item of `prompts` is either a prompt string or a dict of completion()
+        keyword arguments (it must contain "prompt"). Keyword arguments passed here
+        apply to every item; per-item dict values take precedence.
+
+        At most `concurrency` requests are in flight at once. Results keep the input
+        order: each slot holds a BotCompletionResult or the exception raised for that
+        item, so one failure never discards the rest of the batch.
+        """
+        calls = self._batch_calls(prompts, concurrency, kwargs)
+
+        def run(call: dict[str, Any]) -> BotCompletionResult | BaseException:
+            try:
+                return self.completion(**call)
+            except Exception as e:
+                return e
+
+        start = time.perf_counter()
+        if calls:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(calls))) as executor:
+                results = list(executor.map(run, calls))
+        else:
+            results = []
+        end = time.perf_counter()
+
+        return self._build_batch_result(results, end - start, concurrency)
+
+    async def acompletion_many(
+        self,
+        prompts: list[str | dict[str, Any]],
+        concurrency: int = 8,
+        **kwargs,
+    ) -> BotBatchResult:
+        """
+        Async counterpart of completion_many(), built on acompletion().
+        Concurrency is capped with a semaphore instead of a thread pool.
+        """
+        calls = self._batch_calls(prompts, concurrency, kwargs)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(call: dict[str, Any]) -> BotCompletionResult | BaseException:
+            async with semaphore:
+                try:
+                    return await self.acompletion(**call)
+                except Exception as e:
+                    return e
+
+        start = time.perf_counter()
+        results = list(await asyncio.gather(*(run(call) for call in calls)))
+        end = time.perf_counter()
+
+        return self._build_batch_result(results, end - start, concurrency)
+
+    @staticmethod
+    def _batch_calls(
+        prompts: list[str | dict[str, Any]],
+        concurrency: int,
+        shared_kwargs: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """
+        Validate a batch and return one completion() kwargs dict per item.
+        """
+        if not isinstance(prompts, (list, tuple)):
+            raise TypeError("<'prompts' must be a list of strings or dicts>")
+
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool):
+            raise TypeError("<'concurrency' must be int>")
+        if concurrency <= 0:
+            raise ValueError("<'concurrency' must be > 0>")
+
+        calls: list[dict[str, Any]] = []
+        for item in prompts:
+            if isinstance(item, dict):
+                if "prompt" not in item:
+                    raise ValueError("<Invalid batch item: missing 'prompt'>")
+                calls.append({**shared_kwargs, **item})
+            else:
+                calls.append({**shared_kwargs, "prompt": str(item)})
+
+        return calls
+
+    @staticmethod
+    def _build_batch_result(
+        results: list[BotCompletionResult | BaseException],
+        delta_time: float,
+        concurrency: int,
+    ) -> BotBatchResult:
+        """
+        Aggregate token usage across the successful items of a batch.
+        """
+        completed = [r for r in results if isinstance(r, BotCompletionResult)]
+
+        return BotBatchResult(
+            results=results,
+            prompt_tokens=sum(r.prompt_tokens for r in completed),
+            completion_tokens=sum(r.completion_tokens for r in completed),
+            total_tokens=sum(r.total_tokens for r in completed),
+            delta_time=delta_time,
+            concurrency=concurrency,
+        )
+
+    def stream(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> BotCompletionStream:
+        """
+        Streaming counterpart of completion().
+
+        Returns a BotCompletionStream that yields content deltas as they arrive.
+        auto_continue calls are chained into the same stream. Once the stream is
+        exhausted, `stream.result` holds the final BotCompletionResult, including
+        usage, finish_reason, time_to_first_token and inter_token_latency.
+        Nothing is sent until the stream is iterated.
+        """
+        return BotCompletionStream(self._stream_events(
+            prompt=prompt,
+            user=user,
+            history=history,
+            img_data=img_data,
+            file_data=file_data,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            deadline=deadline,
+        ))
+
+    def astream(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncBotCompletionStream:
+        """
+        Async streaming counterpart of completion(), built on the AsyncOpenAI client.
+        Use it with `async for delta in bot.astream(...)`.
+        """
+        return AsyncBotCompletionStream(self._astream_events(
+            prompt=prompt,
+            user=user,
+            history=history,
+            img_data=img_data,
+            file_data=file_data,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            deadline=deadline,
+        ))
+
+    def _stream_events(
+        self,
+        prompt: str,
+        user: str,
+        history: list | ChatHistory | None,
+        img_data: Any,
+        file_data: Any,
+        response_schema: Schema | None,
+        max_completion_tokens: Optional[int],
+        auto_continue: Optional[bool],
+        max_continuations: Optional[int],
+        deadline: Optional[float],
+    ) -> Iterator[str | BotCompletionResult]:
+        """
+        Yield content deltas, then the final BotCompletionResult as the last event.
+        """
+        start_date = time.strftime(self.time_format, time.localtime(time.time()))
+        prompt = str(prompt)
+        call_stats = self._new_call_stats(deadline)
+
+        metadata_messages = self.get_metadata_messages(img_data=img_data, file_data=file_data)
+        prepared = self._prepare_request(
+            prompt=prompt,
+            user=user,
+            history=history,
+            metadata_messages=metadata_messages,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+        )
+        request_kwargs = prepared["request_kwargs"]
+
+        cache_key = self._cache_key(prepared)
+        cached = self._cache_lookup(cache_key, start_date, metadata_messages)
+        if cached is not None:
+            if cached.content:
+                yield cached.content
+            yield cached
+            return
+
+        self._ensure_remote_ready()
+
+        timing: dict[str, Any] = {"start": time.perf_counter(), "first": None, "last": None, "deltas": 0}
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached_tokens": 0}
+        all_content: list[str] = []
+        continuations_used = 0
+
+        while True:
+            parts: list[str] = []
+            finish_reason: str | None = None
+            attempt = 0
+
+            while True:
+                estimated = self._admit(request_kwargs, call_stats)
+                used_before = usage["total_tokens"]
+                try:
+                    options = self._request_options(call_stats)
+                    client = self.model.client.with_options(**options) if options else self.model.client
+                    chunks = client.chat.completions.create(  # type: ignore[call-overload]
+                        **request_kwargs,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                    )
+                    for chunk in chunks:
+                        delta, chunk_finish_reason = self._read_stream_chunk(chunk, usage)
+                        if chunk_finish_reason is not None:
+                            finish_reason = chunk_finish_reason
+                        if delta:
+                            self._mark_delta(timing)
+                            parts.append(delta)
+                            yield delta
+                except Exception as e:
+                    self._settle(estimated, usage["total_tokens"] - used_before)
+                    self._note_request_outcome(e)
+                    # Deltas already yielded cannot be taken back: resume them as a
+                    # continuation, which is impossible for strict structured output.
+                    resumable = not parts or "response_format" not in request_kwargs
+                    delay = self._retry_delay(e, attempt, call_stats) if resumable else None
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    if parts:
+                        all_content.append("".join(parts))
+                        self._append_continuation(request_kwargs, all_content[-1])
+                        parts = []
+                    time.sleep(delay)
+                    continue
+
+                self._settle(estimated, usage["total_tokens"] - used_before)
+                self._note_request_outcome()
+                break
+
+            all_content.append("".join(parts))
+
+            if not self._should_continue(prepared, finish_reason, continuations_used):
+                break
+
+            continuations_used += 1
+            self._append_continuation(request_kwargs, all_content[-1])
+
+        end = time.perf_counter()
+
+        result = self._build_result(
+            start_date=start_date,
+            delta_time=end - timing["start"],
+            all_content=all_content,
+            usage=usage,
+            metadata_messages=metadata_messages,
+            finish_reason=finish_reason,
+            continuations_used=continuations_used,
+            timing=timing,
+            call_stats=call_stats,
+        )
+        self._cache_store(cache_key, result)
+        yield result
+
+    async def _astream_events(
+        self,
+        prompt: str,
+        user: str,
+        history: list | ChatHistory | None,
+        img_data: Any,
+        file_data: Any,
+        response_schema: Schema | None,
+        max_completion_tokens: Optional[int],
+        auto_continue: Optional[bool],
+        max_continuations: Optional[int],
+        deadline: Optional[float],
+    ) -> AsyncIterator[str | BotCompletionResult]:
+        """
+        Async counterpart of _stream_events().
+        """
+        start_date = time.strftime(self.time_format, time.localtime(time.time()))
+        prompt = str(prompt)
+        call_stats = self._new_call_stats(deadline)
+
+        metadata_messages = await self.aget_metadata_messages(img_data=img_data, file_data=file_data)
+        prepared = self._prepare_request(
+            prompt=prompt,
+            user=user,
+            history=history,
+            metadata_messages=metadata_messages,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+        )
+        request_kwargs = prepared["request_kwargs"]
+
+        cache_key = self._cache_key(prepared)
+        cached = self._cache_lookup(cache_key, start_date, metadata_messages)
+        if cached is not None:
+            if cached.content:
+                yield cached.content
+            yield cached
+            return
+
+        await self._aensure_remote_ready()
+
+        timing: dict[str, Any] = {"start": time.perf_counter(), "first": None, "last": None, "deltas": 0}
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached_tokens": 0}
+        all_content: list[str] = []
+        continuations_used = 0
+
+        while True:
+            parts: list[str] = []
+            finish_reason: str | None = None
+            attempt = 0
+
+            while True:
+                estimated = await self._aadmit(request_kwargs, call_stats)
+                used_before = usage["total_tokens"]
+                try:
+                    options = self._request_options(call_stats)
+                    client = self.model.async_client.with_options(**options) if options else self.model.async_client
+                    chunks = await client.chat.completions.create(  # type: ignore[call-overload]
+                        **request_kwargs,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                    )
+                    async for chunk in chunks:
+                        delta, chunk_finish_reason = self._read_stream_chunk(chunk, usage)
+                        if chunk_finish_reason is not None:
+                            finish_reason = chunk_finish_reason
+                        if delta:
+                            self._mark_delta(timing)
+                            parts.append(delta)
+                            yield delta
+                except Exception as e:
+                    self._settle(estimated, usage["total_tokens"] - used_before)
+                    self._note_request_outcome(e)
+                    # Deltas already yielded cannot be taken back: resume them as a
+                    # continuation, which is impossible for strict structured output.
+                    resumable = not parts or "response_format" not in request_kwargs
+                    delay = self._retry_delay(e, attempt, call_stats) if resumable else None
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    if parts:
+                        all_content.append("".join(parts))
+                        self._append_continuation(request_kwargs, all_content[-1])
+                        parts = []
+                    await asyncio.sleep(delay)
+                    continue
+
+                self._settle(estimated, usage["total_tokens"] - used_before)
+                self._note_request_outcome()
+                break
+
+            all_content.append("".join(parts))
+
+            if not self._should_continue(prepared, finish_reason, continuations_used):
+                break
+
+            continuations_used += 1
+            self._append_continuation(request_kwargs, all_content[-1])
+
+        end = time.perf_counter()
+
+        result = self._build_result(
+            start_date=start_date,
+            delta_time=end - timing["start"],
+            all_content=all_content,
+            usage=usage,
+            metadata_messages=metadata_messages,
+            finish_reason=finish_reason,
+            continuations_used=continuations_used,
+            timing=timing,
+            call_stats=call_stats,
+        )
+        self._cache_store(cache_key, result)
+        yield result
+
+    # -------- GENERATION (RESPONSES API) --------
+    @staticmethod
+    def _to_input_item(message: dict[str, Any]) -> dict[str, Any]:
+        """
+        Convert a chat completion message into a Responses API input item.
+        """
+        content = message.get("content", "")
+        if isinstance(content, list):
+            if message.get("role") == "user":
+                content = [
+                    {"type": "input_text", "text": part.get("text", "")}
+                    if isinstance(part, dict) and part.get("type") == "text" else part
+                    for part in content
+                ]
+            else:
+                content = "".join(
+                    str(part.get("text", "")) for part in content
+                    if isinstance(part, dict) and part.get("type") == "text"
+                )
+        return {"role": message["role"], "content": content}
+
+    def _prepare_generation(
+        self,
+        prompt: str,
+        user: str,
+        history: list | ChatHistory | None,
+        metadata_messages: dict[str, list[dict[str, Any]]],
+        response_schema: Schema | None,
+        max_completion_tokens: Optional[int],
+        auto_continue: Optional[bool],
+        max_continuations: Optional[int],
+        previous_response_id: Optional[str],
+        store: bool,
+    ) -> dict[str, Any]:
+        """
+        Build the Responses API request and resolve the effective per-call settings.
+        Shared by generation_stream() and ageneration_stream().
+
+        The rules and the user's name travel as `instructions`: they are not
+        stored with the response, so a chain built on previous_response_id
+        never accumulates copies of them. With a previous_response_id the
+        conversation is already held server-side, so `history` is not sent.
+        """
+        if previous_response_id is not None and not isinstance(previous_response_id, str):
+            raise TypeError("<'previous_response_id' must be str or None>")
+
+        # Validation and effective settings are the same as for chat completions
+        prepared = self._prepare_request(
+            prompt=prompt,
+            user=user,
+            history=None,
+            metadata_messages={"image_messages": [], "file_messages": []},
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+        )
+        chat_kwargs = prepared["request_kwargs"]
+
+        content: list[dict[str, Any]] = [{"type": "input_text", "text": prompt}]
+        for image_message in metadata_messages["image_messages"]:
+            content.append({"type": "input_image", "image_url": image_message["image_url"]["url"]})
+        for file_message in metadata_messages["file_messages"]:
+            content.append({"type": "input_file", "file_id": file_message["file"]["file_id"]})
+
+        input_items: list[dict[str, Any]] = []
+        if history is not None and previous_response_id is None:
+            input_items.extend(self._to_input_item(m) for m in self._normalize_history(history))
+        input_items.append({"role": "user", "content": content})
+
+        request_kwargs: dict[str, Any] = {
+            "model": self.model.model,
+            "instructions": self.__system_prefix + f"\n[The name of the user is: '{user}']",
+            "input": input_items,
+            "store": bool(store),
+        }
+
+        if previous_response_id is not None:
+            request_kwargs["previous_response_id"] = previous_response_id
+
+        if prepared["response_schema"] is not None:
+            json_schema = prepared["response_schema"].resolve()["json_schema"]
+            request_kwargs["text"] = {"format": {"type": "json_schema", **json_schema}}
+
+        if "max_completion_tokens" in chat_kwargs:
+            request_kwargs["max_output_tokens"] = chat_kwargs["max_completion_tokens"]
+
+        if "prompt_cache_key" in chat_kwargs:
+            request_kwargs["prompt_cache_key"] = chat_kwargs["prompt_cache_key"]
+
+        prepared["request_kwargs"] = request_kwargs
+        return prepared
+
+    @staticmethod
+    def _read_generation_event(event: Any) -> tuple[str, Any]:
+        """
+        Classify a Responses API stream event.
+        Returns ("delta", text), ("done", response) or ("", None) for events
+        that carry nothing ChatWeaver needs. Failures raise RuntimeError.
+        """
+        event_type = getattr(event, "type", "")
+        if event_type in ("response.output_text.delta", "response.refusal.delta"):
+            return "delta", str(event.delta or "")
+        if event_type in ("response.completed", "response.incomplete"):
+            return "done", event.response
+        if event_type == "response.failed":
+            error = getattr(event.response, "error", None)
+            raise RuntimeError(f"<Generation failed: {getattr(error, 'message', None) or 'unknown error'}>")
+        if event_type == "error":
+            raise RuntimeError(f"<Generation failed: {getattr(event, 'message', None) or 'unknown error'}>")
+        return "", None
+
+    @staticmethod
+    def _read_generation(response: Any, usage: dict[str, int]) -> str | None:
+        """
+        Accumulate the usage of a finished response in place and map its
+        status to a chat-completion style finish_reason.
+        """
+        response_usage = getattr(response, "usage", None)
+        if response_usage:
+            usage["prompt_tokens"] += int(response_usage.input_tokens or 0)
+            usage["completion_tokens"] += int(response_usage.output_tokens or 0)
+            usage["total_tokens"] += int(response_usage.total_tokens or 0)
+            details = getattr(response_usage, "input_tokens_details", None)
+            usage["cached_tokens"] += int(getattr(details, "cached_tokens", 0) or 0)
+
+        status = getattr(response, "status", None)
+        if status == "completed":
+            return "stop"
+        if status == "incomplete":
+            reason = getattr(getattr(response, "incomplete_details", None), "reason", None)
+            return "length" if reason == "max_output_tokens" else reason
+        return None
+
+    @staticmethod
+    def _chain_continuation(request_kwargs: dict[str, Any], response_id: Optional[str], last_content: str) -> None:
+        """
+        Ask for the rest of a truncated response. The request is added to the
+        `instructions`, which are not stored, so the chain does not keep it.
+        Stored responses are chained through previous_response_id with no new
+        input; otherwise the partial answer is replayed in the input.
+        """
+        instruction = "Continue exactly where you stopped. Do not repeat previous text."
+        if not request_kwargs["instructions"].endswith(instruction):
+            request_kwargs["instructions"] = request_kwargs["instructions"] + "\n" + instruction
+        if request_kwargs.get("store") and response_id is not None:
+            request_kwargs["previous_response_id"] = response_id
+            request_kwargs.pop("input", None)
+        else:
+            request_kwargs["input"] = request_kwargs.get("input", []) + [
+                {"role": "assistant", "content": last_content},
+            ]
+
+    def generation(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        previous_response_id: Optional[str] = None,
+        store: bool = True,
+        deadline: Optional[float] = None,
+    ) -> BotCompletionResult:
+        """
+        Generate a response through the OpenAI Responses API.
+
+        Works like completion(), but the conversation can be kept server-side:
+        pass the `response_id` of the previous result as `previous_response_id`
+        and only the new turn is sent, instead of the whole history. This needs
+        `store=True` (the default) on the earlier calls. The completion cache
+        and request coalescing do not apply to generations.
+
+        Args:
+            previous_response_id: Optional id of the response to continue from.
+                When given, `history` is ignored.
+            store: Whether OpenAI keeps the response so it can be chained later.
+            (other arguments as in completion())
+
+        Returns:
+            A BotCompletionResult whose `response_id` can be passed back as
+            `previous_response_id` on the next turn.
+        """
+        return self.generation_stream(
+            prompt=prompt,
+            user=user,
+            history=history,
+            img_data=img_data,
+            file_data=file_data,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            previous_response_id=previous_response_id,
+            store=store,
+            deadline=deadline,
+        ).until_done()
+
+    async def ageneration(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        previous_response_id: Optional[str] = None,
+        store: bool = True,
+        deadline: Optional[float] = None,
+    ) -> BotCompletionResult:
+        """
+        Async counterpart of generation(), built on the AsyncOpenAI client.
+        """
+        return await self.ageneration_stream(
+            prompt=prompt,
+            user=user,
+            history=history,
+            img_data=img_data,
+            file_data=file_data,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            previous_response_id=previous_response_id,
+            store=store,
+            deadline=deadline,
+        ).until_done()
+
+    def generation_stream(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        previous_response_id: Optional[str] = None,
+        store: bool = True,
+        deadline: Optional[float] = None,
+    ) -> BotCompletionStream:
+        """
+        Streaming counterpart of generation().
+        Yields output text deltas; `stream.result` holds the final BotCompletionResult.
+        Nothing is sent until the stream is iterated.
+        """
+        return BotCompletionStream(self._generation_events(
+            prompt=prompt,
+            user=user,
+            history=history,
+            img_data=img_data,
+            file_data=file_data,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            previous_response_id=previous_response_id,
+            store=store,
+            deadline=deadline,
+        ))
+
+    def ageneration_stream(
+        self,
+        prompt: str,
+        user: str = "User",
+        history: list | ChatHistory | None = None,
+        img_data: str | pathlib.Path | list[str | pathlib.Path] | None = None,
+        file_data: str | pathlib.Path | FileObject | list[str | pathlib.Path | FileObject] | None = None,
+        response_schema: Schema | None = None,
+        max_completion_tokens: Optional[int] = None,
+        auto_continue: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        previous_response_id: Optional[str] = None,
+        store: bool = True,
+        deadline: Optional[float] = None,
+    ) -> AsyncBotCompletionStream:
+        """
+        Async streaming counterpart of generation().
+        Use it with `async for delta in bot.ageneration_stream(...)`.
+        """
+        return AsyncBotCompletionStream(self._ageneration_events(
+            prompt=prompt,
+            user=user,
+            history=history,
+            img_data=img_data,
+            file_data=file_data,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            previous_response_id=previous_response_id,
+            store=store,
+            deadline=deadline,
+        ))
+
+    def _generation_events(
+        self,
+        prompt: str,
+        user: str,
+        history: list | ChatHistory | None,
+        img_data: Any,
+        file_data: Any,
+        response_schema: Schema | None,
+        max_completion_tokens: Optional[int],
+        auto_continue: Optional[bool],
+        max_continuations: Optional[int],
+        previous_response_id: Optional[str],
+        store: bool,
+        deadline: Optional[float],
+    ) -> Iterator[str | BotCompletionResult]:
+        """
+        Yield output text deltas, then the final BotCompletionResult as the last event.
+        """
+        start_date = time.strftime(self.time_format, time.localtime(time.time()))
+        prompt = str(prompt)
+        call_stats = self._new_call_stats(deadline)
+
+        metadata_messages = self.get_metadata_messages(img_data=img_data, file_data=file_data)
+        prepared = self._prepare_generation(
+            prompt=prompt,
+            user=user,
+            history=history,
+            metadata_messages=metadata_messages,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            previous_response_id=previous_response_id,
+            store=store,
+        )
+        request_kwargs = prepared["request_kwargs"]
+
+        self._ensure_remote_ready()
+
+        timing: dict[str, Any] = {"start": time.perf_counter(), "first": None, "last": None, "deltas": 0}
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached_tokens": 0}
+        all_content: list[str] = []
+        continuations_used = 0
+        response_id: Optional[str] = None
+
+        while True:
+            parts: list[str] = []
+            finish_reason: str | None = None
+            attempt = 0
+
+            while True:
+                estimated = self._admit(request_kwargs, call_stats)
+                used_before = usage["total_tokens"]
+                try:
+                    options = self._request_options(call_stats)
+                    client = self.model.client.with_options(**options) if options else self.model.client
+                    events = client.responses.create(**request_kwargs, stream=True)  # type: ignore[call-overload]
+                    for event in events:
+                        kind, value = self._read_generation_event(event)
+                        if kind == "delta" and value:
+                            self._mark_delta(timing)
+                            parts.append(value)
+                            yield value
+                        elif kind == "done":
+                            finish_reason = self._read_generation(value, usage)
+                            response_id = value.id
+                except Exception as e:
+                    self._settle(estimated, usage["total_tokens"] - used_before)
+                    self._note_request_outcome(e)
+                    # A failed response is not stored, so deltas already yielded
+                    # cannot be chained on: only retry before the first one.
+                    delay = self._retry_delay(e, attempt, call_stats) if not parts else None
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    time.sleep(delay)
+                    continue
+
+                self._settle(estimated, usage["total_tokens"] - used_before)
+                self._note_request_outcome()
+                break
+
+            all_content.append("".join(parts))
+
+            if not self._should_continue(prepared, finish_reason, continuations_used):
+                break
+
+            continuations_used += 1
+            self._chain_continuation(request_kwargs, response_id, all_content[-1])
+
+        end = time.perf_counter()
+
+        yield self._build_result(
+            start_date=start_date,
+            delta_time=end - timing["start"],
+            all_content=all_content,
+            usage=usage,
+            metadata_messages=metadata_messages,
+            finish_reason=finish_reason,
+            continuations_used=continuations_used,
+            timing=timing,
+            call_stats=call_stats,
+            response_id=response_id,
+        )
+
+    async def _ageneration_events(
+        self,
+        prompt: str,
+        user: str,
+        history: list | ChatHistory | None,
+        img_data: Any,
+        file_data: Any,
+        response_schema: Schema | None,
+        max_completion_tokens: Optional[int],
+        auto_continue: Optional[bool],
+        max_continuations: Optional[int],
+        previous_response_id: Optional[str],
+        store: bool,
+        deadline: Optional[float],
+    ) -> AsyncIterator[str | BotCompletionResult]:
+        """
+        Async counterpart of _generation_events().
+        """
+        start_date = time.strftime(self.time_format, time.localtime(time.time()))
+        prompt = str(prompt)
+        call_stats = self._new_call_stats(deadline)
+
+        metadata_messages = await self.aget_metadata_messages(img_data=img_data, file_data=file_data)
+        prepared = self._prepare_generation(
+            prompt=prompt,
+            user=user,
+            history=history,
+            metadata_messages=metadata_messages,
+            response_schema=response_schema,
+            max_completion_tokens=max_completion_tokens,
+            auto_continue=auto_continue,
+            max_continuations=max_continuations,
+            previous_response_id=previous_response_id,
+            store=store,
+        )
+        request_kwargs = prepared["request_kwargs"]
+
+        await self._aensure_remote_ready()
+
+        timing: dict[str, Any] = {"start": time.perf_counter(), "first": None, "last": None, "deltas": 0}
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cached_tokens": 0}
+        all_content: list[str] = []
+        continuations_used = 0
+        response_id: Optional[str] = None
+
+        while True:
+            parts: list[str] = []
+            finish_reason: str | None = None
+            attempt = 0
+
+            while True:
+                estimated = await self._aadmit(request_kwargs, call_stats)
+                used_before = usage["total_tokens"]
+                try:
+                    options = self._request_options(call_stats)
+                    client = self.model.async_client.with_options(**options) if options else self.model.async_client
+                    events = await client.responses.create(**request_kwargs, stream=True)  # type: ignore[call-overload]
+                    async for event in events:
+                        kind, value = self._read_generation_event(event)
+                        if kind == "delta" and value:
+                            self._mark_delta(timing)
+                            parts.append(value)
+                            yield value
+                        elif kind == "done":
+                            finish_reason = self._read_generation(value, usage)
+                            response_id = value.id
+                except Exception as e:
+                    self._settle(estimated, usage["total_tokens"] - used_before)
+                    self._note_request_outcome(e)
+                    # A failed response is not stored, so deltas already yielded
+                    # cannot be chained on: only retry before the first one.
+                    delay = self._retry_delay(e, attempt, call_stats) if not parts else None
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+
+                self._settle(estimated, usage["total_tokens"] - used_before)
+                self._note_request_outcome()
+                break
+
+            all_content.append("".join(parts))
+
+            if not self._should_continue(prepared, finish_reason, continuations_used):
+                break
+
+            continuations_used += 1
+            self._chain_continuation(request_kwargs, response_id, all_content[-1])
+
+        end = time.perf_counter()
+
+        yield self._build_result(
+            start_date=start_date,
+            delta_time=end - timing["start"],
+            all_content=all_content,
+            usage=usage,
+            metadata_messages=metadata_messages,
+            finish_reason=finish_reason,
+            continuations_used=continuations_used,
+            timing=timing,
+            call_stats=call_stats,
+            response_id=response_id,
+        )
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from .bot_completion_result import BotCompletionResult
+
+
+@dataclass(frozen=True)
+class BotBatchResult:
+    results: list[BotCompletionResult | BaseException]
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    delta_time: float
+    concurrency: int
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if isinstance(r, BotCompletionResult))
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    def __str__(self) -> str:
+        return (f"<{self.__class__.__name__} | "
+                f"items: {len(self.results)}, "
+                f"succeeded: {self.succeeded}, "
+                f"failed: {self.failed}, "
+                f"prompt_tokens: {self.prompt_tokens}, "
+                f"completion_tokens: {self.completion_tokens}, "
+                f"total_tokens: {self.total_tokens}, "
+                f"delta_time: {self.delta_time:.2f}s, "
+                f"concurrency: {self.concurrency}"
+                f">")
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"results={self.results!r}, "
+            f"prompt_tokens={self.prompt_tokens!r}, "
+            f"completion_tokens={self.completion_tokens!r}, "
+            f"total_tokens={self.total_tokens!r}, "
+            f"delta_time={self.delta_time!r}, "
+            f"concurrency={self.concurrency!r}"
+            f")"
+        )
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: int) -> BotCompletionResult | BaseException:
+        return self.results[index]
+
+    def __iter__(self):
+        return iter({
+            "results": self.results,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "delta_time": self.delta_time,
+            "concurrency": self.concurrency,
+        }.items())
@@ -15,6 +15,13 @@ class BotCompletionResult:
     output_metadata: MetadataContainer
     finish_reason: str | None = None
     continuations: int = 0
+    time_to_first_token: float | None = None
+    inter_token_latency: float | None = None
+    queue_time: float = 0.0
+    retries: int = 0
+    cache_hit: bool = False
+    cached_tokens: int = 0
+    response_id: str | None = None
 
     def __str__(self) -> str:
         return (f"<{self.__class__.__name__} | "
@@ -27,6 +34,13 @@ class BotCompletionResult:
                 f"final_date: {self.final_date}, "
                 f"finish_reason: {self.finish_reason!r}, "
                 f"continuations: {self.continuations}, "
+                f"time_to_first_token: {self.time_to_first_token}, "
+                f"inter_token_latency: {self.inter_token_latency}, "
+                f"queue_time: {self.queue_time:.2f}s, "
+                f"retries: {self.retries}, "
+                f"cache_hit: {self.cache_hit}, "
+                f"cached_tokens: {self.cached_tokens}, "
+                f"response_id: {self.response_id!r}, "
                 f"input_metadata: {self.input_metadata}, "
                 f"output_metadata: {self.output_metadata}"
                 f">")
@@ -44,7 +58,14 @@ class BotCompletionResult:
             f"input_metadata={self.input_metadata!r}, "
             f"output_metadata={self.output_metadata!r}, "
             f"finish_reason={self.finish_reason!r}, "
-            f"continuations={self.continuations!r}"
+            f"continuations={self.continuations!r}, "
+            f"time_to_first_token={self.time_to_first_token!r}, "
+            f"inter_token_latency={self.inter_token_latency!r}, "
+            f"queue_time={self.queue_time!r}, "
+            f"retries={self.retries!r}, "
+            f"cache_hit={self.cache_hit!r}, "
+            f"cached_tokens={self.cached_tokens!r}, "
+            f"response_id={self.response_id!r}"
             f")"
         )
 
@@ -61,4 +82,11 @@ class BotCompletionResult:
             "output_metadata": self.output_metadata,
             "finish_reason": self.finish_reason,
             "continuations": self.continuations,
+            "time_to_first_token": self.time_to_first_token,
+            "inter_token_latency": self.inter_token_latency,
+            "queue_time": self.queue_time,
+            "retries": self.retries,
+            "cache_hit": self.cache_hit,
+            "cached_tokens": self.cached_tokens,
+            "response_id": self.response_id,
         }.items())
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from .bot_completion_result import BotCompletionResult
+
+
+class BotCompletionStream(object):
+    """
+    Iterator over the content deltas of a streamed completion.
+    Once exhausted, `result` holds the final BotCompletionResult.
+    """
+
+    def __init__(
+        self,
+        events: Iterator[str | BotCompletionResult],
+        on_complete: Optional[Callable[[BotCompletionResult], None]] = None,
+    ) -> None:
+        self.__events = events
+        self.__on_complete = on_complete
+        self.__result: Optional[BotCompletionResult] = None
+
+    # -------- MAGIC METHODS --------
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | done: {self.done}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(done={self.done!r})"
+
+    def __iter__(self) -> "BotCompletionStream":
+        return self
+
+    def __next__(self) -> str:
+        event = next(self.__events)
+        if isinstance(event, BotCompletionResult):
+            self.__finish(event)
+            raise StopIteration
+        return event
+
+    # -------- PROPERTIES --------
+    @property
+    def done(self) -> bool:
+        """Return True once the final result is available."""
+        return self.__result is not None
+
+    @property
+    def result(self) -> BotCompletionResult:
+        """Return the final result. The stream must be fully consumed first."""
+        if self.__result is None:
+            raise RuntimeError("<Stream not consumed yet: iterate it or call until_done()>")
+        return self.__result
+
+    # -------- ACTIONS --------
+    def until_done(self) -> BotCompletionResult:
+        """Consume the remaining deltas and return the final result."""
+        for _ in self:
+            pass
+        return self.result
+
+    def __finish(self, result: BotCompletionResult) -> None:
+        self.__result = result
+        if self.__on_complete is not None:
+            self.__on_complete(result)
+
+
+class AsyncBotCompletionStream(object):
+    """
+    Async iterator over the content deltas of a streamed completion.
+    Once exhausted, `result` holds the final BotCompletionResult.
+    """
+
+    def __init__(
+        self,
+        events: AsyncIterator[str | BotCompletionResult],
+        on_complete: Optional[Callable[[BotCompletionResult], None]] = None,
+    ) -> None:
+        self.__events = events
+        self.__on_complete = on_complete
+        self.__result: Optional[BotCompletionResult] = None
+
+    # -------- MAGIC METHODS --------
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | done: {self.done}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(done={self.done!r})"
+
+    def __aiter__(self) -> "AsyncBotCompletionStream":
+        return self
+
+    async def __anext__(self) -> str:
+        event = await self.__events.__anext__()
+        if isinstance(event, BotCompletionResult):
+            self.__finish(event)
+            raise StopAsyncIteration
+        return event
+
+    # -------- PROPERTIES --------
+    @property
+    def done(self) -> bool:
+        """Return True once the final result is available."""
+        return self.__result is not None
+
+    @property
+    def result(self) -> BotCompletionResult:
+        """Return the final result. The stream must be fully consumed first."""
+        if self.__result is None:
+            raise RuntimeError("<Stream not consumed yet: iterate it or await until_done()>")
+        return self.__result
+
+    # -------- ACTIONS --------
+    async def until_done(self) -> BotCompletionResult:
+        """Consume the remaining deltas and return the final result."""
+        async for _ in self:
+            pass
+        return self.result
+
+    def __finish(self, result: BotCompletionResult) -> None:
+        self.__result = result
+        if self.__on_complete is not None:
+            self.__on_complete(result)
@@ -2,13 +2,26 @@ from __future__ import annotations
 
 from types import NoneType
 from typing import Any, Union, Optional
+import asyncio
+import threading
 import time
 
 from .bot_completion_result import BotCompletionResult
+from .bot_completion_stream import BotCompletionStream, AsyncBotCompletionStream
 from .text_node import TextNode
+from .chat_history import ChatHistory, HistoryView
+from .tokenizer import count_tokens, MESSAGE_OVERHEAD_TOKENS, REPLY_PRIMING_TOKENS
 from .bot import Bot
 
 
+# Instruction sent to the compaction bot together with the transcript
+_COMPACTION_PROMPT = (
+    "Summarize the conversation below so it can replace the original messages as context. "
+    "Keep facts, decisions, names, numbers, open questions and user preferences; drop small talk. "
+    "Write in the language of the conversation. Reply with the summary only."
+)
+
+
 class Chat(object):
     """
     A chat session that uses a provided Bot instance.
@@ -23,17 +36,40 @@ class Chat(object):
         time_format: str = "%d/%m/%Y %H:%M:%S",
         creation_date: Optional[str] = None,
         history: Optional[list[TextNode] | list[dict[str, Any]]] = None,
+        token_budget: int | dict[str, int] | None = None,
+        compact_after_tokens: Optional[int] = None,
+        compact_keep_replies: int = 2,
+        compaction_bot: Optional[Bot] = None,
+        server_state: bool = False,
         **kwargs,
     ) -> None:
         """
         Create a chat session with history and basic metadata.
         """
+        self.__last_dropped: list[TextNode] = []
+
+        # Compaction runtime state (never frozen)
+        self.__compaction_thread: Optional[threading.Thread] = None
+        self.__compaction_task: Optional[asyncio.Task] = None
+        self.__compaction_error: Optional[BaseException] = None
+
+        # Defaults for settings that older snapshots may not define
+        self.__token_budget: int | dict[str, int] | None = None
+        self.__compact_after_tokens: Optional[int] = None
+        self.__compact_keep_replies: int = 2
+        self.__compaction_bot: Optional[Bot] = None
+        self.__server_state: bool = False
+        self.__last_response_id: Optional[str] = None
 
         self.__default_attributes: dict[str, Any] = {
             "replies_limit": 10,
             "user": "User",
             "title": "New Chat",
             "time_format": "%d/%m/%Y %H:%M:%S",
+            "token_budget": None,
+            "compact_after_tokens": None,
+            "compact_keep_replies": 2,
+            "server_state": False,
         }
 
         # Restore from snapshot
@@ -57,6 +93,11 @@ class Chat(object):
         self.time_format = time_format
         self.title = title
         self.replies_limit = replies_limit
+        self.token_budget = token_budget
+        self.compact_after_tokens = compact_after_tokens
+        self.compact_keep_replies = compact_keep_replies
+        self.compaction_bot = compaction_bot
+        self.server_state = server_state
         self.user = user
         self.history = history
 
@@ -68,10 +109,11 @@ class Chat(object):
             self.creation_date = creation_date
 
     # -------- FREEZE / THAW --------
-    def freeze(self, include_secrets: bool = False) -> dict[str, Any]:
+    def freeze(self, include_secrets: bool = False, include_history: bool = True) -> dict[str, Any]:
         """
         Return a serializable snapshot of the chat.
-        Secrets are excluded by default.
+        Secrets are excluded by default. With include_history=False the history
+        is left empty (the archive stores it in separate segments).
         """
         return {
             "properties": {
@@ -80,8 +122,15 @@ class Chat(object):
                 "time_format": self.time_format,
                 "creation_date": self.creation_date,
                 "replies_limit": None if self.__replies_limit == float("inf") else int(self.__replies_limit),
-                "history": [node.freeze() for node in self.history],
+                "token_budget": self.token_budget,
+                "compact_after_tokens": self.compact_after_tokens,
+                "compact_keep_replies": self.compact_keep_replies,
+                "compaction_bot": None if self.compaction_bot is None else self.compaction_bot.freeze(include_secrets=include_secrets),
+                "history": self.__history.freeze() if include_history else [],
+                "summary": None if self.summary is None else self.summary.freeze(),
                 "bot": self.bot.freeze(include_secrets=include_secrets),
+                "server_state": self.server_state,
+                "last_response_id": self.last_response_id,
             },
             "extra": {},
         }
@@ -129,6 +178,14 @@ class Chat(object):
             else:
                 raise ValueError("<Invalid snapshot: invalid history item>")
 
+        compaction_bot_snapshot = props.get("compaction_bot")
+        compaction_bot = None
+        if isinstance(compaction_bot_snapshot, dict):
+            compaction_bot = Bot.thaw(compaction_bot_snapshot, api_key=api_key)
+
+        summary_snapshot = props.get("summary")
+        summary = TextNode.thaw(summary_snapshot) if isinstance(summary_snapshot, dict) else None
+
         define = {
             "properties": {
                 "title": props.get("title", "New Chat"),
@@ -136,8 +193,15 @@ class Chat(object):
                 "time_format": props.get("time_format", "%d/%m/%Y %H:%M:%S"),
                 "creation_date": props.get("creation_date"),
                 "replies_limit": props.get("replies_limit", 10),
+                "token_budget": props.get("token_budget"),
+                "compact_after_tokens": props.get("compact_after_tokens"),
+                "compact_keep_replies": props.get("compact_keep_replies", 2),
+                "compaction_bot": compaction_bot,
                 "history": history_nodes,
+                "summary": summary,
                 "bot": bot,
+                "server_state": props.get("server_state", False),
+                "last_response_id": props.get("last_response_id"),
             },
             "extra": snapshot.get("extra", {}),
         }
@@ -166,6 +230,16 @@ class Chat(object):
             parts.append(f"time_format={self.time_format!r}")
         if not is_replies_limit:
             parts.append(f"replies_limit={None if self.__replies_limit == float('inf') else int(self.__replies_limit)!r}")
+        if self.token_budget != self.__default_attributes["token_budget"]:
+            parts.append(f"token_budget={self.token_budget!r}")
+        if self.compact_after_tokens != self.__default_attributes["compact_after_tokens"]:
+            parts.append(f"compact_after_tokens={self.compact_after_tokens!r}")
+        if self.compact_keep_replies != self.__default_attributes["compact_keep_replies"]:
+            parts.append(f"compact_keep_replies={self.compact_keep_replies!r}")
+        if self.compaction_bot is not None:
+            parts.append(f"compaction_bot={self.compaction_bot!r}")
+        if self.server_state != self.__default_attributes["server_state"]:
+            parts.append(f"server_state={self.server_state!r}")
 
         parts.append(f"bot={self.bot!r}")
         parts.append(f"creation_date={self.creation_date!r}")
@@ -188,6 +262,13 @@ class Chat(object):
             and self.time_format == other.time_format
             and self.creation_date == other.creation_date
             and self.replies_limit == other.replies_limit
+            and self.token_budget == other.token_budget
+            and self.compact_after_tokens == other.compact_after_tokens
+            and self.compact_keep_replies == other.compact_keep_replies
+            and self.compaction_bot == other.compaction_bot
+            and self.summary == other.summary
+            and self.server_state == other.server_state
+            and self.last_response_id == other.last_response_id
             and self.history == other.history
             and self.bot == other.bot
         )
@@ -204,6 +285,8 @@ class Chat(object):
             raise TypeError(f"<Invalid 'bot' type: Expected Bot, got {type(new)}>")
 
         self.__bot = new
+        # A stored response is only reachable with the key that created it
+        self.__last_response_id = None
 
     @property
     def time_format(self) -> str:
@@ -231,25 +314,160 @@ class Chat(object):
             raise TypeError(f"<Invalid 'replies_limit': Expected int or None, got {type(new_replies_limit)}>")
 
     @property
-    def history(self) -> list[TextNode]:
-        """Return the message history."""
-        return self.__history
+    def token_budget(self) -> int | dict[str, int] | None:
+        """
+        Return the input-token budget for the history sent with each request.
+        Either one int, a dict keyed by model name, or None for no budget.
+        """
+        return self.__token_budget
+    @token_budget.setter
+    def token_budget(self, new_token_budget: int | dict[str, int] | None) -> None:
+        """Set the token budget. None disables it."""
+        if new_token_budget is None:
+            self.__token_budget = None
+            return
+
+        if isinstance(new_token_budget, dict):
+            budgets: dict[str, int] = {}
+            for model_name, budget in new_token_budget.items():
+                if isinstance(budget, bool) or not isinstance(budget, int) or budget <= 0:
+                    raise ValueError(f"<Invalid 'token_budget' for {model_name!r}: expected positive int>")
+                budgets[str(model_name)] = budget
+            self.__token_budget = budgets
+            return
+
+        if isinstance(new_token_budget, bool) or not isinstance(new_token_budget, int):
+            raise TypeError(f"<Invalid 'token_budget': Expected int, dict or None, got {type(new_token_budget)}>")
+        if new_token_budget <= 0:
+            raise ValueError("<Invalid 'token_budget': expected positive int>")
+        self.__token_budget = new_token_budget
+
+    @property
+    def compact_after_tokens(self) -> Optional[int]:
+        """
+        Return the history size (estimated input tokens) that triggers compaction.
+        None disables compaction.
+        """
+        return self.__compact_after_tokens
+    @compact_after_tokens.setter
+    def compact_after_tokens(self, new: Optional[int]) -> None:
+        """Set the compaction threshold. None disables compaction."""
+        if new is None:
+            self.__compact_after_tokens = None
+            return
+        if isinstance(new, bool) or not isinstance(new, int):
+            raise TypeError(f"<Invalid 'compact_after_tokens': Expected int or None, got {type(new)}>")
+        if new <= 0:
+            raise ValueError("<Invalid 'compact_after_tokens': expected positive int>")
+        self.__compact_after_tokens = new
+
+    @property
+    def compact_keep_replies(self) -> int:
+        """Return the number of most recent replies kept verbatim by compaction."""
+        return self.__compact_keep_replies
+    @compact_keep_replies.setter
+    def compact_keep_replies(self, new: int) -> None:
+        """Set the number of replies kept verbatim by compaction."""
+        if isinstance(new, bool) or not isinstance(new, int):
+            raise TypeError(f"<Invalid 'compact_keep_replies': Expected int, got {type(new)}>")
+        if new < 0:
+            raise ValueError("<Invalid 'compact_keep_replies': expected int >= 0>")
+        self.__compact_keep_replies = new
+
+    @property
+    def compaction_bot(self) -> Optional[Bot]:
+        """Return the bot that writes summaries. None means the chat bot."""
+        return self.__compaction_bot
+    @compaction_bot.setter
+    def compaction_bot(self, new: Optional[Bot]) -> None:
+        """Set the bot that writes summaries (e.g. a cheaper model)."""
+        if new is not None and not isinstance(new, Bot):
+            raise TypeError(f"<Invalid 'compaction_bot' type: Expected Bot or None, got {type(new)}>")
+        self.__compaction_bot = new
+
+    @property
+    def server_state(self) -> bool:
+        """
+        Return whether responses go through Bot.generation() and chain on the
+        previous response stored by OpenAI instead of resending the history.
+        """
+        return self.__server_state
+    @server_state.setter
+    def server_state(self, new: bool) -> None:
+        """Enable or disable server-side conversation state."""
+        if not isinstance(new, bool):
+            raise TypeError(f"<Invalid 'server_state': Expected bool, got {type(new)}>")
+        self.__server_state = new
+        self.__last_response_id = None
+
+    @property
+    def last_response_id(self) -> Optional[str]:
+        """
+        Return the id of the stored response the next turn chains on, or None
+        when the next turn sends the local history instead.
+        """
+        return self.__last_response_id
+    @last_response_id.setter
+    def last_response_id(self, new: Optional[str]) -> None:
+        """Set or clear the response the next turn chains on."""
+        if new is not None and not isinstance(new, str):
+            raise TypeError(f"<Invalid 'last_response_id': Expected str or None, got {type(new)}>")
+        self.__last_response_id = new
+
+    @property
+    def summary(self) -> Optional[TextNode]:
+        """Return the summary node that replaces compacted history, if any."""
+        return self.__history.summary
+    @summary.setter
+    def summary(self, new: Optional[TextNode]) -> None:
+        """Set or clear the summary node."""
+        self.__history.summary = new
+        self.__last_response_id = None
+
+    @property
+    def compaction_pending(self) -> bool:
+        """Return whether a background compaction is running."""
+        thread, task = self.__compaction_thread, self.__compaction_task
+        return (thread is not None and thread.is_alive()) or (task is not None and not task.done())
+
+    @property
+    def compaction_error(self) -> Optional[BaseException]:
+        """Return the error of the last failed background compaction, if any."""
+        return self.__compaction_error
+
+    @property
+    def history(self) -> HistoryView:
+        """
+        Return a live, read-only view of the message history, oldest first.
+        Assign a new list to change it.
+        """
+        return self.__history.view()
     @history.setter
-    def history(self, new_history: list[TextNode] | list[dict[str, Any]] | None) -> None:
-        """Set the chat history."""
+    def history(self, new_history: list[TextNode] | list[dict[str, Any]] | HistoryView | None) -> None:
+        """Set the chat history. The current summary, if any, is kept."""
+        summary = self.summary if getattr(self, "_Chat__history", None) is not None else None
+        self.__set_history(new_history)
+        self.__history.summary = summary
+        self.__last_response_id = None
+
+    def __set_history(self, new_history: list[TextNode] | list[dict[str, Any]] | HistoryView | None) -> None:
+        """Build the ChatHistory for the history setter."""
         if new_history is None:
-            self.__history = []
+            self.__history = ChatHistory()
             return
 
+        if isinstance(new_history, HistoryView):
+            new_history = list(new_history)
+
         if not isinstance(new_history, list):
             raise TypeError("<'history' must be a list>")
 
         if len(new_history) == 0:
-            self.__history = []
+            self.__history = ChatHistory()
             return
 
         if all(isinstance(node, TextNode) for node in new_history):
-            self.__history = list(new_history)  # type: ignore[assignment]
+            self.__history = ChatHistory(new_history)  # type: ignore[arg-type]
             return
 
         if all(isinstance(node, dict) for node in new_history):
@@ -261,7 +479,7 @@ class Chat(object):
                         nodes.append(TextNode.thaw(node))  # type: ignore[arg-type]
                     else:
                         nodes.append(TextNode(**node))  # type: ignore[arg-type]
-                self.__history = nodes
+                self.__history = ChatHistory(nodes)
             except Exception:
                 raise TypeError("<Invalid 'history' format>")
             return
@@ -308,11 +526,18 @@ class Chat(object):
     @property
     def replies(self) -> int:
         """Return the current number of replies."""
-        return len(self.__history) // 2
+        return self.__history.replies
     @property
     def cost(self) -> int:
         """Return the total token cost accumulated in history."""
-        return sum(node.tokens for node in self.__history)
+        return self.__history.tokens
+    @property
+    def last_dropped(self) -> list[TextNode]:
+        """
+        Return the nodes left out of the last request by the token budget, and
+        the nodes removed from history by the reply limit, oldest first.
+        """
+        return list(self.__last_dropped)
 
     # -------- ACTIONS --------
     def response(
@@ -326,27 +551,170 @@ class Chat(object):
         Generate a response and append it to history.
         """
         owner_user = self.__user if user is None else str(user)
+        kwargs, dropped = self.__request_kwargs(
+            prompt=str(prompt), owner_user=owner_user, image_path=image_path, file_path=file_path,
+        )
+        result = (self.bot.generation if self.__server_state else self.bot.completion)(**kwargs)
 
-        result = self.bot.completion(
-            prompt=str(prompt),
-            user=owner_user,
-            history=[dict(node) for node in self.__history] if self.__history else None,
-            img_data=image_path,
-            file_data=file_path,
+        self.__update_history(prompt=str(prompt), response=result, owner_user=owner_user, dropped=dropped)
+        return result.content
+
+    async def aresponse(
+        self,
+        prompt: str,
+        user: Optional[str] = None,
+        image_path: Optional[str] = None,
+        file_path: Optional[str] = None,
+    ) -> str:
+        """
+        Awaitable counterpart of response(), built on Bot.acompletion().
+        """
+        owner_user = self.__user if user is None else str(user)
+        kwargs, dropped = self.__request_kwargs(
+            prompt=str(prompt), owner_user=owner_user, image_path=image_path, file_path=file_path,
         )
+        result = await (self.bot.ageneration if self.__server_state else self.bot.acompletion)(**kwargs)
 
-        self.__update_history(prompt=str(prompt), response=result, owner_user=owner_user)
+        self.__update_history(prompt=str(prompt), response=result, owner_user=owner_user, dropped=dropped)
         return result.content
 
-    def __update_history(self, prompt: str, response: BotCompletionResult, owner_user: str) -> None:
+    def stream_response(
+        self,
+        prompt: str,
+        user: Optional[str] = None,
+        image_path: Optional[str] = None,
+        file_path: Optional[str] = None,
+    ) -> BotCompletionStream:
+        """
+        Stream a response as content deltas.
+        History is updated once the stream has been fully consumed.
+        """
+        owner_user = self.__user if user is None else str(user)
+        kwargs, dropped = self.__request_kwargs(
+            prompt=str(prompt), owner_user=owner_user, image_path=image_path, file_path=file_path,
+        )
+        stream = (self.bot.generation_stream if self.__server_state else self.bot.stream)(**kwargs)
+        return BotCompletionStream(
+            self.__stream_until_result(stream),
+            on_complete=lambda result: self.__update_history(prompt=str(prompt), response=result, owner_user=owner_user, dropped=dropped),
+        )
+
+    def astream_response(
+        self,
+        prompt: str,
+        user: Optional[str] = None,
+        image_path: Optional[str] = None,
+        file_path: Optional[str] = None,
+    ) -> AsyncBotCompletionStream:
+        """
+        Async counterpart of stream_response().
+        """
+        owner_user = self.__user if user is None else str(user)
+        kwargs, dropped = self.__request_kwargs(
+            prompt=str(prompt), owner_user=owner_user, image_path=image_path, file_path=file_path,
+        )
+        stream = (self.bot.ageneration_stream if self.__server_state else self.bot.astream)(**kwargs)
+        return AsyncBotCompletionStream(
+            self.__astream_until_result(stream),
+            on_complete=lambda result: self.__update_history(prompt=str(prompt), response=result, owner_user=owner_user, dropped=dropped),
+        )
+
+    @staticmethod
+    def __stream_until_result(stream: BotCompletionStream):
+        """
+        Re-emit the deltas of a bot stream followed by its final result.
+        """
+        yield from stream
+        yield stream.result
+
+    @staticmethod
+    async def __astream_until_result(stream: AsyncBotCompletionStream):
+        """
+        Async counterpart of __stream_until_result().
+        """
+        async for delta in stream:
+            yield delta
+        yield stream.result
+
+    def __request_kwargs(
+        self,
+        prompt: str,
+        owner_user: str,
+        image_path: Optional[str],
+        file_path: Optional[str],
+    ) -> tuple[dict[str, Any], list[TextNode]]:
+        """
+        Build the bot call arguments and return them with the history nodes the
+        token budget leaves out. While chained on a stored response the server
+        already holds the conversation, so no history is sent; the chain is
+        restarted from the budgeted window when it no longer fits.
+        """
+        history, dropped = self.__token_window(prompt=prompt, owner_user=owner_user)
+        chained = self.__server_state and self.__last_response_id is not None and not dropped
+        kwargs: dict[str, Any] = {
+            "prompt": prompt,
+            "user": owner_user,
+            "history": history if history and not chained else None,
+            "img_data": image_path,
+            "file_data": file_path,
+        }
+        if self.__server_state:
+            kwargs["previous_response_id"] = self.__last_response_id if chained else None
+        return kwargs, dropped
+
+    def __current_token_budget(self) -> Optional[int]:
+        """
+        Return the token budget for the bot's current model, or None.
+        """
+        if isinstance(self.__token_budget, dict):
+            return self.__token_budget.get(self.bot.model.model)
+        return self.__token_budget
+
+    def __token_window(
+        self,
+        prompt: str,
+        owner_user: str,
+    ) -> tuple[ChatHistory | list[dict[str, Any]], list[TextNode]]:
+        """
+        Return the history to send so that rules, history and the new prompt fit
+        in the token budget, and the oldest pairs left out. The history itself
+        is not changed, so a failed request loses nothing.
+        """
+        budget = self.__current_token_budget()
+        if budget is None:
+            return self.__history, []
+
+        model_name = self.bot.model.model
+        system_text = self.bot.rules + f"\n[The name of the user is: '{owner_user}']"
+        reserved = (
+            count_tokens(system_text, model_name)
+            + count_tokens(prompt, model_name)
+            + 2 * MESSAGE_OVERHEAD_TOKENS
+            + REPLY_PRIMING_TOKENS
+        )
+        messages, dropped = self.__history.window(max(0, budget - reserved))
+        if not dropped:
+            return self.__history, []
+        return messages, dropped
+
+    def __update_history(
+        self,
+        prompt: str,
+        response: BotCompletionResult,
+        owner_user: str,
+        dropped: list[TextNode],
+    ) -> None:
         """
         Append the latest user prompt and assistant response to history.
+        The user node is credited with the tokens of its own text (counted
+        locally), not with the prompt tokens of the whole request.
+        `dropped` are the nodes the token budget left out of the request.
         """
         user_node = TextNode(
             role="user",
             content=str(prompt),
             owner=str(owner_user),
-            tokens=int(response.prompt_tokens),
+            tokens=count_tokens(str(prompt), self.bot.model.model),
             date=str(response.start_date),
             image_data=list(response.input_metadata.images),
             file_data=list(response.input_metadata.files),
@@ -362,16 +730,143 @@ class Chat(object):
             file_data=list(response.output_metadata.files),
         )
 
-        # Enforce reply limit (each reply is 2 nodes)
-        next_replies = (len(self.__history) // 2) + 1
-        if next_replies <= self.__replies_limit:
-            self.__history.append(user_node)
-            self.__history.append(assistant_node)
+        # Append the new pair, dropping the oldest pairs beyond the reply limit
+        evicted = self.__history.add_reply(user_node, assistant_node, self.__replies_limit)
+        left_out = {id(node) for node in dropped}
+        self.__last_dropped = list(dropped) + [node for node in evicted if id(node) not in left_out]
+
+        # The stored chain still holds evicted turns: restart it from the bounded
+        # local history, so the server-side prompt stays within replies_limit
+        if self.__server_state:
+            self.__last_response_id = None if evicted else response.response_id
+
+        self.__maybe_compact()
+
+    # -------- COMPACTION --------
+    def compact(self) -> bool:
+        """
+        Summarize all history except the last `compact_keep_replies` replies now,
+        blocking until done. Returns False when there is nothing to compact.
+        """
+        self.wait_for_compaction()
+        nodes = self.__compaction_candidates()
+        if not nodes:
+            return False
+        result = self.__compaction_bot_or_default().completion(prompt=self.__compaction_transcript(nodes))
+        self.__apply_compaction(nodes, result)
+        return True
+
+    async def acompact(self) -> bool:
+        """
+        Awaitable counterpart of compact().
+        """
+        await self.await_compaction()
+        nodes = self.__compaction_candidates()
+        if not nodes:
+            return False
+        result = await self.__compaction_bot_or_default().acompletion(prompt=self.__compaction_transcript(nodes))
+        self.__apply_compaction(nodes, result)
+        return True
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until a background compaction started from sync code has finished.
+        """
+        thread = self.__compaction_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    async def await_compaction(self) -> None:
+        """
+        Wait for a background compaction started from async code (or a thread).
+        """
+        task = self.__compaction_task
+        if task is not None and not task.done():
+            await asyncio.wait([task])
+        thread = self.__compaction_thread
+        if thread is not None and thread.is_alive():
+            await asyncio.to_thread(thread.join)
+
+    def __compaction_bot_or_default(self) -> Bot:
+        """Return the bot used for summaries."""
+        return self.__compaction_bot if self.__compaction_bot is not None else self.bot
+
+    def __compaction_candidates(self) -> list[TextNode]:
+        """
+        Return the nodes that compaction would replace: everything but the
+        most recent `compact_keep_replies` replies.
+        """
+        nodes = self.__history.to_list()
+        keep = 2 * self.__compact_keep_replies
+        return nodes[:len(nodes) - keep] if keep else nodes
+
+    def __compaction_transcript(self, nodes: list[TextNode]) -> str:
+        """
+        Build the summarization prompt from the previous summary and `nodes`.
+        """
+        lines: list[str] = [_COMPACTION_PROMPT, ""]
+        if self.summary is not None:
+            lines.append(f"[Earlier summary]\n{self.summary.content}\n")
+        lines.append("[Conversation]")
+        for node in nodes:
+            lines.append(f"{node.owner} ({node.role}): {node.content}")
+        return "\n".join(lines)
+
+    def __apply_compaction(self, nodes: list[TextNode], result: BotCompletionResult) -> None:
+        """
+        Replace `nodes` (if still present) with a summary node built from `result`.
+        """
+        summary_node = TextNode(
+            role="system",
+            content=f"[Summary of the earlier conversation]\n{result.content}",
+            owner=str(self.__compaction_bot_or_default().name),
+            tokens=int(result.completion_tokens),
+            date=str(result.final_date),
+            image_data=[],
+            file_data=[],
+        )
+        self.__history.compact(nodes, summary_node)
+        # Restart the stored chain from the summary on the next turn
+        self.__last_response_id = None
+
+    def __maybe_compact(self) -> None:
+        """
+        Start a background compaction when history is over the threshold.
+        Inside a running event loop it is an asyncio task, otherwise a daemon thread.
+        """
+        if self.__compact_after_tokens is None or self.compaction_pending:
+            return
+        if self.__history.context_tokens <= self.__compact_after_tokens:
             return
 
-        # Drop the oldest pair and append the new pair
-        if len(self.__history) >= 2:
-            self.__history.pop(0)
-            self.__history.pop(0)
-        self.__history.append(user_node)
-        self.__history.append(assistant_node)
+        nodes = self.__compaction_candidates()
+        if not nodes:
+            return
+
+        prompt = self.__compaction_transcript(nodes)
+        bot = self.__compaction_bot_or_default()
+        self.__compaction_error = None
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            async def run() -> None:
+                try:
+                    self.__apply_compaction(nodes, await bot.acompletion(prompt=prompt))
+                except Exception as e:
+                    self.__compaction_error = e
+
+            self.__compaction_task = loop.create_task(run())
+            return
+
+        def work() -> None:
+            try:
+                self.__apply_compaction(nodes, bot.completion(prompt=prompt))
+            except Exception as e:
+                self.__compaction_error = e
+
+        self.__compaction_thread = threading.Thread(target=work, name="chatweaver-compaction", daemon=True)
+        self.__compaction_thread.start()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Sequence
+import threading
+from typing import Any, Iterable, Iterator, NoReturn
+
+from .text_node import TextNode
+from .tokenizer import count_tokens, MESSAGE_OVERHEAD_TOKENS
+
+
+# Roles accepted by the chat completions API for history messages
+ALLOWED_ROLES = frozenset({"system", "developer", "user", "assistant", "tool"})
+
+
+def to_message(item: Any) -> dict[str, Any]:
+    """
+    Convert a TextNode or dict into an OpenAI-compatible {role, content} message.
+    Extra ChatWeaver metadata such as owner, tokens, date, image_data, and
+    file_data is intentionally not forwarded to the API.
+    """
+    message = dict(item)
+    role = message.get("role")
+    content = message.get("content")
+
+    if role not in ALLOWED_ROLES:
+        raise ValueError(f"<Invalid history role: {role!r}>")
+
+    return {"role": role, "content": "" if content is None else content}
+
+
+def context_tokens(node: TextNode) -> int:
+    """
+    Return the input tokens a node costs when it is sent back as history.
+    Assistant nodes store their completion tokens; user nodes store the whole
+    request's prompt tokens in snapshots written before local counting, so
+    their text is counted locally instead (memoized).
+    """
+    if node.role == "assistant":
+        return int(node.tokens) + MESSAGE_OVERHEAD_TOKENS
+    return count_tokens(str(node.content)) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ChatHistory(object):
+    """
+    Rolling chat history backed by a deque.
+
+    Replies are appended as (user, assistant) node pairs; once the reply limit
+    is reached the oldest pair is evicted in O(1). Token and reply totals are
+    kept up to date on every change instead of being recomputed from the nodes.
+
+    Alongside the nodes it keeps the matching API messages, normalized once when
+    a node is added, so Bot can send the history without rebuilding it per call.
+
+    An optional summary node (written by Chat compaction) stands in for older,
+    removed nodes: it is sent first but is not counted as a reply.
+
+    Mutations and snapshots are guarded by a lock, so a background compaction
+    can rewrite the history while a request is being built from it.
+    """
+
+    def __init__(self, nodes: Iterable[TextNode] = ()) -> None:
+        self.__nodes: deque[TextNode] = deque()
+        self.__messages: deque[dict[str, Any]] = deque()
+        self.__tokens = 0
+        self.__context_tokens = 0
+        self.__summary: TextNode | None = None
+        self.__summary_message: dict[str, Any] | None = None
+        self.__lock = threading.RLock()
+        self.extend(nodes)
+
+    # -------- MAGIC METHODS --------
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | nodes: {len(self)}, replies: {self.replies}, tokens: {self.tokens}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self.__nodes)!r})"
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __bool__(self) -> bool:
+        return bool(self.__nodes) or self.__summary is not None
+
+    def __iter__(self) -> Iterator[TextNode]:
+        return iter(self.__nodes)
+
+    def __getitem__(self, index: int) -> TextNode:
+        return self.__nodes[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ChatHistory):
+            return list(self.__nodes) == list(other.__nodes)
+        if isinstance(other, list):
+            return list(self.__nodes) == other
+        return False
+
+    # -------- PROPERTIES --------
+    @property
+    def tokens(self) -> int:
+        """Return the total tokens of all nodes."""
+        return self.__tokens
+
+    @property
+    def context_tokens(self) -> int:
+        """Return the estimated input tokens of sending the whole history."""
+        return self.__context_tokens
+
+    @property
+    def summary(self) -> TextNode | None:
+        """Return the summary node of compacted history, if any."""
+        return self.__summary
+    @summary.setter
+    def summary(self, node: TextNode | None) -> None:
+        """Set or clear the summary node."""
+        if node is not None and not isinstance(node, TextNode):
+            raise TypeError(f"<Invalid 'summary': Expected TextNode or None, got {type(node)}>")
+        message = None if node is None else to_message(node)
+        with self.__lock:
+            if self.__summary is not None:
+                self.__context_tokens -= context_tokens(self.__summary)
+            self.__summary = node
+            self.__summary_message = message
+            if node is not None:
+                self.__context_tokens += context_tokens(node)
+
+    @property
+    def replies(self) -> int:
+        """Return the number of (user, assistant) replies."""
+        return len(self.__nodes) // 2
+
+    # -------- ACTIONS --------
+    def to_list(self) -> list[TextNode]:
+        """Return the nodes as a new list, oldest first."""
+        with self.__lock:
+            return list(self.__nodes)
+
+    def messages(self) -> list[dict[str, Any]]:
+        """
+        Return the pre-normalized API messages as a new list, oldest first.
+        The message dicts are shared and must not be mutated.
+        """
+        with self.__lock:
+            if self.__summary_message is not None:
+                return [self.__summary_message, *self.__messages]
+            return list(self.__messages)
+
+    def append(self, node: TextNode) -> None:
+        """Append a single node."""
+        if not isinstance(node, TextNode):
+            raise TypeError(f"<Invalid history node: Expected TextNode, got {type(node)}>")
+        message = to_message(node)
+        with self.__lock:
+            self.__nodes.append(node)
+            self.__messages.append(message)
+            self.__tokens += int(node.tokens)
+            self.__context_tokens += context_tokens(node)
+
+    def extend(self, nodes: Iterable[TextNode]) -> None:
+        """Append several nodes in order."""
+        for node in nodes:
+            self.append(node)
+
+    def popleft(self) -> TextNode:
+        """Remove and return the oldest node."""
+        with self.__lock:
+            node = self.__nodes.popleft()
+            self.__messages.popleft()
+            self.__tokens -= int(node.tokens)
+            self.__context_tokens -= context_tokens(node)
+            return node
+
+    def add_reply(self, user_node: TextNode, assistant_node: TextNode, replies_limit: float | int) -> list[TextNode]:
+        """
+        Append one reply and evict the oldest pairs beyond `replies_limit`.
+        Returns the evicted nodes, oldest first.
+        """
+        with self.__lock:
+            self.append(user_node)
+            self.append(assistant_node)
+
+            evicted: list[TextNode] = []
+            while self.replies > replies_limit and len(self.__nodes) > 2:
+                evicted.append(self.popleft())
+                evicted.append(self.popleft())
+            return evicted
+
+    def window(self, max_tokens: int) -> tuple[list[dict[str, Any]], list[TextNode]]:
+        """
+        Return the messages of the most recent whole pairs that fit in
+        `max_tokens` input tokens (summary first), and the nodes left out,
+        oldest first. The history itself is not changed.
+        """
+        with self.__lock:
+            nodes = list(self.__nodes)
+            tokens = self.__context_tokens
+            skip = 0
+            while skip < len(nodes) and tokens > max_tokens:
+                for node in nodes[skip:skip + 2]:
+                    tokens -= context_tokens(node)
+                skip = min(skip + 2, len(nodes))
+
+            messages = list(self.__messages)[skip:]
+            if self.__summary_message is not None:
+                messages.insert(0, self.__summary_message)
+            return messages, nodes[:skip]
+
+    def compact(self, nodes: list[TextNode], summary: TextNode) -> int:
+        """
+        Atomically remove `nodes` (oldest first) from the front of the history
+        and install `summary` in their place. Nodes that were already evicted
+        are skipped. Returns the number of nodes removed.
+        """
+        with self.__lock:
+            removed = 0
+            for node in nodes:
+                if self.__nodes and self.__nodes[0] is node:
+                    self.popleft()
+                    removed += 1
+            self.summary = summary
+            return removed
+
+    def clear(self) -> None:
+        """Remove all nodes."""
+        with self.__lock:
+            self.__nodes.clear()
+            self.__messages.clear()
+            self.__tokens = 0
+            self.__context_tokens = 0 if self.__summary is None else context_tokens(self.__summary)
+
+    def freeze(self) -> list[dict[str, Any]]:
+        """Return the node snapshots, in the format stored by Chat.freeze()."""
+        return [node.freeze() for node in self.to_list()]
+
+    def view(self) -> HistoryView:
+        """Return a live, read-only view of the nodes."""
+        return HistoryView(self)
+
+
+class HistoryView(Sequence):
+    """
+    Live, read-only sequence over the nodes of a ChatHistory, returned by
+    Chat.history. Creating it and reading len() or one item cost O(1);
+    slicing, concatenation and iteration work on a snapshot of the nodes.
+
+    The view cannot be changed in place: append(), clear() and the like raise
+    TypeError. Assign a new list to Chat.history instead.
+    """
+
+    __slots__ = ("__history",)
+
+    def __init__(self, history: ChatHistory) -> None:
+        self.__history = history
+
+    def __repr__(self) -> str:
+        return repr(self.__history.to_list())
+
+    def __len__(self) -> int:
+        return len(self.__history)
+
+    def __iter__(self) -> Iterator[TextNode]:
+        return iter(self.__history.to_list())
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return self.__history.to_list()[index]
+        return self.__history[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (HistoryView, list, tuple)):
+            return self.__history.to_list() == list(other)
+        return NotImplemented
+
+    def __add__(self, other: Iterable[TextNode]) -> list[TextNode]:
+        return self.__history.to_list() + list(other)
+
+    def __radd__(self, other: Iterable[TextNode]) -> list[TextNode]:
+        return list(other) + self.__history.to_list()
+
+    def __read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("<Chat.history is read-only: assign a new list to Chat.history instead>")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = __read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = __read_only
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import weakref
+from typing import Any, Optional
+
+import httpx
+import openai
+
+
+# Process-wide registry: one pooled client per API key fingerprint, so every Model
+# sharing a key also shares TLS sessions and keep-alive sockets.
+# Async clients are additionally scoped to their event loop, because httpx async
+# connections cannot outlive (or be shared across) loops.
+_settings: dict[str, Any] = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+}
+_sync_clients: dict[str, openai.OpenAI] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, openai.AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _fingerprint(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_settings["max_connections"],
+        max_keepalive_connections=_settings["max_keepalive_connections"],
+        keepalive_expiry=_settings["keepalive_expiry"],
+    )
+
+
+def configure_client_pool(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+) -> dict[str, Any]:
+    """
+    Update the connection pool settings and return the active ones.
+    Only clients created afterwards are affected: call reset_client_pool()
+    to close the existing ones; Models pick up fresh clients on next use.
+    """
+    with _lock:
+        if max_connections is not None:
+            if int(max_connections) <= 0:
+                raise ValueError("<Invalid 'max_connections': must be > 0>")
+            _settings["max_connections"] = int(max_connections)
+        if max_keepalive_connections is not None:
+            if int(max_keepalive_connections) < 0:
+                raise ValueError("<Invalid 'max_keepalive_connections': must be >= 0>")
+            _settings["max_keepalive_connections"] = int(max_keepalive_connections)
+        if keepalive_expiry is not None:
+            if float(keepalive_expiry) < 0:
+                raise ValueError("<Invalid 'keepalive_expiry': must be >= 0>")
+            _settings["keepalive_expiry"] = float(keepalive_expiry)
+        return dict(_settings)
+
+
+def get_client(api_key: str) -> openai.OpenAI:
+    """
+    Return the shared sync client for an API key, creating it on first use.
+    """
+    fp = _fingerprint(api_key)
+    with _lock:
+        client = _sync_clients.get(fp)
+        if client is None:
+            client = openai.OpenAI(
+                api_key=api_key,
+                http_client=openai.DefaultHttpxClient(limits=_limits()),
+            )
+            _sync_clients[fp] = client
+        return client
+
+
+def get_async_client(api_key: str) -> openai.AsyncOpenAI:
+    """
+    Return the shared async client for an API key on the running event loop.
+    Outside a running loop a fresh, unshared client is returned.
+    """
+    fp = _fingerprint(api_key)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return openai.AsyncOpenAI(
+            api_key=api_key,
+            http_client=openai.DefaultAsyncHttpxClient(limits=_limits()),
+        )
+
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(fp)
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                http_client=openai.DefaultAsyncHttpxClient(limits=_limits()),
+            )
+            clients[fp] = client
+        return client
+
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, client: openai.AsyncOpenAI) -> None:
+    """
+    Close an async client on the loop that owns its connections.
+    """
+    if loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if running is loop:
+        loop.create_task(client.close())
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.close(), loop)
+    else:
+        loop.run_until_complete(client.close())
+
+
+def reset_client_pool() -> None:
+    """
+    Close every pooled sync and async client. Models do not keep their own
+    reference, so they get a new pooled client on their next request.
+    """
+    with _lock:
+        clients = list(_sync_clients.values())
+        async_clients = [(loop, client) for loop, by_key in _async_clients.items() for client in by_key.values()]
+        _sync_clients.clear()
+        _async_clients.clear()
+    for client in clients:
+        client.close()
+    for loop, async_client in async_clients:
+        _close_async_client(loop, async_client)
+
+
+def pool_size() -> dict[str, int]:
+    """Return how many pooled clients currently exist."""
+    with _lock:
+        return {
+            "sync": len(_sync_clients),
+            "async": sum(len(clients) for clients in _async_clients.values()),
+        }
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def request_cache_key(payload: dict[str, Any]) -> str:
+    """
+    Return a canonical SHA-256 hash of a request payload.
+    Keys are sorted so that equal requests always hash the same way.
+    """
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CompletionCache(ABC):
+    """
+    Base class for exact-match completion caches.
+    Entries are plain JSON-serializable dicts; subclasses implement
+    _load/_store/_discard/_clear/__len__, or cannot be instantiated.
+    Hit/miss counters are kept here so every backend reports savings the same way.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        if ttl is not None and float(ttl) <= 0:
+            raise ValueError("<Invalid 'ttl': must be > 0 or None>")
+        self._ttl: Optional[float] = float(ttl) if ttl is not None else None
+        self._lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__saved_tokens = 0
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | entries: {len(self)}, hits: {self.hits}, misses: {self.misses}>"
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    # -------- STATS --------
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def saved_tokens(self) -> int:
+        """Total tokens of the completions served from the cache."""
+        return self.__saved_tokens
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.__hits + self.__misses
+        return {
+            "entries": len(self),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "hit_rate": (self.__hits / lookups) if lookups else 0.0,
+            "saved_tokens": self.__saved_tokens,
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.__hits = 0
+            self.__misses = 0
+            self.__saved_tokens = 0
+
+    # -------- ACTIONS --------
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached entry for `key`, counting a hit or a miss."""
+        with self._lock:
+            entry = self._load(key)
+            if entry is not None and self._ttl is not None and time.time() - float(entry.get("created_at", 0)) > self._ttl:
+                self._discard(key)
+                entry = None
+
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__hits += 1
+            self.__saved_tokens += int(entry.get("total_tokens", 0))
+            return entry
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        """Store an entry under `key`."""
+        entry = dict(entry)
+        entry["created_at"] = time.time()
+        with self._lock:
+            self._store(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    # -------- BACKEND HOOKS --------
+    @abstractmethod
+    def _load(self, key: str) -> Optional[dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _store(self, key: str, entry: dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def _discard(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def _clear(self) -> None:
+        ...
+
+
+class MemoryCompletionCache(CompletionCache):
+    """
+    In-process LRU cache bounded by number of entries.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None) -> None:
+        super().__init__(ttl=ttl)
+        if int(max_entries) <= 0:
+            raise ValueError("<Invalid 'max_entries': must be > 0>")
+        self.__max_entries = int(max_entries)
+        self.__entries: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(max_entries={self.__max_entries!r}, ttl={self._ttl!r})"
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def _load(self, key: str) -> Optional[dict[str, Any]]:
+        entry = self.__entries.get(key)
+        if entry is not None:
+            self.__entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: dict[str, Any]) -> None:
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+
+    def _discard(self, key: str) -> None:
+        self.__entries.pop(key, None)
+
+    def _clear(self) -> None:
+        self.__entries.clear()
+
+
+class FileCompletionCache(CompletionCache):
+    """
+    Directory-backed cache, one JSON file per entry, shared across processes.
+    Bounded by total size in bytes: the least recently used files are evicted first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None) -> None:
+        super().__init__(ttl=ttl)
+        if int(max_bytes) <= 0:
+            raise ValueError("<Invalid 'max_bytes': must be > 0>")
+        self.__directory = os.path.expanduser(str(directory))
+        self.__max_bytes = int(max_bytes)
+        os.makedirs(self.__directory, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(directory={self.__directory!r}, max_bytes={self.__max_bytes!r}, ttl={self._ttl!r})"
+
+    def __len__(self) -> int:
+        return len(self.__files())
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.__directory, f"{key}.json")
+
+    def __files(self) -> list[os.DirEntry]:
+        try:
+            return [e for e in os.scandir(self.__directory) if e.is_file() and e.name.endswith(".json")]
+        except OSError:
+            return []
+
+    def _load(self, key: str) -> Optional[dict[str, Any]]:
+        path = self.__path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # LRU: touch on read
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def _store(self, key: str, entry: dict[str, Any]) -> None:
+        path = self.__path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self.__evict()
+
+    def _discard(self, key: str) -> None:
+        try:
+            os.remove(self.__path(key))
+        except OSError:
+            pass
+
+    def _clear(self) -> None:
+        for e in self.__files():
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    def __evict(self) -> None:
+        files = []
+        total = 0
+        for e in self.__files():
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+
+        if total <= self.__max_bytes:
+            return
+
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.__max_bytes:
+                break
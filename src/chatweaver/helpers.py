@@ -1,4 +1,5 @@
 import pathlib
+import re
 from typing import Any
 from urllib.parse import urlparse
 from openai.types import FileObject
@@ -29,3 +30,14 @@ def is_file_id(file: FileObject | Any) -> bool:
         return True
     return False
 
+_FILE_ID_PATTERN = re.compile(r"file-[A-Za-z0-9_-]+")
+
+def is_file_id_string(file: Any) -> bool:
+    """
+    Return True for a string shaped like an OpenAI file id ("file-" followed by
+    letters, digits, "_" or "-") that does not name an existing local path.
+    """
+    if not isinstance(file, str) or not _FILE_ID_PATTERN.fullmatch(file):
+        return False
+    return not is_valid_path(file)
+
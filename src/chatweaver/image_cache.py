@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import base64
+import mimetypes
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+# Read size for streaming base64: a multiple of 3 so every chunk encodes
+# without padding and the pieces concatenate into one valid base64 string.
+_CHUNK_SIZE = 3 * 256 * 1024
+
+# Magic-number prefixes of the image formats accepted by the OpenAI vision API
+_SIGNATURES: tuple[tuple[bytes, str], ...] = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_image_mime(path: str | pathlib.Path, head: Optional[bytes] = None) -> str:
+    """
+    Return the MIME type of an image from its leading bytes, falling back to
+    the file extension and finally to image/png.
+    """
+    if head is None:
+        with open(path, "rb") as fh:
+            head = fh.read(16)
+
+    for signature, mime in _SIGNATURES:
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+
+    guessed, _ = mimetypes.guess_type(str(path))
+    if guessed is not None and guessed.startswith("image/"):
+        return guessed
+    return "image/png"
+
+
+def encode_image_file(path: str | pathlib.Path) -> str:
+    """
+    Return a local image as a base64 data URL.
+    The file is read and encoded in chunks into a preallocated buffer, so the
+    raw file is never held whole. Converting that buffer to the returned str
+    copies it once, so peak memory is about twice the encoded size.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        head = fh.read(16)
+        prefix = f"data:{sniff_image_mime(path, head)};base64,".encode("ascii")
+
+        out = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+        out[:len(prefix)] = prefix
+        pos = len(prefix)
+
+        fh.seek(0)
+        while True:
+            chunk = fh.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            encoded = base64.b64encode(chunk)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+
+    # The file may have changed size while being read
+    del out[pos:]
+    return out.decode("ascii")
+
+
+class ImageCache(object):
+    """
+    In-process LRU of encoded image data URLs, bounded by total size in bytes.
+
+    Entries are keyed by (resolved path, mtime, size), so an edited file is
+    re-encoded while repeated attachments of the same file are served from memory.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.__entries: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.max_bytes = max_bytes
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | entries: {len(self)}, bytes: {self.__bytes}/{self.__max_bytes}, hits: {self.__hits}, misses: {self.__misses}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(max_bytes={self.__max_bytes!r})"
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def max_bytes(self) -> int:
+        """Return the size bound of the cache (0 disables caching)."""
+        return self.__max_bytes
+    @max_bytes.setter
+    def max_bytes(self, new: int) -> None:
+        """Set the size bound, evicting entries if needed."""
+        if isinstance(new, bool) or not isinstance(new, int) or new < 0:
+            raise ValueError("<Invalid 'max_bytes': expected int >= 0>")
+        with self.__lock:
+            self.__max_bytes = new
+            self.__evict()
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the total size of the cached data URLs."""
+        return self.__bytes
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.__hits + self.__misses
+        return {
+            "entries": len(self),
+            "bytes": self.__bytes,
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "hit_rate": (self.__hits / lookups) if lookups else 0.0,
+        }
+
+    def get(self, path: str | pathlib.Path) -> str:
+        """
+        Return the data URL of a local image, encoding it on a miss.
+        """
+        resolved = pathlib.Path(path).expanduser().resolve()
+        stat = resolved.stat()
+        key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+
+        with self.__lock:
+            url = self.__entries.get(key)
+            if url is not None:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return url
+            self.__misses += 1
+
+        url = encode_image_file(resolved)
+
+        with self.__lock:
+            if len(url) <= self.__max_bytes and key not in self.__entries:
+                self.__entries[key] = url
+                self.__bytes += len(url)
+                self.__evict()
+        return url
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def __evict(self) -> None:
+        """Drop least recently used entries until within max_bytes. Lock held by caller."""
+        while self.__entries and self.__bytes > self.__max_bytes:
+            _, url = self.__entries.popitem(last=False)
+            self.__bytes -= len(url)
+
+
+# Process-wide cache used by Bot for local image attachments
+_image_cache = ImageCache()
+
+
+def get_image_cache() -> ImageCache:
+    """Return the process-wide image cache."""
+    return _image_cache
+
+
+def configure_image_cache(max_bytes: int) -> ImageCache:
+    """Set the size bound of the process-wide image cache (0 disables it)."""
+    _image_cache.max_bytes = max_bytes
+    return _image_cache
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class KeyValidationCache(object):
+    """
+    Remembers which API key fingerprints (SHA-256, never the key itself) were
+    validated, with a TTL and a maximum number of entries.
+
+    With a `path`, entries are also persisted to a small JSON file so that
+    short-lived processes can skip the models.list() round trip on cold start.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = 24 * 3600.0, max_entries: int = 1024) -> None:
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, float]" = OrderedDict()  # fp -> validated_at
+        self.__disk_loaded = False
+        self.configure(path=path, ttl=ttl, max_entries=max_entries)
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | entries: {len(self.__entries)}, path: {self.__path!r}, ttl: {self.__ttl}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.__path!r}, ttl={self.__ttl!r}, max_entries={self.__max_entries!r})"
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, fp: object) -> bool:
+        with self.__lock:
+            self.__load_disk()
+            validated_at = self.__entries.get(str(fp))
+            if validated_at is None:
+                return False
+            if self.__expired(validated_at):
+                del self.__entries[str(fp)]
+                return False
+            self.__entries.move_to_end(str(fp))
+            return True
+
+    # -------- SETTINGS --------
+    def configure(self, path: Optional[str] = None, ttl: Optional[float] = 24 * 3600.0, max_entries: int = 1024) -> None:
+        """
+        Set the on-disk location (None keeps the cache in memory only), the TTL in
+        seconds (None never expires) and the maximum number of fingerprints kept.
+        """
+        if ttl is not None and float(ttl) <= 0:
+            raise ValueError("<Invalid 'ttl': must be > 0 or None>")
+        if int(max_entries) <= 0:
+            raise ValueError("<Invalid 'max_entries': must be > 0>")
+
+        with self.__lock:
+            self.__path = os.path.expanduser(str(path)) if path is not None else None
+            self.__ttl = float(ttl) if ttl is not None else None
+            self.__max_entries = int(max_entries)
+            self.__disk_loaded = False
+            self.__trim()
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.__path
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self.__ttl
+
+    @property
+    def max_entries(self) -> int:
+        return self.__max_entries
+
+    # -------- ACTIONS --------
+    def add(self, fp: str) -> None:
+        """Record a fingerprint as validated now."""
+        with self.__lock:
+            self.__load_disk()
+            self.__entries[str(fp)] = time.time()
+            self.__entries.move_to_end(str(fp))
+            self.__trim()
+            self.__save_disk()
+
+    def discard(self, fp: str) -> None:
+        """Forget a fingerprint (e.g. after a 401)."""
+        with self.__lock:
+            self.__load_disk()
+            if self.__entries.pop(str(fp), None) is not None:
+                self.__save_disk()
+
+    def clear(self) -> None:
+        """Forget every fingerprint, on disk too."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__disk_loaded = True
+            self.__save_disk()
+
+    # -------- HELPERS --------
+    def __expired(self, validated_at: float) -> bool:
+        return self.__ttl is not None and time.time() - validated_at > self.__ttl
+
+    def __trim(self) -> None:
+        for fp in [fp for fp, at in self.__entries.items() if self.__expired(at)]:
+            del self.__entries[fp]
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+
+    def __load_disk(self) -> None:
+        """Merge the on-disk entries once per configuration."""
+        if self.__disk_loaded or self.__path is None:
+            return
+        self.__disk_loaded = True
+
+        try:
+            with open(self.__path, "r", encoding="utf-8") as f:
+                stored: Any = json.load(f)
+        except (OSError, ValueError):
+            # Missing or unreadable cache: behave as empty, it will be rewritten
+            return
+
+        if not isinstance(stored, dict):
+            return
+
+        for fp, validated_at in sorted(stored.items(), key=lambda kv: kv[1] if isinstance(kv[1], (int, float)) else 0):
+            if isinstance(fp, str) and isinstance(validated_at, (int, float)):
+                if validated_at > self.__entries.get(fp, 0):
+                    self.__entries[fp] = float(validated_at)
+        self.__trim()
+
+    def __save_disk(self) -> None:
+        """Write the entries atomically. Failures never break validation."""
+        if self.__path is None:
+            return
+
+        tmp_path = f"{self.__path}.{os.getpid()}.tmp"
+        try:
+            parent = os.path.dirname(os.path.abspath(self.__path))
+            if parent and not os.path.exists(parent):
+                os.makedirs(parent, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(dict(self.__entries), f, separators=(",", ":"))
+            os.replace(tmp_path, self.__path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -6,20 +6,23 @@ from typing import Any
 class MetadataContainer:
     images: list[Any]
     files: list[Any]
+    timings: list[dict[str, Any]] = field(default_factory=list)
 
     def __str__(self) -> str:
-        return f"<{self.__class__.__name__} | images: {str(self.images)}, files: {str(self.files)}>"
+        return f"<{self.__class__.__name__} | images: {str(self.images)}, files: {str(self.files)}, timings: {str(self.timings)}>"
 
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}("
             f"images={self.images!r}, "
-            f"files={self.files!r}"
+            f"files={self.files!r}, "
+            f"timings={self.timings!r}"
             f")"
         )
 
     def __iter__(self):
         return iter({
             "images": self.images,
-            "files": self.files
+            "files": self.files,
+            "timings": self.timings,
         }.items())
@@ -6,10 +6,15 @@ import hashlib
 import openai
 
 from .data import ChatWeaverModelNames
+from .rate_limiter import RateLimiter, set_rate_limits, get_rate_limiter
+from .client_pool import get_client, get_async_client, configure_client_pool
+from .key_validation_cache import KeyValidationCache
 
 
 # Cache globali: NON salvare la key in chiaro, meglio una fingerprint
-_cache_api_key_fp: set[str] = set()
+_cache_api_key_fp: KeyValidationCache = KeyValidationCache()
+# "trust until first 401": skip models.list() and let the first real request validate the key
+_trust_until_first_401: bool = False
 _cache_model_name: set[str] = set()
 
 
@@ -110,6 +115,23 @@ class Model(object):
         return f"{k[:6]}...{k[-4:]}"
 
 
+    # -------- RATE LIMITS --------
+    def set_rate_limits(self, rpm: Optional[int] = None, tpm: Optional[int] = None, per_key: bool = True) -> Optional[RateLimiter]:
+        """
+        Register the shared RPM/TPM limiter for this model name.
+        With per_key=True the limiter only applies to this API key (by fingerprint);
+        otherwise it applies to every key using this model. Passing no limits removes it.
+        Every Model with the same model name and key shares the same limiter.
+        """
+        fp = self._api_key_fingerprint(self.api_key) if (per_key and self.api_key) else "*"
+        return set_rate_limits(self.model, api_key_fp=fp, rpm=rpm, tpm=tpm)
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Return the shared limiter for this model/key, if one is registered."""
+        fp = self._api_key_fingerprint(self.api_key) if self.api_key else None
+        return get_rate_limiter(self.model, fp)
+
     # -------- MAGIC METHODS --------
     def __str__(self) -> str:
         return f"<{self.__class__.__name__} | model: {self.model!r}, api_key: {self.api_key_hint()!r}, key_status: {self.__key_status}>"
@@ -206,11 +228,18 @@ class Model(object):
             # treat it as valid and recreate the client if necessary
             self.__key_status = KeyStatus.VALID
             if self.__client is None:
-                self.__client = openai.OpenAI(api_key=api_key)
+                self.__client = get_client(api_key)
+            return True
+
+        if _trust_until_first_401 and self.__key_status is not KeyStatus.INVALID:
+            # no round trip: the first real request doubles as validation
+            # (a key already refused with 401 goes through the real check)
+            self.__client = get_client(api_key)
+            self.__key_status = KeyStatus.VALID
             return True
 
         try:
-            client = openai.OpenAI(api_key=api_key)
+            client = get_client(api_key)
             client.models.list()  # check credentials
             self.__client = client
             self.__key_status = KeyStatus.VALID
@@ -222,6 +251,41 @@ class Model(object):
             self.__last_auth_error = str(e)
             return False
 
+    async def avalidate_api_key(self) -> bool:
+        """
+            Async counterpart of validate_api_key(): the lightweight models.list() check
+            is awaited on the pooled AsyncOpenAI client, so the event loop is never blocked.
+            On success both the sync and the async clients become available.
+        """
+
+        api_key = self.api_key
+
+        if not api_key:
+            self.__key_status = KeyStatus.MISSING
+            self.__client = None
+            return False
+
+        # skip network calls if already invalid by format
+        if self.__key_status is KeyStatus.INVALID and self.__last_auth_error == "Invalid API key format.":
+            self.__client = None
+            return False
+
+        fp = self._api_key_fingerprint(api_key)
+        if fp in _cache_api_key_fp or (_trust_until_first_401 and self.__key_status is not KeyStatus.INVALID):
+            self.__key_status = KeyStatus.VALID
+            return True
+
+        try:
+            await get_async_client(api_key).models.list()  # check credentials
+            self.__key_status = KeyStatus.VALID
+            _cache_api_key_fp.add(fp)
+            return True
+        except Exception as e:
+            self.__client = None
+            self.__key_status = KeyStatus.INVALID
+            self.__last_auth_error = str(e)
+            return False
+
     @property
     def client(self) -> openai.OpenAI:
         """
@@ -230,21 +294,90 @@ class Model(object):
         """
 
         if self.__client is not None and self.__key_status is KeyStatus.VALID:
+            # Always go through the pool: reset_client_pool() may have closed the last one
+            self.__client = get_client(self.api_key)  # type: ignore[arg-type]
             return self.__client
 
         ok = self.validate_api_key()
         if not ok:
             fp = self._api_key_fingerprint(self.api_key) # type: ignore
-            if fp in _cache_api_key_fp:
-                _cache_api_key_fp.remove(fp)
+            _cache_api_key_fp.discard(fp)
             raise RuntimeError(
                 f"Client not available: key_status={self.__key_status}. "
                 f"Reason: {self.__last_auth_error or 'missing/invalid api_key'}"
             )
 
-        assert self.__client is not None
+        self.__client = get_client(self.api_key)  # type: ignore[arg-type]
         return self.__client
 
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """
+            Lazy AsyncOpenAI client sharing the validation state of `client`.
+            If the key has not been validated yet, prefer awaiting avalidate_api_key()
+            first: this property falls back to the blocking validation.
+            The client comes from the shared pool of the running event loop.
+        """
+
+        if self.__key_status is not KeyStatus.VALID:
+            _ = self.client  # validates (or raises) exactly like the sync path
+
+        return get_async_client(self.api_key)  # type: ignore[arg-type]
+
+    @staticmethod
+    def configure_client_pool(
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+            Configure the process-wide HTTP pool shared by every Model with the same key.
+            Affects clients created afterwards; see client_pool.reset_client_pool().
+        """
+        return configure_client_pool(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+    def confirm_api_key(self) -> None:
+        """
+            Record that a real request succeeded with the current key.
+            In "trust until first 401" mode this is what actually validates the key.
+        """
+        if self.api_key and self.__key_status is KeyStatus.VALID:
+            fp = self._api_key_fingerprint(self.api_key)
+            if fp not in _cache_api_key_fp:
+                _cache_api_key_fp.add(fp)
+
+    def reject_api_key(self, reason: str) -> None:
+        """
+            Mark the current key INVALID after the API refused it (401).
+            The instance stays usable and the fingerprint is dropped from the cache.
+        """
+        if self.api_key:
+            _cache_api_key_fp.discard(self._api_key_fingerprint(self.api_key))
+        self.__client = None
+        self.__key_status = KeyStatus.INVALID
+        self.__last_auth_error = str(reason)
+
+    @staticmethod
+    def configure_key_validation(
+        cache_path: Optional[str] = None,
+        ttl: Optional[float] = 24 * 3600.0,
+        max_entries: int = 1024,
+        trust_until_first_401: bool = False,
+    ) -> None:
+        """
+            Configure the process-wide validation cache.
+            cache_path persists validated fingerprints (never keys) across processes;
+            ttl/max_entries bound it. With trust_until_first_401=True no models.list()
+            call is made: keys are trusted until a request fails with 401.
+        """
+        global _trust_until_first_401
+        _cache_api_key_fp.configure(path=cache_path, ttl=ttl, max_entries=max_entries)
+        _trust_until_first_401 = bool(trust_until_first_401)
+
     def can_use_remote_services(self) -> bool:
         """
             True if the client can be used (valid key).
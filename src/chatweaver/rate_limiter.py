@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Optional
+
+from .tokenizer import count_message_tokens, count_tokens
+
+
+# Shared limiters, keyed by (model name, API key fingerprint). "*" matches any key.
+_limiters: dict[tuple[str, str], "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket(object):
+    """
+    A classic token bucket refilled continuously at `capacity` tokens per minute.
+    The level may go negative when a reconciliation reveals an under-estimate.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        capacity = int(capacity)
+        if capacity <= 0:
+            raise ValueError("<Invalid bucket capacity: must be > 0>")
+
+        self.__capacity = capacity
+        self.__level = float(capacity)
+        self.__updated = time.monotonic()
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | level: {self.level:.1f}/{self.__capacity}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(capacity={self.__capacity!r})"
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def level(self) -> float:
+        self.__refill()
+        return self.__level
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        rate = self.__capacity / 60.0
+        self.__level = min(float(self.__capacity), self.__level + (now - self.__updated) * rate)
+        self.__updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Return the seconds needed before `amount` tokens are available.
+        Requests larger than the capacity only wait for a full bucket.
+        """
+        amount = min(float(amount), float(self.__capacity))
+        self.__refill()
+        missing = amount - self.__level
+        if missing <= 0:
+            return 0.0
+        return missing / (self.__capacity / 60.0)
+
+    def consume(self, amount: float) -> None:
+        self.__refill()
+        self.__level -= float(amount)
+
+    def adjust(self, delta: float) -> None:
+        """Give back (positive) or charge (negative) tokens after the fact."""
+        self.__refill()
+        self.__level = min(float(self.__capacity), self.__level + float(delta))
+
+
+class RateLimiter(object):
+    """
+    Admits requests through a requests-per-minute and a tokens-per-minute bucket.
+    Callers queue (sleep) until both budgets allow the request instead of failing.
+    Usable from threads (acquire) and from coroutines (aacquire).
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None) -> None:
+        if rpm is None and tpm is None:
+            raise ValueError("<RateLimiter needs at least one of 'rpm' or 'tpm'>")
+
+        self.__rpm: Optional[TokenBucket] = TokenBucket(rpm) if rpm is not None else None
+        self.__tpm: Optional[TokenBucket] = TokenBucket(tpm) if tpm is not None else None
+        self.__lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | rpm: {self.rpm}, tpm: {self.tpm}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(rpm={self.rpm!r}, tpm={self.tpm!r})"
+
+    @property
+    def rpm(self) -> Optional[int]:
+        return self.__rpm.capacity if self.__rpm is not None else None
+
+    @property
+    def tpm(self) -> Optional[int]:
+        return self.__tpm.capacity if self.__tpm is not None else None
+
+    def __try_admit(self, tokens: int) -> float:
+        """
+        Admit the request if both buckets allow it and return 0.0,
+        otherwise return how long to wait before trying again.
+        """
+        with self.__lock:
+            wait = 0.0
+            if self.__rpm is not None:
+                wait = max(wait, self.__rpm.wait_time(1))
+            if self.__tpm is not None:
+                wait = max(wait, self.__tpm.wait_time(tokens))
+
+            if wait > 0:
+                return wait
+
+            if self.__rpm is not None:
+                self.__rpm.consume(1)
+            if self.__tpm is not None:
+                self.__tpm.consume(tokens)
+            return 0.0
+
+    @staticmethod
+    def __check_timeout(start: float, wait: float, timeout: Optional[float]) -> None:
+        """
+        Raise TimeoutError if waiting `wait` more seconds would exceed `timeout`.
+        """
+        if timeout is not None and time.perf_counter() - start + wait > timeout:
+            raise TimeoutError("<Deadline exceeded while queued by the rate limiter>")
+
+    def acquire(self, tokens: int, timeout: Optional[float] = None) -> float:
+        """
+        Block until the request is admitted. Returns the time spent queued.
+        With `timeout`, raises TimeoutError instead of queuing longer than that.
+        """
+        start = time.perf_counter()
+        while True:
+            wait = self.__try_admit(int(tokens))
+            if wait <= 0:
+                return time.perf_counter() - start
+            self.__check_timeout(start, wait, timeout)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int, timeout: Optional[float] = None) -> float:
+        """
+        Async counterpart of acquire(): queues without blocking the event loop.
+        """
+        start = time.perf_counter()
+        while True:
+            wait = self.__try_admit(int(tokens))
+            if wait <= 0:
+                return time.perf_counter() - start
+            self.__check_timeout(start, wait, timeout)
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """
+        Correct the TPM budget once the real usage is known.
+        """
+        if self.__tpm is None:
+            return
+        with self.__lock:
+            self.__tpm.adjust(int(estimated) - int(actual))
+
+
+# -------- REGISTRY --------
+def set_rate_limits(model: str, api_key_fp: str = "*", rpm: Optional[int] = None, tpm: Optional[int] = None) -> Optional[RateLimiter]:
+    """
+    Register (or remove, when both limits are None) the shared limiter for a model/key pair.
+    """
+    key = (str(model), str(api_key_fp))
+    with _limiters_lock:
+        if rpm is None and tpm is None:
+            _limiters.pop(key, None)
+            return None
+        limiter = RateLimiter(rpm=rpm, tpm=tpm)
+        _limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limiter(model: str, api_key_fp: Optional[str] = None) -> Optional[RateLimiter]:
+    """
+    Return the limiter for a model/key pair, falling back to the model-wide one.
+    """
+    with _limiters_lock:
+        if api_key_fp is not None:
+            limiter = _limiters.get((str(model), str(api_key_fp)))
+            if limiter is not None:
+                return limiter
+        return _limiters.get((str(model), "*"))
+
+
+def clear_rate_limits() -> None:
+    """Remove every registered limiter."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def estimate_request_tokens(request_kwargs: dict[str, Any]) -> int:
+    """
+    Pre-flight estimate of the tokens a chat completion (or a Responses API
+    generation) will consume: the locally counted message text and
+    instructions (see tokenizer.py) plus the output cap when one is sent.
+    """
+    model = request_kwargs.get("model")
+    messages = request_kwargs.get("messages", request_kwargs.get("input", []))
+    estimate = count_message_tokens(messages if isinstance(messages, list) else [], model)
+    instructions = request_kwargs.get("instructions")
+    if instructions:
+        estimate += count_tokens(str(instructions), model)
+    max_output_tokens = request_kwargs.get("max_output_tokens")
+    if max_output_tokens is not None:
+        estimate += int(max_output_tokens)
+    max_completion_tokens = request_kwargs.get("max_completion_tokens")
+    if max_completion_tokens is not None:
+        estimate += int(max_completion_tokens)
+    return estimate
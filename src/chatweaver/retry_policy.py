@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import openai
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry settings for transient OpenAI failures (429, 5xx, dropped connections).
+    Delays grow exponentially with full jitter and honor the server's Retry-After.
+    """
+    max_retries: int = 3
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    retry_on_status: tuple[int, ...] = (408, 409, 429, 500, 502, 503, 504)
+    retry_on_connection_errors: bool = True
+
+    def __post_init__(self) -> None:
+        if int(self.max_retries) < 0:
+            raise ValueError("<Invalid 'max_retries': must be >= 0>")
+        if float(self.initial_delay) < 0 or float(self.max_delay) < 0:
+            raise ValueError("<Invalid retry delay: must be >= 0>")
+        if float(self.multiplier) < 1:
+            raise ValueError("<Invalid 'multiplier': must be >= 1>")
+        object.__setattr__(self, "retry_on_status", tuple(int(code) for code in self.retry_on_status))
+
+    # -------- DECISIONS --------
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Return True if the error is worth another attempt.
+        """
+        if isinstance(error, openai.APIStatusError):
+            return int(error.status_code) in self.retry_on_status
+        if isinstance(error, openai.APIConnectionError):
+            return self.retry_on_connection_errors
+        return False
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Return the seconds to wait before retry number `attempt` (1-based).
+        A Retry-After / retry-after-ms header from the server takes precedence.
+        """
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, float(self.max_delay))
+
+        backoff = min(float(self.max_delay), float(self.initial_delay) * float(self.multiplier) ** max(0, int(attempt) - 1))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def retry_after(error: Optional[BaseException]) -> Optional[float]:
+        """
+        Return the server-suggested delay in seconds, if the error carries one.
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            retry_after_ms = headers.get("retry-after-ms")
+            if retry_after_ms is not None:
+                return max(0.0, float(retry_after_ms) / 1000.0)
+            retry_after = headers.get("retry-after")
+            if retry_after is not None:
+                return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            # HTTP-date values are not worth parsing here: fall back to backoff
+            return None
+        return None
+
+    # -------- Freeze / Thaw --------
+    def freeze(self) -> dict[str, Any]:
+        """
+        Return a serializable snapshot of this policy.
+        """
+        return {
+            "version": 1,
+            "properties": {
+                "max_retries": self.max_retries,
+                "initial_delay": self.initial_delay,
+                "max_delay": self.max_delay,
+                "multiplier": self.multiplier,
+                "jitter": self.jitter,
+                "retry_on_status": list(self.retry_on_status),
+                "retry_on_connection_errors": self.retry_on_connection_errors,
+            },
+            "extra": {}
+        }
+
+    @classmethod
+    def thaw(cls, snapshot: dict[str, Any]) -> "RetryPolicy":
+        """
+        Restore a RetryPolicy from a snapshot.
+        """
+        if not isinstance(snapshot, dict):
+            raise TypeError("<Invalid snapshot: expected dict>")
+
+        props = snapshot.get("properties", {})
+        if not isinstance(props, dict):
+            raise ValueError("<Invalid snapshot: missing properties dict>")
+
+        default = cls()
+        return cls(
+            max_retries=int(props.get("max_retries", default.max_retries)),
+            initial_delay=float(props.get("initial_delay", default.initial_delay)),
+            max_delay=float(props.get("max_delay", default.max_delay)),
+            multiplier=float(props.get("multiplier", default.multiplier)),
+            jitter=bool(props.get("jitter", default.jitter)),
+            retry_on_status=tuple(props.get("retry_on_status", default.retry_on_status)),
+            retry_on_connection_errors=bool(props.get("retry_on_connection_errors", default.retry_on_connection_errors)),
+        )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
 from typing import Any
 
@@ -8,6 +10,9 @@ from typing import Any
 class Schema:
     """
     A simple JSON schema container for structured model outputs.
+
+    The resolved response_format, its JSON encoding and its hash are computed
+    once per instance; `properties` must not be mutated after construction.
     """
     name: str
     properties: dict[str, Any]
@@ -19,6 +24,36 @@ class Schema:
     def resolve(self) -> dict:
         """
         Return an OpenAI-compatible response_format schema.
+        The dict is memoized and shared between calls: do not mutate it.
+        """
+        resolved = self.__dict__.get("_resolved")
+        if resolved is None:
+            resolved = self.__build()
+            object.__setattr__(self, "_resolved", resolved)
+        return resolved
+
+    def resolve_json(self) -> bytes:
+        """
+        Return resolve() serialized as compact, key-sorted UTF-8 JSON (memoized).
+        """
+        encoded = self.__dict__.get("_resolved_json")
+        if encoded is None:
+            encoded = json.dumps(self.resolve(), sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            object.__setattr__(self, "_resolved_json", encoded)
+        return encoded
+
+    @property
+    def fingerprint(self) -> str:
+        """Return the SHA-256 of resolve_json(), a cheap stand-in for the schema in cache keys."""
+        digest = self.__dict__.get("_fingerprint")
+        if digest is None:
+            digest = hashlib.sha256(self.resolve_json()).hexdigest()
+            object.__setattr__(self, "_fingerprint", digest)
+        return digest
+
+    def __build(self) -> dict:
+        """
+        Build the response_format payload.
         """
         return {
             "type": "json_schema",
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Optional
+
+
+class _Call(object):
+    """
+    One in-flight call shared by a leader thread and its followers.
+    """
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight(object):
+    """
+    Deduplicates concurrent identical calls.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    with the same key while it is in flight wait and receive the same value (or
+    exception). Threads coalesce with threads, coroutines with coroutines of the
+    same event loop.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls: dict[str, _Call] = {}
+        self.__futures: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        self.__coalesced = 0
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | in_flight: {self.in_flight}, coalesced: {self.coalesced}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys currently in flight."""
+        with self.__lock:
+            return len(self.__calls) + sum(len(futures) for futures in self.__futures.values())
+
+    @property
+    def coalesced(self) -> int:
+        """Number of calls served by another caller's request so far."""
+        return self.__coalesced
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """
+        Run fn() once per in-flight key. Returns (value, shared) where `shared`
+        is True for followers that reused the leader's result.
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.__calls[key] = call
+            else:
+                call.followers += 1  # type: ignore[union-attr]
+                self.__coalesced += 1
+
+        assert call is not None
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                self.__calls.pop(key, None)
+            call.event.set()
+
+        return call.value, False
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Async counterpart of do(): coroutines on the same loop await one call.
+        """
+        loop = asyncio.get_running_loop()
+
+        with self.__lock:
+            futures = self.__futures.setdefault(loop, {})
+            future = futures.get(key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                futures[key] = future
+            else:
+                self.__coalesced += 1
+
+        assert future is not None
+        if not leader:
+            return await asyncio.shield(future), True
+
+        try:
+            value = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved: followers may not exist
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self.__lock:
+                futures.pop(key, None)
+
+        return value, False
+
+
+# Process-wide instance used by Bot when request coalescing is enabled
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide SingleFlight used by Bot."""
+    return _single_flight
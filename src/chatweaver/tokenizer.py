@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import functools
+import threading
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency: pip install chatweaver[tokenizer]
+    tiktoken = None
+
+
+# Model-name prefixes -> tiktoken encoding, longest prefix wins.
+# Covers the families listed in ChatWeaverModelNames.
+_ENCODINGS: dict[str, str] = {
+    "gpt-5": "o200k_base",
+    "gpt-4.1": "o200k_base",
+    "gpt-4o": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "o4": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5": "cl100k_base",
+}
+_DEFAULT_ENCODING = "o200k_base"
+
+# Per-message overhead of the chat format (role markers, separators), and the
+# tokens that prime every reply.
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+# Prices in USD per 1M tokens, keyed by model name: (input, output).
+_prices: dict[str, tuple[float, float]] = {}
+_prices_lock = threading.Lock()
+
+
+def encoding_name_for_model(model: Optional[str]) -> str:
+    """
+    Return the tiktoken encoding name used by a model family.
+    Unknown models fall back to the encoding of the current families.
+    """
+    if not model:
+        return _DEFAULT_ENCODING
+    for prefix in sorted(_ENCODINGS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return _ENCODINGS[prefix]
+    return _DEFAULT_ENCODING
+
+
+def has_exact_tokenizer(model: Optional[str] = None) -> bool:
+    """Return whether counts for `model` are exact, i.e. its tiktoken encoding is available."""
+    return _encoding(encoding_name_for_model(model)) is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(name: str) -> Any:
+    """
+    Load a tiktoken encoding once. Returns None when tiktoken is missing or the
+    encoding cannot be loaded (tiktoken downloads it on first use).
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _count(text: str, encoding_name: str) -> int:
+    """
+    Count the tokens of `text`. Memoized, so repeated strings (rules, history
+    node contents) are only tokenized once.
+    """
+    encoding = _encoding(encoding_name)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Heuristic fallback: about 4 characters per token, rounded up
+    return (len(text) + 3) // 4
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens of a piece of text for `model`, offline.
+    Exact when tiktoken is installed, a character-based estimate otherwise.
+    """
+    if not text:
+        return 0
+    return _count(str(text), encoding_name_for_model(model))
+
+
+def count_message_tokens(messages: list[dict[str, Any]], model: Optional[str] = None) -> int:
+    """
+    Count the input tokens of a chat completion message list (or a Responses
+    API input list), offline. Only text parts are counted; image and file
+    parts are billed separately by the API and are not estimated here.
+    """
+    total = REPLY_PRIMING_TOKENS
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS
+        content = message.get("content")
+        if isinstance(content, str):
+            total += count_tokens(content, model)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and part.get("type") in ("text", "input_text"):
+                    total += count_tokens(str(part.get("text", "")), model)
+    return total
+
+
+def set_model_pricing(model: str, input_per_million: float, output_per_million: float) -> None:
+    """
+    Register the USD price per 1M input/output tokens of a model, used by
+    estimate_cost(). ChatWeaver ships no prices, as they change over time.
+    """
+    input_per_million = float(input_per_million)
+    output_per_million = float(output_per_million)
+    if input_per_million < 0 or output_per_million < 0:
+        raise ValueError("<Invalid pricing: prices must be >= 0>")
+    with _prices_lock:
+        _prices[str(model)] = (input_per_million, output_per_million)
+
+
+def get_model_pricing(model: str) -> Optional[tuple[float, float]]:
+    """Return the (input, output) USD price per 1M tokens of a model, or None."""
+    with _prices_lock:
+        return _prices.get(str(model))
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int = 0) -> Optional[float]:
+    """
+    Return the estimated USD cost of a request, or None when the model has
+    no registered pricing.
+    """
+    pricing = get_model_pricing(model)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    return (int(prompt_tokens) * input_price + int(completion_tokens) * output_price) / 1_000_000
+
+
+def clear_token_cache() -> None:
+    """Drop the memoized token counts."""
+    _count.cache_clear()
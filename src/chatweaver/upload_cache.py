@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+# Read size used when hashing files for the upload cache
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadCache(object):
+    """
+    Maps uploaded file contents to their OpenAI file_id, so attaching the same
+    file again reuses the existing upload instead of sending it again.
+
+    Entries are keyed by SHA-256 of the content, the upload purpose and the API
+    key fingerprint (file_ids belong to one account), and store the file_id with
+    the upload time. Entries older than `ttl` are not reused. With a `path`,
+    entries are persisted to a JSON file, written atomically.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: int = 4096) -> None:
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()  # key -> (file_id, uploaded_at)
+        self.__digests: dict[tuple[str, int, int], str] = {}  # (path, mtime_ns, size) -> sha256
+        self.__disk_loaded = False
+        self.__hits = 0
+        self.__misses = 0
+        self.configure(path=path, ttl=ttl, max_entries=max_entries)
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} | entries: {len(self.__entries)}, path: {self.__path!r}, ttl: {self.__ttl}>"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.__path!r}, ttl={self.__ttl!r}, max_entries={self.__max_entries!r})"
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    # -------- SETTINGS --------
+    def configure(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: int = 4096) -> None:
+        """
+        Set the on-disk location (None keeps the cache in memory only), the TTL in
+        seconds after which an upload is no longer reused (None never expires)
+        and the maximum number of entries kept.
+        """
+        if ttl is not None and float(ttl) <= 0:
+            raise ValueError("<Invalid 'ttl': must be > 0 or None>")
+        if int(max_entries) <= 0:
+            raise ValueError("<Invalid 'max_entries': must be > 0>")
+
+        with self.__lock:
+            self.__path = os.path.expanduser(str(path)) if path is not None else None
+            self.__ttl = float(ttl) if ttl is not None else None
+            self.__max_entries = int(max_entries)
+            self.__disk_loaded = False
+            self.__trim()
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.__path
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self.__ttl
+
+    @property
+    def max_entries(self) -> int:
+        return self.__max_entries
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.__hits + self.__misses
+        return {
+            "entries": len(self.__entries),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "hit_rate": (self.__hits / lookups) if lookups else 0.0,
+        }
+
+    # -------- KEYS --------
+    def file_digest(self, path: str | pathlib.Path) -> str:
+        """
+        Return the SHA-256 of a local file, streamed in chunks. The digest is
+        remembered per (path, mtime, size), so unchanged files are hashed once.
+        """
+        resolved = pathlib.Path(path).expanduser().resolve()
+        stat = resolved.stat()
+        stat_key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+
+        with self.__lock:
+            digest = self.__digests.get(stat_key)
+        if digest is not None:
+            return digest
+
+        h = hashlib.sha256()
+        with open(resolved, "rb") as fh:
+            for chunk in iter(lambda: fh.read(_HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+        with self.__lock:
+            if len(self.__digests) >= self.__max_entries:
+                self.__digests.clear()
+            self.__digests[stat_key] = digest
+        return digest
+
+    @staticmethod
+    def key(digest: str, purpose: str, key_fp: str) -> str:
+        """Return the cache key of a content digest uploaded with `purpose` under one API key."""
+        return f"{digest}:{purpose}:{key_fp}"
+
+    # -------- ACTIONS --------
+    def get(self, key: str) -> Optional[str]:
+        """Return the reusable file_id for a key, or None."""
+        with self.__lock:
+            self.__load_disk()
+            entry = self.__entries.get(key)
+            if entry is None or self.__expired(entry[1]):
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def add(self, key: str, file_id: str) -> None:
+        """Record a fresh upload."""
+        with self.__lock:
+            self.__load_disk()
+            self.__entries[key] = (str(file_id), time.time())
+            self.__entries.move_to_end(key)
+            self.__trim()
+            self.__save_disk()
+
+    def discard_file_id(self, file_id: str) -> None:
+        """Forget every entry pointing to `file_id` (e.g. after it was deleted)."""
+        with self.__lock:
+            self.__load_disk()
+            keys = [k for k, (fid, _) in self.__entries.items() if fid == file_id]
+            for k in keys:
+                del self.__entries[k]
+            if keys:
+                self.__save_disk()
+
+    def stale(self, key_fp: str, older_than: Optional[float] = None) -> list[str]:
+        """
+        Return the file_ids uploaded under `key_fp` more than `older_than`
+        seconds ago (default: the TTL), oldest first.
+        """
+        age = self.__ttl if older_than is None else float(older_than)
+        if age is None:
+            raise ValueError("<Invalid 'older_than': required when the cache has no ttl>")
+
+        cutoff = time.time() - age
+        with self.__lock:
+            self.__load_disk()
+            stale = [
+                fid for k, (fid, at) in sorted(self.__entries.items(), key=lambda kv: kv[1][1])
+                if k.endswith(f":{key_fp}") and at <= cutoff
+            ]
+        return list(dict.fromkeys(stale))
+
+    def clear(self) -> None:
+        """Forget every upload, on disk too."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__digests.clear()
+            self.__disk_loaded = True
+            self.__save_disk()
+
+    # -------- HELPERS --------
+    def __expired(self, uploaded_at: float) -> bool:
+        return self.__ttl is not None and time.time() - uploaded_at > self.__ttl
+
+    def __trim(self) -> None:
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+
+    def __load_disk(self) -> None:
+        """Merge the on-disk entries once per configuration."""
+        if self.__disk_loaded or self.__path is None:
+            return
+        self.__disk_loaded = True
+
+        try:
+            with open(self.__path, "r", encoding="utf-8") as f:
+                stored: Any = json.load(f)
+        except (OSError, ValueError):
+            # Missing or unreadable cache: behave as empty, it will be rewritten
+            return
+
+        if not isinstance(stored, dict):
+            return
+
+        valid = [
+            (k, v) for k, v in stored.items()
+            if isinstance(k, str) and isinstance(v, list) and len(v) == 2
+            and isinstance(v[0], str) and isinstance(v[1], (int, float))
+        ]
+        for k, (file_id, uploaded_at) in sorted(valid, key=lambda kv: kv[1][1]):
+            current = self.__entries.get(k)
+            if current is None or uploaded_at > current[1]:
+                self.__entries[k] = (file_id, float(uploaded_at))
+        self.__trim()
+
+    def __save_disk(self) -> None:
+        """Write the entries atomically. Failures never break uploads."""
+        if self.__path is None:
+            return
+
+        tmp_path = f"{self.__path}.{os.getpid()}.tmp"
+        try:
+            parent = os.path.dirname(os.path.abspath(self.__path))
+            if parent and not os.path.exists(parent):
+                os.makedirs(parent, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({k: list(v) for k, v in self.__entries.items()}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.__path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# Process-wide cache used by Bot for local file attachments
+_upload_cache = UploadCache()
+
+
+def get_upload_cache() -> UploadCache:
+    """Return the process-wide upload cache."""
+    return _upload_cache
+
+
+def configure_upload_cache(path: Optional[str] = None, ttl: Optional[float] = None, max_entries: int = 4096) -> UploadCache:
+    """Configure the process-wide upload cache (see UploadCache.configure())."""
+    _upload_cache.configure(path=path, ttl=ttl, max_entries=max_entries)
+    return _upload_cache
@@ -0,0 +1,170 @@
+import os
+
+import pytest
+
+from chatweaver import Archive, Bot, Chat, Model, TextNode
+
+
+API_KEY = "sk-" + "x" * 40
+
+
+def make_node(i: int) -> TextNode:
+    return TextNode(
+        role="user" if i % 2 == 0 else "assistant",
+        content=f"m{i} " + "x" * 150,
+        owner="u",
+        tokens=1,
+        date="2026-01-01 00:00:00",
+        image_data=[],
+        file_data=[],
+    )
+
+
+def make_chat(n: int, title: str = "chat") -> Chat:
+    chat = Chat(bot=Bot(model=Model(api_key=API_KEY, model="gpt-4o")), title=title)
+    chat.history = [make_node(i) for i in range(n)]
+    return chat
+
+
+def contents(nodes: list[TextNode]) -> list[str]:
+    return [str(node.content).split()[0] for node in nodes]
+
+
+def file_version(path: str) -> int:
+    with open(path, "rb") as f:
+        return int.from_bytes(f.read(4)[2:4], "little")
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "chats.cwarchive")
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_segmented_save_round_trip(path, lazy):
+    archive = Archive(path, api_key=API_KEY, lazy=lazy)
+    archive.add(make_chat(150))
+    archive.add(Bot(model=Model(api_key=API_KEY)))
+    archive.save()
+
+    assert file_version(path) == 2
+    # one chat header, three segments of up to 64 nodes, one bot
+    assert archive.stats()["records"] == 5
+
+    reopened = Archive(path, api_key=API_KEY, lazy=lazy)
+    assert contents(reopened.get(0).history) == [f"m{i}" for i in range(150)]
+    assert isinstance(reopened.get(1), Bot)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_append_writes_only_new_nodes(path, lazy):
+    archive = Archive(path, api_key=API_KEY, lazy=lazy)
+    archive.add(make_chat(300))
+    archive.save()
+    size = os.path.getsize(path)
+
+    chat = archive.get(0)
+    chat.history = chat.history + [make_node(300), make_node(301)]
+    archive.save()
+
+    assert os.path.getsize(path) - size < 3000
+    size = os.path.getsize(path)
+    archive.save()
+    assert os.path.getsize(path) == size
+
+    # dropping leading nodes releases whole segments
+    chat.history = chat.history[130:]
+    archive.save()
+
+    history = Archive(path, api_key=API_KEY, lazy=not lazy).get(0).history
+    assert contents(history) == [f"m{i}" for i in range(130, 302)]
+
+
+def test_lazy_get_history_reads_last_nodes(path):
+    archive = Archive(path, api_key=API_KEY)
+    archive.add(make_chat(200))
+    archive.add(Bot(model=Model(api_key=API_KEY)))
+    archive.save()
+
+    lazy = Archive(path, api_key=API_KEY, lazy=True)
+    assert contents(lazy.get_history(0, last=3)) == ["m197", "m198", "m199"]
+    assert lazy.get_history(0, last=0) == []
+    assert len(lazy.get_history(0)) == 200
+
+    with pytest.raises(KeyError):
+        lazy.get_history(5)
+    with pytest.raises(TypeError):
+        lazy.get_history(1)
+    with pytest.raises(ValueError):
+        lazy.get_history(0, last=-1)
+
+
+def test_compact_keeps_segmented_chats(path):
+    archive = Archive(path, api_key=API_KEY)
+    archive.add(make_chat(100))
+    archive.save()
+    for i in range(3):
+        chat = archive.get(0)
+        chat.history = chat.history[2:] + [make_node(100 + 2 * i), make_node(101 + 2 * i)]
+        archive.save()
+
+    assert archive.compact() > 0
+    assert archive.stats()["dead_bytes"] == 0
+    assert file_version(path) == 2
+
+    history = Archive(path, api_key=API_KEY, lazy=True).get(0).history
+    assert contents(history) == [f"m{i}" for i in range(6, 106)]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_journal_replays_chat_deltas(path, lazy):
+    archive = Archive(path, api_key=API_KEY, lazy=lazy, journal=True)
+    archive.add(make_chat(200))
+    archive.save()
+
+    chat = archive.get(0)
+    sizes = []
+    for i in range(3):
+        chat.history = chat.history + [make_node(200 + 2 * i), make_node(201 + 2 * i)]
+        archive.update(0)
+        sizes.append(os.path.getsize(archive.journal_path))
+    # each turn journals only the new nodes and the chat header
+    assert sizes[2] - sizes[1] < 3000
+    archive.close()
+
+    # a torn tail is discarded
+    with open(archive.journal_path, "ab") as f:
+        f.write(b"\x03\x00\x00\x00\x00\x04\x00\x09")
+
+    replayed = Archive(path, api_key=API_KEY, lazy=lazy)
+    assert contents(replayed.get(0).history)[-2:] == ["m204", "m205"]
+    assert len(replayed.get(0).history) == 206
+    assert not os.path.exists(replayed.journal_path)
+
+
+def test_version_1_files_still_load(path):
+    archive = Archive(path, api_key=API_KEY)
+    archive.add(Bot(model=Model(api_key=API_KEY)))
+    archive.save()
+    assert file_version(path) == 1
+
+    archive.add(make_chat(4))
+    archive.save()
+    assert file_version(path) == 2
+
+    archive.remove(1)
+    archive.save()
+    assert file_version(path) == 1
+    assert isinstance(Archive(path, api_key=API_KEY).get(0), Bot)
+
+
+def test_unknown_version_is_rejected(path):
+    archive = Archive(path, api_key=API_KEY)
+    archive.add(make_chat(2))
+    archive.save()
+    with open(path, "r+b") as f:
+        f.seek(2)
+        f.write((9).to_bytes(2, "little"))
+
+    with pytest.raises(ValueError, match="Unsupported cwarchive version"):
+        Archive(path, api_key=API_KEY, lazy=True).ids()